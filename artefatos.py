@@ -0,0 +1,154 @@
+"""
+Artefatos Pré-compilados - LexAprendiz
+Snapshots do banco de conhecimento e do CONAP e o casador de intenções, gravados por
+`adk build-index` em arquivos binários versionados. Na partida, os processos carregam
+o artefato em vez de remontar os índices, desde que o código e os dados de origem
+sejam os mesmos da compilação
+"""
+import ast
+import gc
+import hashlib
+import json
+import os
+import pickle
+from datetime import datetime
+from pathlib import Path
+
+from recarga import DIRETORIO_DADOS
+
+# Diretório dos artefatos gerados por `adk build-index` (não versionado)
+DIRETORIO_ARTEFATOS = Path(__file__).with_name("indices")
+
+# Versão do formato; artefatos de outra versão são ignorados
+FORMATO_ARTEFATOS = 1
+
+RAIZ = Path(__file__).parent
+
+# Arquivos de código e de dados de que cada artefato depende; os módulos do projeto
+# importados por um .py listado (direta ou indiretamente) entram na impressão também
+FONTES = {
+    'banco': [
+        RAIZ / "banco_conhecimento.py", RAIZ / "lexaprendiz.db", DIRETORIO_DADOS / "conhecimento.json",
+        DIRETORIO_DADOS / "respostas", DIRETORIO_DADOS / "parametros.json",
+    ],
+    'conap': [RAIZ / "conap_database.py", DIRETORIO_DADOS / "conap.json"],
+    'intencoes': [RAIZ / "intencoes.py"],
+}
+
+
+def modulos_importados(arquivo):
+    """Arquivos .py do projeto importados no nível do módulo (fora de funções)"""
+    arvore = ast.parse(Path(arquivo).read_bytes())
+    nomes = []
+    pendentes = list(arvore.body)
+    while pendentes:
+        no = pendentes.pop()
+        if isinstance(no, ast.Import):
+            nomes.extend(alias.name for alias in no.names)
+        elif isinstance(no, ast.ImportFrom) and not no.level and no.module:
+            nomes.append(no.module)
+        elif isinstance(no, (ast.If, ast.Try)):
+            # Importações opcionais (try/except ImportError) e condicionais
+            pendentes.extend(no.body + no.orelse + getattr(no, 'finalbody', []))
+            for tratador in getattr(no, 'handlers', []):
+                pendentes.extend(tratador.body)
+    caminhos = (RAIZ.joinpath(*nome.split('.')).with_suffix('.py') for nome in nomes)
+    return sorted(caminho for caminho in caminhos if caminho.is_file())
+
+
+def expandir_fontes(fontes):
+    """Fontes com os módulos do projeto importados transitivamente pelos .py listados"""
+    expandidas = []
+    pendentes = list(map(Path, fontes))
+    while pendentes:
+        fonte = pendentes.pop(0)
+        if fonte in expandidas:
+            continue
+        expandidas.append(fonte)
+        if fonte.suffix == '.py' and fonte.is_file():
+            pendentes.extend(modulos_importados(fonte))
+    return expandidas
+
+
+def impressao_fontes(fontes):
+    """Impressão das fontes: conteúdo dos arquivos .py, tamanho e data dos arquivos de dados"""
+    resumo = hashlib.sha256()
+    for fonte in expandir_fontes(fontes):
+        arquivos = sorted(fonte.rglob('*')) if fonte.is_dir() else [fonte]
+        for arquivo in arquivos:
+            resumo.update(str(arquivo).encode('utf-8'))
+            if not arquivo.is_file():
+                resumo.update(b'|ausente')
+            elif arquivo.suffix == '.py':
+                resumo.update(arquivo.read_bytes())
+            else:
+                estado = arquivo.stat()
+                resumo.update(f"|{estado.st_mtime_ns}|{estado.st_size}".encode('utf-8'))
+    return resumo.hexdigest()
+
+
+def caminho_artefato(nome, diretorio=DIRETORIO_ARTEFATOS):
+    """Arquivo do artefato: indices/<nome>.bin"""
+    return Path(diretorio) / f"{nome}.bin"
+
+
+def gravar_artefato(nome, objeto, versao=None, diretorio=DIRETORIO_ARTEFATOS):
+    """Grava cabeçalho JSON (uma linha) e objeto serializado; troca o arquivo de uma vez"""
+    caminho = caminho_artefato(nome, diretorio)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    cabecalho = {
+        'formato': FORMATO_ARTEFATOS,
+        'nome': nome,
+        'versao_dados': versao,
+        'fontes': impressao_fontes(FONTES[nome]),
+        'criado_em': datetime.now().isoformat(timespec='seconds'),
+    }
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(json.dumps(cabecalho, ensure_ascii=False).encode('utf-8') + b'\n')
+        pickle.dump(objeto, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def ler_cabecalho(caminho):
+    """Cabeçalho do artefato (None se ausente ou ilegível)"""
+    try:
+        with open(caminho, 'rb') as arquivo:
+            return json.loads(arquivo.readline())
+    except (OSError, ValueError):
+        return None
+
+
+def artefato_valido(cabecalho, nome):
+    """Indica se o artefato foi gerado neste formato a partir das fontes atuais"""
+    return (
+        cabecalho is not None
+        and cabecalho.get('formato') == FORMATO_ARTEFATOS
+        and cabecalho.get('fontes') == impressao_fontes(FONTES[nome])
+    )
+
+
+def carregar_artefato(nome, diretorio=DIRETORIO_ARTEFATOS):
+    """Objeto do artefato, ou None se ausente, de outro formato ou de fontes diferentes.
+
+    Artefatos são arquivos pickle: carregue apenas os gerados pelo próprio `adk build-index`.
+    """
+    caminho = caminho_artefato(nome, diretorio)
+    try:
+        with open(caminho, 'rb') as arquivo:
+            if not artefato_valido(json.loads(arquivo.readline()), nome):
+                return None
+            # O coletor de ciclos percorreria os milhões de objetos recém-criados várias vezes
+            coletor_ativo = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(arquivo)
+            finally:
+                if coletor_ativo:
+                    gc.enable()
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+        # Artefato corrompido ou de uma versão incompatível do código: remonta normalmente
+        return None
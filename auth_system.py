@@ -205,6 +205,58 @@ def show_admin_dashboard():
         from logo_base64 import show_logo_uploader
         show_logo_uploader()
     
+    # Estatísticas dos caches de consulta
+    with st.expander("⚡ Cache de Consultas", expanded=False):
+        from cache_consultas import estatisticas_caches, limpar_caches
+        
+        for stats in estatisticas_caches():
+            st.markdown(f"**{stats['nome']}** ({stats['tamanho']}/{stats['tamanho_maximo']})")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Hits", stats['hits'], f"{stats['taxa_acerto']:.0%}")
+            with col2:
+                st.metric("Misses", stats['misses'])
+            with col3:
+                st.metric("Evictions", stats['evictions'])
+        
+        if st.button("🧹 Limpar Caches"):
+            limpar_caches()
+            st.success("Caches esvaziados!")
+    
+    # Recarga a quente da base de conhecimento e do CONAP
+    with st.expander("🔄 Recarga da Base", expanded=False):
+        from recarga import (
+            exportar_dados, recarregar_conhecimento, recarregar_conap, recarregar_parametros, DIRETORIO_DADOS
+        )
+        from banco_conhecimento import banco_conhecimento
+        from conap_database import conap_db
+        from parametros import tabela_parametros
+        
+        st.markdown(f"**Conhecimento:** versão {banco_conhecimento.versao or 'embutida no código'}")
+        st.markdown(f"**CONAP:** versão {conap_db.versao or 'embutida no código'}")
+        st.markdown(f"**Parâmetros:** versão {tabela_parametros.versao or 'embutida no código'}")
+        st.caption(f"Arquivos em `{DIRETORIO_DADOS}`")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("📤 Exportar Dados"):
+                exportar_dados()
+                st.success("Dados exportados! Edite os arquivos e recarregue.")
+        with col2:
+            if st.button("🔄 Recarregar Base"):
+                parametros = recarregar_parametros()
+                resultados = [
+                    r for r in (parametros, recarregar_conhecimento(forcar=parametros is not None), recarregar_conap())
+                    if r
+                ]
+                if not resultados:
+                    st.warning("Nenhum arquivo de dados encontrado. Exporte os dados primeiro.")
+                for r in resultados:
+                    st.success(
+                        f"{r['base']} v{r['versao']}: {len(r['alterados'])} alterado(s), "
+                        f"{len(r['removidos'])} removido(s) em {r['tempo_ms']:.1f} ms"
+                    )
+    
     # Estatísticas de usuários
     with st.expander("👥 Usuários Cadastrados", expanded=False):
         users = load_users()
@@ -0,0 +1,161 @@
+"""
+Autocompletar do LexAprendiz
+Árvore de prefixos sobre as perguntas canônicas da base, os programas do CONAP e as
+normas vigentes, com sugestões ordenadas por popularidade. Cada sugestão já traz o
+seu destino: escolhê-la dispensa a classificação da pergunta
+"""
+import threading
+from collections import Counter
+
+from banco_conhecimento import banco_conhecimento
+from conap_database import conap_db
+from normalizacao import STOPWORDS_DOBRADAS, normalizar_fuzzy
+
+# Sugestões exibidas por vez e tamanho mínimo do trecho digitado
+LIMITE_SUGESTOES = 5
+TAMANHO_MINIMO_PREFIXO = 2
+
+
+class ArvorePrefixos:
+    """Árvore de prefixos (trie) sobre a forma canônica dos textos.
+
+    Cada início de palavra (exceto stopwords) é inserido, para que "3872" encontre
+    "Portaria MTE nº 3.872/2023"; cada nó guarda as posições das sugestões da sua
+    subárvore, então a busca só percorre o prefixo.
+    """
+
+    def __init__(self, sugestoes):
+        self.sugestoes = list(sugestoes)
+        self.raiz = ({}, set())  # (filhos por caractere, posições das sugestões)
+        for posicao, sugestao in enumerate(self.sugestoes):
+            for forma in sugestao['formas']:
+                palavras = normalizar_fuzzy(forma).split()
+                for inicio, palavra in enumerate(palavras):
+                    if inicio == 0 or palavra not in STOPWORDS_DOBRADAS:
+                        self._inserir(' '.join(palavras[inicio:]), posicao)
+
+    def _inserir(self, texto, posicao):
+        no = self.raiz
+        no[1].add(posicao)
+        for caractere in texto:
+            no = no[0].setdefault(caractere, ({}, set()))
+            no[1].add(posicao)
+
+    def buscar(self, prefixo):
+        """Posições das sugestões com alguma palavra iniciando pelo prefixo (já canônico)"""
+        no = self.raiz
+        for caractere in prefixo:
+            no = no[0].get(caractere)
+            if no is None:
+                return set()
+        return no[1]
+
+
+def montar_sugestoes(banco, db):
+    """Sugestões {texto, tipo, destino, formas} das perguntas canônicas, normas e programas CONAP"""
+    sugestoes = [
+        {'texto': dados['pergunta_padrao'], 'tipo': 'topico', 'destino': topico, 'formas': [dados['pergunta_padrao']]}
+        for topico, dados in banco.conhecimento.items()
+    ]
+
+    # Cada norma leva à resposta do tópico que trata dela (ou do primeiro que a cita)
+    citacoes = {}
+    for topico, dados in banco.conhecimento.items():
+        for norma in banco.identificar_normas(' ; '.join(dados['legislacao_base'])):
+            citacoes.setdefault(norma, topico)
+    for norma, registro in banco.legislacao_vigente.items():
+        topico = norma if norma in banco.conhecimento else citacoes.get(norma)
+        if topico:
+            sugestoes.append({
+                'texto': registro['rotulo'], 'tipo': 'norma', 'destino': topico,
+                'formas': [registro['rotulo'], norma.replace('_', ' ')],
+            })
+
+    for area_data in db.programas.values():
+        for programa in area_data['programas']:
+            sugestoes.append({
+                'texto': f"CONAP {programa['numero']} - {programa['nome']}", 'tipo': 'conap',
+                'destino': programa['numero'], 'formas': [programa['nome'], *programa['cbo']],
+            })
+    return sugestoes
+
+
+class ServicoAutocompletar:
+    """Sugestões por prefixo, remontadas quando a base ou o CONAP são recarregados"""
+
+    def __init__(self):
+        self.popularidade = Counter()  # texto da sugestão -> vezes em que foi escolhida
+        self.trava = threading.Lock()
+        self._arvore = None
+        self._geracoes = None
+
+    def arvore(self):
+        """Árvore do snapshot atual da base e do CONAP"""
+        geracoes = (banco_conhecimento.geracao, conap_db.geracao)
+        if self._geracoes != geracoes:
+            with self.trava:
+                if self._geracoes != geracoes:
+                    self._arvore = ArvorePrefixos(montar_sugestoes(banco_conhecimento.atual, conap_db.atual))
+                    self._geracoes = geracoes
+        return self._arvore
+
+    def sugerir(self, texto, limite=LIMITE_SUGESTOES):
+        """Até `limite` sugestões para o trecho digitado, das mais escolhidas para as menos"""
+        prefixo = normalizar_fuzzy(texto or '')
+        if len(prefixo) < TAMANHO_MINIMO_PREFIXO:
+            return []
+
+        arvore = self.arvore()
+        ordenadas = sorted(
+            arvore.buscar(prefixo),
+            key=lambda posicao: (-self.popularidade[arvore.sugestoes[posicao]['texto']], posicao)
+        )
+
+        # Uma sugestão por destino (a pergunta canônica e a norma do mesmo tópico levam à mesma resposta)
+        sugestoes, destinos = [], set()
+        for posicao in ordenadas:
+            sugestao = arvore.sugestoes[posicao]
+            destino = (sugestao['tipo'] == 'conap', sugestao['destino'])
+            if destino not in destinos:
+                destinos.add(destino)
+                sugestoes.append({chave: valor for chave, valor in sugestao.items() if chave != 'formas'})
+                if len(sugestoes) == limite:
+                    break
+        return sugestoes
+
+    def registrar_escolha(self, sugestao):
+        """Conta a escolha da sugestão para a ordenação por popularidade"""
+        with self.trava:
+            self.popularidade[sugestao['texto']] += 1
+
+    def referencia(self, sugestao):
+        """Referência compacta da resposta do destino (para o histórico das sessões)"""
+        if sugestao['tipo'] == 'conap':
+            return ('conap', sugestao['destino'], conap_db.geracao)
+        return banco_conhecimento.referencia_topico(sugestao['destino'])
+
+    def responder(self, sugestao):
+        """Resposta do destino da sugestão, sem passar pela classificação da pergunta"""
+        self.registrar_escolha(sugestao)
+        if sugestao['tipo'] == 'conap':
+            return conap_db.buscar_programa_por_numero(sugestao['destino'])
+        return banco_conhecimento.obter_resposta(sugestao['destino'])
+
+
+# Instância global do autocompletar
+autocompletar = ServicoAutocompletar()
+
+
+def sugerir(texto, limite=LIMITE_SUGESTOES):
+    """Sugestões de perguntas para o trecho digitado"""
+    return autocompletar.sugerir(texto, limite)
+
+
+def responder_sugestao(sugestao):
+    """Resposta pré-roteada de uma sugestão escolhida"""
+    return autocompletar.responder(sugestao)
+
+
+def referencia_sugestao(sugestao):
+    """Referência da resposta de uma sugestão"""
+    return autocompletar.referencia(sugestao)
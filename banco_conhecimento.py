@@ -5,149 +5,448 @@ Atualizado com todas as normativas vigentes conforme solicitação do usuário
 """
 import re
 from datetime import datetime
+from functools import lru_cache
+from itertools import count
+from pathlib import Path
+from artefatos import carregar_artefato
+from indice_conhecimento import IndiceInvertido, IndiceBM25, dividir_passagens
+from base_sqlite import obter_resposta_armazenada
+from cache_consultas import cache_referencias, cache_respostas, cache_topicos, memorizar
+from intencoes import CasadorIntencoes
+from indice_fuzzy import IndiceFuzzy
+from indice_vigencia import IndiceVigencia, converter_data, extrair_data, registro_norma
+from sinonimos import expandir_termos, expandir_texto
+from parametros import compilar_modelo, renderizar, tabela_parametros
+from recarga import ReferenciaAtomica, carregar_dados_conhecimento, impressao
+
+# Score BM25 mínimo para considerar a busca ranqueada uma resposta confiável
+LIMIAR_CONFIANCA = 3.0
+
+# Quantidade máxima de respostas completas mantidas em memória por processo
+TAMANHO_CACHE_RESPOSTAS = 8
+
+# Seções de conteúdo devolvidas no modo 'passagens' (cabeçalho e fontes vêm sempre)
+MAX_PASSAGENS = 2
+
+# Passagens com score abaixo desta fração da melhor ficam de fora
+FRACAO_MELHOR_PASSAGEM = 0.6
+
+# Respostas menores que isto (caracteres) são sempre devolvidas completas
+TAMANHO_MINIMO_PASSAGENS = 1200
+
+# Cada snapshot recebe uma geração própria (chave dos caches compartilhados)
+GERACOES = count(1)
 
 class BancoConhecimentoAprendizagem:
     """Banco de conhecimento especializado em legislação da aprendizagem com base legal completa"""
     
-    def __init__(self):
+    def __init__(self, dados=None, anterior=None):
+        # Normas com datas de publicação, início de vigência e revogação (None = não cadastrada / vigente)
         self.legislacao_vigente = {
             # Legislação mais recente (2023-2025)
-            'decreto_11864_2023': 'Decreto nº 11.864/2023 - Salário mínimo 2024',
-            'decreto_11853_2023': 'Decreto nº 11.853/2023 - Pacto Nacional pela Inclusão Produtiva',
-            'portaria_3872_2023': 'Portaria MTE nº 3.872/2023 - Aprendizagem Profissional e CNAP',
-            'decreto_11801_2023': 'Decreto nº 11.801/2023 - GT Vigilância Privada',
-            'portaria_3544_2023': 'Portaria nº 3.544/2023 - Aprendizagem e CNAP',
-            'lei_14645_2023': 'Lei nº 14.645/2023 - Educação Profissional e BPC',
-            'decreto_11479_2023': 'Decreto nº 11.479/2023 - Profissionalização de Jovens',
+            'decreto_11864_2023': {
+                'rotulo': 'Decreto nº 11.864/2023 - Salário mínimo 2024',
+                'publicacao': '2023-12-27', 'inicio_vigencia': '2024-01-01',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'decreto_11853_2023': {
+                'rotulo': 'Decreto nº 11.853/2023 - Pacto Nacional pela Inclusão Produtiva',
+                'publicacao': None, 'inicio_vigencia': None,
+                'revogacao': None, 'revogada_por': None,
+            },
+            'portaria_3872_2023': {
+                'rotulo': 'Portaria MTE nº 3.872/2023 - Aprendizagem Profissional e CNAP',
+                'publicacao': '2023-12-21', 'inicio_vigencia': '2023-12-21',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'decreto_11801_2023': {
+                'rotulo': 'Decreto nº 11.801/2023 - GT Vigilância Privada',
+                'publicacao': '2023-11-28', 'inicio_vigencia': '2023-11-28',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'portaria_3544_2023': {
+                'rotulo': 'Portaria nº 3.544/2023 - Aprendizagem e CNAP',
+                'publicacao': None, 'inicio_vigencia': None,
+                'revogacao': None, 'revogada_por': None,
+            },
+            'lei_14645_2023': {
+                'rotulo': 'Lei nº 14.645/2023 - Educação Profissional e BPC',
+                'publicacao': '2023-08-02', 'inicio_vigencia': '2023-08-02',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'decreto_11479_2023': {
+                'rotulo': 'Decreto nº 11.479/2023 - Profissionalização de Jovens',
+                'publicacao': '2023-04-06', 'inicio_vigencia': '2023-04-06',
+                'revogacao': None, 'revogada_por': None,
+            },
             
             # Normativas COVID-19 e medidas emergenciais
-            'portaria_1019_2021': 'Portaria/MTP nº 1.019/2021 - EAD excepcional',
-            'portaria_4089_2021': 'Portaria SEPEC/ME nº 4.089/2021 - EAD autorizada',
-            'lei_14020_2020': 'Lei nº 14.020/2020 - Programa Emergencial',
-            'mp_1045_2021': 'MP nº 1.045/2021 - Novo Programa Emergencial',
+            'portaria_1019_2021': {
+                'rotulo': 'Portaria/MTP nº 1.019/2021 - EAD excepcional',
+                'publicacao': None, 'inicio_vigencia': None,
+                'revogacao': None, 'revogada_por': None,
+            },
+            'portaria_4089_2021': {
+                'rotulo': 'Portaria SEPEC/ME nº 4.089/2021 - EAD autorizada',
+                'publicacao': '2021-04-13', 'inicio_vigencia': '2021-04-13',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'lei_14020_2020': {
+                'rotulo': 'Lei nº 14.020/2020 - Programa Emergencial',
+                'publicacao': '2020-07-06', 'inicio_vigencia': '2020-07-06',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'mp_1045_2021': {
+                'rotulo': 'MP nº 1.045/2021 - Novo Programa Emergencial',
+                'publicacao': '2021-04-27', 'inicio_vigencia': '2021-04-28',
+                'revogacao': '2021-09-01', 'revogada_por': None,
+            },
             
             # Base fundamental
-            'decreto_9579_2018': 'Decreto 9.579/2018 - Consolidação normativa',
-            'decreto_5598_2005': 'Decreto nº 5.598/2005 - Regulamentação aprendizes',
-            'lei_10097_2000': 'Lei 10.097/2000 - Normas do contrato de aprendizagem',
-            'clt_1943': 'CLT arts. 424-433 - Consolidação das Leis do Trabalho',
+            'decreto_9579_2018': {
+                'rotulo': 'Decreto 9.579/2018 - Consolidação normativa',
+                'publicacao': '2018-11-22', 'inicio_vigencia': '2018-11-22',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'decreto_5598_2005': {
+                'rotulo': 'Decreto nº 5.598/2005 - Regulamentação aprendizes',
+                'publicacao': '2005-12-01', 'inicio_vigencia': '2005-12-01',
+                'revogacao': '2018-11-22', 'revogada_por': 'decreto_9579_2018',
+            },
+            'lei_10097_2000': {
+                'rotulo': 'Lei 10.097/2000 - Normas do contrato de aprendizagem',
+                'publicacao': '2000-12-19', 'inicio_vigencia': '2000-12-20',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'clt_1943': {
+                'rotulo': 'CLT arts. 424-433 - Consolidação das Leis do Trabalho',
+                'publicacao': '1943-05-01', 'inicio_vigencia': '1943-11-10',
+                'revogacao': None, 'revogada_por': None,
+            },
             
             # Instruções normativas e portarias
-            'in_sit_146_2018': 'IN SIT 146/2018 - Fiscalização da aprendizagem',
-            'portaria_723_2012': 'Portaria MTE nº 723/2012 - CNAP',
-            'portaria_88_2009': 'Portaria MTE nº 88/2009 - Locais perigosos',
+            'in_sit_146_2018': {
+                'rotulo': 'IN SIT 146/2018 - Fiscalização da aprendizagem',
+                'publicacao': '2018-07-25', 'inicio_vigencia': '2018-07-25',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'portaria_723_2012': {
+                'rotulo': 'Portaria MTE nº 723/2012 - CNAP',
+                'publicacao': '2012-04-23', 'inicio_vigencia': '2012-04-23',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'portaria_88_2009': {
+                'rotulo': 'Portaria MTE nº 88/2009 - Locais perigosos',
+                'publicacao': '2009-04-28', 'inicio_vigencia': '2009-04-28',
+                'revogacao': None, 'revogada_por': None,
+            },
             
             # Resoluções e orientações
-            'resolucao_164_2014': 'Resolução CONANDA nº 164/2014 - Entidades sem fins lucrativos',
-            'resolucao_235_2023': 'Resolução nº 235/2023 - Comitês de Gestão Colegiada',
+            'resolucao_164_2014': {
+                'rotulo': 'Resolução CONANDA nº 164/2014 - Entidades sem fins lucrativos',
+                'publicacao': '2014-04-09', 'inicio_vigencia': '2014-04-09',
+                'revogacao': None, 'revogada_por': None,
+            },
+            'resolucao_235_2023': {
+                'rotulo': 'Resolução nº 235/2023 - Comitês de Gestão Colegiada',
+                'publicacao': None, 'inicio_vigencia': None,
+                'revogacao': None, 'revogada_por': None,
+            },
         }
         
         self.conhecimento = {
             'calculo_cota': {
                 'pergunta_padrao': 'Como calcular a cota de aprendizes',
                 'legislacao_base': ['CLT art. 429', 'Decreto 5.598/2005', 'Portaria 3.872/2023'],
-                'resposta_completa': self._resposta_calculo_cota(),
-                'keywords': ['cota', 'calcul', 'percentual', 'auditores fiscais', 'base de calculo', '5%', '15%']
+                'resposta': '_resposta_calculo_cota',
+                'keywords': ['cota', 'cálculo', 'calcular', 'percentual', 'auditores fiscais', 'base de calculo', '5%', '15%']
             },
             
             'portaria_3872_2023': {
                 'pergunta_padrao': 'Portaria MTE 3.872/2023 - Nova regulamentação',
                 'legislacao_base': ['Portaria MTE 3.872/2023', 'CNAP', 'Catálogo Nacional'],
-                'resposta_completa': self._resposta_portaria_3872(),
+                'resposta': '_resposta_portaria_3872',
                 'keywords': ['portaria', '3872', '2023', 'cnap', 'cadastro nacional', 'catálogo']
             },
             
             'idade_aprendiz': {
                 'pergunta_padrao': 'Idade para contrato de aprendizagem',
                 'legislacao_base': ['CLT art. 428', 'Lei 10.097/2000', 'Decreto 11.479/2023'],
-                'resposta_completa': self._resposta_idade_aprendiz(),
+                'resposta': '_resposta_idade_aprendiz',
                 'keywords': ['idade', 'menor', 'jovem', '14 anos', '24 anos', 'limite etário']
             },
             
             'duracao_contrato': {
                 'pergunta_padrao': 'Duração do contrato de aprendizagem',
                 'legislacao_base': ['CLT art. 428', 'Decreto 5.598/2005'],
-                'resposta_completa': self._resposta_duracao_contrato(),
+                'resposta': '_resposta_duracao_contrato',
                 'keywords': ['duração', 'prazo', 'tempo', 'contrato', 'anos', 'máximo']
             },
             
             'exclusoes_legais': {
                 'pergunta_padrao': 'Exclusões do cálculo da cota',
                 'legislacao_base': ['CLT art. 429 §1º', 'Decreto 5.598/2005', 'Portaria 88/2009'],
-                'resposta_completa': self._resposta_exclusoes_legais(),
+                'resposta': '_resposta_exclusoes_legais',
                 'keywords': ['exclusões', 'técnico', 'superior', 'gerência', 'confiança', 'perigoso', 'insalubre']
             },
             
             'salario_aprendiz': {
                 'pergunta_padrao': 'Salário do aprendiz',
                 'legislacao_base': ['CLT art. 428 §2º', 'Decreto 11.864/2023'],
-                'resposta_completa': self._resposta_salario_aprendiz(),
+                'resposta': '_resposta_salario_aprendiz',
                 'keywords': ['salário', 'remuneração', 'mínimo', 'proporcional', 'hora']
             },
             
             'ead_aprendizagem': {
                 'pergunta_padrao': 'Ensino à distância na aprendizagem',
                 'legislacao_base': ['Portaria 4.089/2021', 'Portaria 1.019/2021'],
-                'resposta_completa': self._resposta_ead_aprendizagem(),
+                'resposta': '_resposta_ead_aprendizagem',
                 'keywords': ['ead', 'distância', 'remoto', 'online', 'virtual', 'covid']
             },
             
             'fiscalizacao_auditoria': {
                 'pergunta_padrao': 'Fiscalização pelos auditores fiscais',
                 'legislacao_base': ['IN SIT 146/2018', 'Portaria 3.872/2023', 'CLT art. 634-A'],
-                'resposta_completa': self._resposta_fiscalizacao_auditoria(),
+                'resposta': '_resposta_fiscalizacao_auditoria',
                 'keywords': ['fiscalização', 'auditores', 'inspeção', 'trabalho', 'procedimentos']
             },
             
             'penalidades': {
                 'pergunta_padrao': 'Penalidades por descumprimento',
                 'legislacao_base': ['CLT art. 634-A', 'Portaria 671/2021'],
-                'resposta_completa': self._resposta_penalidades(),
-                'keywords': ['multa', 'penalidade', 'infração', 'sanção', 'descumprimento', 'auto']
+                'resposta': '_resposta_penalidades',
+                'keywords': ['multa', 'multar', 'penalidade', 'infração', 'sanção', 'descumprimento', 'auto']
             },
             
             'cnap_cadastro': {
                 'pergunta_padrao': 'Cadastro Nacional de Aprendizagem Profissional',
                 'legislacao_base': ['Portaria 3.872/2023', 'Portaria 723/2012'],
-                'resposta_completa': self._resposta_cnap(),
+                'resposta': '_resposta_cnap',
                 'keywords': ['cnap', 'cadastro', 'nacional', 'sistema', 'juventude web']
             },
             
             'entidades_formadoras': {
                 'pergunta_padrao': 'Entidades de formação profissional',
                 'legislacao_base': ['CLT art. 430', 'Resolução CONANDA 164/2014'],
-                'resposta_completa': self._resposta_entidades_formadoras(),
+                'resposta': '_resposta_entidades_formadoras',
                 'keywords': ['entidades', 'senai', 'senac', 'senar', 'sistema s', 'ongs']
             },
             
             'trabalho_perigoso': {
                 'pergunta_padrao': 'Trabalho perigoso e insalubre para menores',
                 'legislacao_base': ['Portaria 88/2009', 'CLT art. 405'],
-                'resposta_completa': self._resposta_trabalho_perigoso(),
+                'resposta': '_resposta_trabalho_perigoso',
                 'keywords': ['perigoso', 'insalubre', 'menor', '18 anos', 'proibido', 'lista']
             },
             
             'aprendiz_gestante': {
                 'pergunta_padrao': 'Direitos da aprendiz gestante',
                 'legislacao_base': ['CLT art. 391-A a 396', 'Lei 14.151/2021', 'CLT art. 428'],
-                'resposta_completa': self._resposta_aprendiz_gestante(),
+                'resposta': '_resposta_aprendiz_gestante',
                 'keywords': ['gestante', 'gravidez', 'grávida', 'maternidade', 'licença', 'afastamento', 'direitos']
             },
             
             'jornada_aprendiz': {
                 'pergunta_padrao': 'Jornada de trabalho do aprendiz',
                 'legislacao_base': ['CLT art. 428 §1º', 'CLT art. 432'],
-                'resposta_completa': self._resposta_jornada_aprendiz(),
+                'resposta': '_resposta_jornada_aprendiz',
                 'keywords': ['jornada', 'horário', 'trabalho', '6 horas', '8 horas', 'limite', 'carga horária']
             },
             
             'rescisao_antecipada': {
                 'pergunta_padrao': 'Rescisão antecipada do contrato de aprendizagem',
                 'legislacao_base': ['CLT art. 433', 'Súmula 331 TST'],
-                'resposta_completa': self._resposta_rescisao_antecipada(),
+                'resposta': '_resposta_rescisao_antecipada',
                 'keywords': ['rescisão', 'antecipada', 'desempenho', 'falta disciplinar', 'ausência', 'término']
             }
         }
+        
+        # Dados carregados de arquivos versionados substituem os registrados em código
+        if dados is not None:
+            self.legislacao_vigente = {
+                chave: registro_norma(valor) for chave, valor in dados['legislacao_vigente'].items()
+            }
+            self.conhecimento = dados['conhecimento']
+        self.versao = dados.get('versao') if dados else None
+        
+        # Parâmetros anuais (salário mínimo, multas) com que as respostas são montadas
+        self.parametros = tabela_parametros.atual
+        
+        # Tópicos novos ou alterados em relação ao snapshot anterior (todos, na primeira carga)
+        self.impressoes = {
+            topico: impressao(dados, self._arquivo_resposta(topico))
+            for topico, dados in self.conhecimento.items()
+        }
+        self.alterados = {
+            topico for topico, marca in self.impressoes.items()
+            if anterior is None or anterior.impressoes.get(topico) != marca
+        }
+        
+        # Uma mudança de parâmetro altera só os tópicos cujas respostas o usam; os modelos
+        # só são lidos nesse caso, e a montagem normal continua sem carregar as respostas
+        if anterior is not None:
+            campos_alterados = {
+                campo for campo, valor in self.parametros.campos.items()
+                if anterior.parametros.campos.get(campo) != valor
+            }
+            if campos_alterados:
+                self.alterados.update(
+                    topico for topico in self.conhecimento
+                    if topico not in self.alterados
+                    and campos_alterados.intersection(compilar_modelo(self._carregar_modelo(topico)).campos)
+                )
+        
+        # Índice invertido das keywords; numa recarga só os tópicos alterados são reindexados
+        # Sinônimos do tesauro entram como keywords já na montagem do índice
+        keywords_por_topico = {topico: dados['keywords'] for topico, dados in self.conhecimento.items()}
+        keywords_expandidas = {topico: expandir_termos(keywords) for topico, keywords in keywords_por_topico.items()}
+        if anterior is None:
+            self.indice = IndiceInvertido(keywords_expandidas)
+        else:
+            self.indice = anterior.indice.atualizar(keywords_expandidas, self.alterados)
+        
+        # Geração, intenções registradas e caches do processo
+        self._preparar_processo()
+        
+        # Versão do texto de cada resposta: a geração em que o tópico mudou pela última vez
+        self.versoes = {
+            topico: self.geracao if topico in self.alterados else anterior.versoes[topico]
+            for topico in self.conhecimento
+        }
+        
+        # Índice ranqueado montado apenas na primeira busca ranqueada (ou atualizado a partir do anterior)
+        self._indice_bm25 = None
+        if anterior is not None and anterior._indice_bm25 is not None:
+            self._indice_bm25 = anterior._indice_bm25.atualizar(
+                list(self.conhecimento),
+                {topico: self._documento_bm25(topico) for topico in self.alterados}
+            )
+        
+        # Passagens das respostas e seu índice BM25, montados na primeira busca por passagens
+        self._passagens = None
+        if anterior is not None and anterior._passagens is not None:
+            passagens_anteriores, indice_anterior = anterior._passagens
+            passagens = {
+                topico: (
+                    dividir_passagens(self._carregar_resposta(topico))
+                    if topico in self.alterados else passagens_anteriores[topico]
+                )
+                for topico in self.conhecimento
+            }
+            documentos = self._documentos_passagens(passagens)
+            self._passagens = (passagens, indice_anterior.atualizar(
+                list(documentos),
+                {chave: texto for chave, texto in documentos.items() if chave[0] in self.alterados}
+            ))
+        
+        # Identificadores das normas ("portaria 3872 2023", "Portaria MTE nº 3.872/2023") e períodos de vigência
+        if anterior is not None and anterior.legislacao_vigente == self.legislacao_vigente:
+            self.indice_normas = anterior.indice_normas
+            self.indice_vigencia = anterior.indice_vigencia
+        else:
+            self.indice_normas = IndiceFuzzy(
+                [(chave.replace('_', ' '), chave) for chave in self.legislacao_vigente] +
+                [(norma['rotulo'].split(' - ')[0], chave) for chave, norma in self.legislacao_vigente.items()]
+            )
+            self.indice_vigencia = IndiceVigencia(self.legislacao_vigente)
+    
+    def _preparar_processo(self):
+        """Estado próprio de cada processo, refeito também ao carregar o snapshot de um artefato"""
+        self.geracao = next(GERACOES)
+        
+        # Casador próprio com as keywords: só a troca do snapshot muda o roteamento entre tópicos
+        self.casador = CasadorIntencoes(cache_topicos)
+        self.casador.registrar(
+            'topicos', {topico: dados['keywords'] for topico, dados in self.conhecimento.items()}, sinonimos=True
+        )
+        
+        # Respostas completas são geradas sob demanda, com cache limitado
+        self.obter_resposta = lru_cache(maxsize=TAMANHO_CACHE_RESPOSTAS)(self._carregar_resposta)
+        
+        # Consultas repetidas (inclusive sem resposta local) são servidas pelo cache do processo
+        self.buscar_resposta = memorizar(cache_respostas, geracao=lambda: self.geracao)(self._buscar_resposta)
+        self.buscar_referencia = memorizar(cache_referencias, geracao=lambda: self.geracao)(self._buscar_referencia)
+        
+        # Listas de postings da busca em lote, montadas no primeiro lote avaliado
+        self._avaliador_lote = None
+    
+    def __getstate__(self):
+        """Dados e índices gravados no artefato (sem geração, caches nem parâmetros do processo)"""
+        estado = dict(self.__dict__)
+        for nome in (
+            'geracao', 'casador', 'versoes', 'obter_resposta', 'buscar_resposta', 'buscar_referencia',
+            '_avaliador_lote', 'parametros',
+        ):
+            del estado[nome]
+        return estado
+    
+    def __setstate__(self, estado):
+        # O artefato só é válido com os mesmos parâmetros de origem, então os atuais são equivalentes
+        self.__dict__.update(estado)
+        self.parametros = tabela_parametros.atual
+        self._preparar_processo()
+        self.versoes = dict.fromkeys(self.conhecimento, self.geracao)
+    
+    @property
+    def indice_bm25(self):
+        """Índice BM25 sobre título (com peso dobrado), legislação base e resposta completa"""
+        if self._indice_bm25 is None:
+            self._indice_bm25 = IndiceBM25({
+                topico: self._documento_bm25(topico) for topico in self.conhecimento
+            })
+        return self._indice_bm25
+    
+    def _documento_bm25(self, topico):
+        # Os textos são gerados só para a indexação, sem passar pelo cache de respostas
+        dados = self.conhecimento[topico]
+        return expandir_texto('\n'.join(
+            [dados['pergunta_padrao']] * 2 + dados['legislacao_base'] + [self._carregar_resposta(topico)]
+        ))
+    
+    @property
+    def passagens(self):
+        """(tópico -> passagens da resposta, índice BM25 das passagens de conteúdo)"""
+        if self._passagens is None:
+            passagens = {
+                topico: dividir_passagens(self._carregar_resposta(topico)) for topico in self.conhecimento
+            }
+            self._passagens = (passagens, IndiceBM25(self._documentos_passagens(passagens)))
+        return self._passagens
+    
+    @staticmethod
+    def _documentos_passagens(passagens):
+        # Chave (tópico, nº da passagem); o título da seção tem peso dobrado
+        return {
+            (topico, numero): expandir_texto(passagem['titulo'] + '\n' + passagem['texto'])
+            for topico, lista in passagens.items()
+            for numero, passagem in enumerate(lista)
+            if passagem['tipo'] == 'conteudo'
+        }
+    
+    def _arquivo_resposta(self, topico):
+        """Caminho do arquivo da resposta, quando o tópico foi carregado de dados/"""
+        referencia = self.conhecimento[topico]['resposta']
+        return Path(referencia) if referencia.endswith('.md') else None
+    
+    def _carregar_modelo(self, topico):
+        """Carrega o modelo da resposta: arquivo de dados, base SQLite compartilhada ou registro em código"""
+        texto = None
+        if self._arquivo_resposta(topico) is None:
+            texto = obter_resposta_armazenada(topico)
+        if texto is None:
+            texto = self._gerar_resposta(topico)
+        return texto
+    
+    def _carregar_resposta(self, topico):
+        """Texto completo da resposta, com os parâmetros deste snapshot"""
+        return renderizar(self._carregar_modelo(topico), self.parametros.campos)
+    
+    def _gerar_resposta(self, topico):
+        """Gera o texto completo da resposta de um tópico a partir do registro"""
+        arquivo = self._arquivo_resposta(topico)
+        if arquivo is not None:
+            return arquivo.read_text(encoding='utf-8')
+        return getattr(self, self.conhecimento[topico]['resposta'])()
     
     def _resposta_portaria_3872(self):
         return """⚖️ **LexAprendiz** - Portaria MTE nº 3.872/2023
@@ -336,28 +635,185 @@ Os auditores fiscais do trabalho calculam a cota de aprendizes com base em crit
 - [CLT - Art. 634-A](http://www.planalto.gov.br/ccivil_03/decreto-lei/del5452.htm)
 - [Portaria MTE 3.872/2023](https://www.in.gov.br/web/dou/-/portaria-mte-n-3.872-de-2023)"""
 
-    def buscar_resposta(self, consulta):
-        """Busca a resposta mais adequada baseada na consulta"""
-        consulta_lower = consulta.lower()
+    def _buscar_resposta(self, consulta, modo='completa'):
+        """Busca a resposta mais adequada baseada na consulta.
         
-        # Busca por correspondência de keywords
-        melhor_match = None
-        maior_score = 0
+        No modo 'passagens' devolve só as seções mais relevantes da resposta,
+        acompanhadas do cabeçalho e das fontes.
+        """
+        referencia = self.buscar_referencia(consulta, modo)
+        return self.texto_referencia(referencia) if referencia else None
+    
+    def _buscar_referencia(self, consulta, modo='completa'):
+        """Referência compacta da resposta (ver referencia_topico), ou None"""
+        topico, _ = self.buscar_topico(consulta)
+        if not topico:
+            return None
         
-        for topico, dados in self.conhecimento.items():
-            score = 0
-            for keyword in dados['keywords']:
-                if keyword in consulta_lower:
-                    score += 1
-            
-            if score > maior_score:
-                maior_score = score
-                melhor_match = topico
+        if modo == 'passagens':
+            return self.referencia_topico(topico, self.selecionar_passagens(topico, consulta))
+        return self.referencia_topico(topico)
+    
+    def referencia_topico(self, topico, passagens=None):
+        """('banco', tópico, versão do texto, passagens exibidas ou None para a resposta completa)"""
+        return ('banco', topico, self.versoes[topico], passagens)
+    
+    def texto_referencia(self, referencia):
+        """Texto da resposta referenciada"""
+        _, topico, _, passagens = referencia
+        if passagens is None:
+            return self.obter_resposta(topico)
+        return self.juntar_passagens(topico, passagens)
+    
+    def buscar_passagens(self, topico, consulta, k=MAX_PASSAGENS):
+        """Números das k passagens de conteúdo do tópico mais relevantes para a consulta"""
+        _, indice = self.passagens
+        scores = {
+            numero: score for (dono, numero), score in indice.pontuar(consulta).items()
+            if dono == topico
+        }
+        if not scores:
+            return []
+        
+        minimo = max(scores.values()) * FRACAO_MELHOR_PASSAGEM
+        melhores = sorted(scores, key=lambda numero: (-scores[numero], numero))[:k]
+        return sorted(numero for numero in melhores if scores[numero] >= minimo)
+    
+    def selecionar_passagens(self, topico, consulta, k=MAX_PASSAGENS):
+        """Passagens de conteúdo a exibir (tupla), ou None quando a resposta vai completa"""
+        if len(self.obter_resposta(topico)) < TAMANHO_MINIMO_PASSAGENS:
+            return None
+        
+        passagens, _ = self.passagens
+        selecionadas = self.buscar_passagens(topico, consulta, k)
+        conteudo = [passagem for passagem in passagens[topico] if passagem['tipo'] == 'conteudo']
+        if not selecionadas or len(selecionadas) == len(conteudo):
+            return None
+        return tuple(selecionadas)
+    
+    def montar_passagens(self, topico, consulta, k=MAX_PASSAGENS):
+        """Resposta reduzida: cabeçalho, passagens mais relevantes e fontes (ou completa, sem passagem relevante)"""
+        selecionadas = self.selecionar_passagens(topico, consulta, k)
+        if selecionadas is None:
+            return self.obter_resposta(topico)
+        return self.juntar_passagens(topico, selecionadas)
+    
+    def juntar_passagens(self, topico, selecionadas):
+        """Cabeçalho, passagens selecionadas e fontes, com a nota de resposta reduzida"""
+        passagens, _ = self.passagens
+        lista = passagens[topico]
+        partes = [
+            passagem['texto'] for numero, passagem in enumerate(lista)
+            if passagem['tipo'] != 'conteudo' or numero in selecionadas
+        ]
+        partes.append(
+            f"*📎 Trechos mais relevantes da resposta sobre {self.conhecimento[topico]['pergunta_padrao'].lower()}. "
+            f"Peça a \"resposta completa\" para ver todas as seções.*"
+        )
+        return '\n\n'.join(partes)
+    
+    def buscar_topico(self, consulta):
+        """Retorna (tópico, score) que responde a consulta, ou (None, 0)"""
+        # Busca por correspondência de keywords via índice invertido
+        ocorrencias = self.casador.analisar(consulta)
+        melhor_match, maior_score = self.indice.melhor_topico(
+            consulta, ocorrencias.termos('topicos'), ocorrencias.aproximados, ocorrencias.sinonimos('topicos')
+        )
         
         if melhor_match and maior_score > 0:
-            return self.conhecimento[melhor_match]['resposta_completa']
+            return melhor_match, maior_score
         
-        return None
+        # Sem keyword: recorre ao texto integral das respostas antes da pesquisa online
+        ranking = self.buscar_ranqueado(consulta, k=1)
+        if ranking:
+            return ranking[0]
+        
+        return None, 0
+    
+    def buscar_respostas(self, consultas):
+        """Avalia um lote de consultas com NumPy; mesmo resultado de buscar_topico para cada uma"""
+        if self._avaliador_lote is None:
+            from busca_lote import AvaliadorLote
+            self._avaliador_lote = AvaliadorLote(self.indice, self.indice_bm25, self.casador)
+        return self._avaliador_lote.avaliar(list(consultas), limiar=LIMIAR_CONFIANCA)
+    
+    def buscar_ranqueado(self, consulta, k=3, limiar=LIMIAR_CONFIANCA):
+        """Retorna os k tópicos mais relevantes (tópico, score) acima do limiar de confiança"""
+        return self.indice_bm25.buscar(consulta, k=k, limiar=limiar)
+    
+    def identificar_normas(self, consulta):
+        """Chaves de legislacao_vigente citadas na consulta, tolerando acentos e erros de digitação"""
+        normas = []
+        for _, chave, _ in self.indice_normas.buscar(consulta):
+            if chave not in normas:
+                normas.append(chave)
+        return normas
+
+    def normas_do_topico(self, topico):
+        """Chaves das normas que o tópico trata ou cita na legislação base"""
+        normas = self.identificar_normas(' ; '.join(self.conhecimento[topico]['legislacao_base']))
+        if topico in self.legislacao_vigente and topico not in normas:
+            normas.insert(0, topico)
+        return normas
+
+    def normas_vigentes(self, data, topico=None):
+        """Chaves das normas vigentes na data; com tópico, só as que ele trata ou cita"""
+        vigentes = self.indice_vigencia.vigentes(data)
+        if topico is None:
+            return list(vigentes)
+        citadas = self.normas_do_topico(topico)
+        return [chave for chave in vigentes if chave in citadas]
+
+    def normas_vigentes_em_lote(self, datas):
+        """Normas vigentes em cada data (auditorias que cobrem muitas datas de contrato)"""
+        return [list(vigentes) for vigentes in self.indice_vigencia.vigentes_em_lote(datas)]
+
+    def situacao_norma(self, chave, data):
+        """Situação da norma na data, em texto para as respostas"""
+        norma = self.legislacao_vigente[chave]
+        inicio = converter_data(norma['inicio_vigencia'])
+        revogacao = converter_data(norma['revogacao'])
+        if inicio is None:
+            return "vigência não cadastrada"
+        if data < inicio:
+            return f"ainda não vigente (vigência a partir de {inicio:%d/%m/%Y})"
+        if revogacao is not None and data >= revogacao:
+            substituta = norma['revogada_por']
+            if substituta in self.legislacao_vigente:
+                return f"revogada em {revogacao:%d/%m/%Y} (substituída por {self.legislacao_vigente[substituta]['rotulo'].split(' - ')[0]})"
+            return f"sem vigência desde {revogacao:%d/%m/%Y}"
+        return f"vigente desde {inicio:%d/%m/%Y}"
+
+    def buscar_vigencia(self, consulta):
+        """Resposta para "que norma vigia na data X"; None se a pergunta não cita uma data"""
+        data = extrair_data(consulta)
+        if data is None:
+            return None
+
+        # Normas citadas na pergunta ou, sem citação, as do tema identificado
+        citadas = self.identificar_normas(consulta)
+        topico, _ = (None, 0) if citadas else self.buscar_topico(consulta)
+        if topico:
+            citadas = self.normas_do_topico(topico)
+
+        linhas = [f"⚖️ **LexAprendiz** - Legislação vigente em {data:%d/%m/%Y}", ""]
+        if citadas:
+            titulo = self.conhecimento[topico]['pergunta_padrao'] if topico else "Normas consultadas"
+            linhas.append(f"**📋 {titulo.upper()}:**")
+            linhas.extend(
+                f"• {self.legislacao_vigente[chave]['rotulo']} — {self.situacao_norma(chave, data)}"
+                for chave in citadas
+            )
+            linhas.append("")
+
+        demais = [chave for chave in self.normas_vigentes(data) if chave not in citadas]
+        if demais:
+            linhas.append("**📚 DEMAIS NORMAS VIGENTES NA DATA:**")
+            linhas.extend(f"• {self.legislacao_vigente[chave]['rotulo']}" for chave in demais)
+            linhas.append("")
+
+        linhas.append("*Datas conforme o cadastro de normas do LexAprendiz; confirme a redação vigente no Diário Oficial.*")
+        return '\n'.join(linhas)
 
     def _resposta_exclusoes_legais(self):
         return """⚖️ **LexAprendiz** - Exclusões do Cálculo da Cota
@@ -411,7 +867,7 @@ Cota Máxima = 15% da Base de Cálculo
 
 **🔍 FUNDAMENTAÇÃO LEGAL:**
 📚 **CLT art. 428, §2º** - Garantia salarial
-📚 **Decreto 11.864/2023** - Salário mínimo 2024: R$ 1.412,00
+📚 **{decreto_salario_minimo}** - Salário mínimo {ano_salario_minimo}: R$ {salario_minimo}
 
 **💰 REGRAS SALARIAIS:**
 
@@ -421,7 +877,7 @@ Cota Máxima = 15% da Base de Cálculo
 • Não pode ser inferior ao piso nacional
 
 **2. CÁLCULO PROPORCIONAL:**
-• Base: R$ 1.412,00 ÷ 220h = R$ 6,42/hora (2024)
+• Base: R$ {salario_minimo} ÷ {horas_mensais}h = R$ {salario_hora}/hora ({ano_salario_minimo})
 • Jornada máxima: 6h/dia (teoria + prática)
 • Salário mensal proporcional à jornada
 
@@ -436,11 +892,11 @@ Cota Máxima = 15% da Base de Cálculo
 • Convenções coletivas podem prever valores superiores
 • Política salarial da empresa pode beneficiar
 
-**📊 EXEMPLO PRÁTICO (2024):**
+**📊 EXEMPLO PRÁTICO ({ano_salario_minimo}):**
 ```
-Jornada: 6h/dia × 22 dias = 132h/mês
-Salário: 132h × R$ 6,42 = R$ 847,44
-FGTS: R$ 847,44 × 2% = R$ 16,95
+Jornada: {jornada_exemplo}h/dia × {dias_exemplo} dias = {horas_exemplo}h/mês
+Salário: {horas_exemplo}h × R$ {salario_hora} = R$ {salario_exemplo}
+FGTS: R$ {salario_exemplo} × 2% = R$ {fgts_exemplo}
 ```
 
 **⚠️ VEDAÇÕES:** Não pode receber menos que o proporcional ao mínimo"""
@@ -900,5 +1356,8 @@ A jornada reduzida visa garantir tempo para educação formal e formação profi
 **⚠️ ÔNUS DA PROVA:**
 A empresa deve comprovar a justa causa ou desempenho insuficiente. Na dúvida, presume-se rescisão sem justa causa com direito a todas as verbas."""
 
-# Instância global do banco de conhecimento
-banco_conhecimento = BancoConhecimentoAprendizagem()
\ No newline at end of file
+# Instância global do banco de conhecimento (dados/ quando exportados; recarregável em execução)
+# Com `adk build-index`, o snapshot vem pronto do artefato, se o código e os dados não mudaram
+banco_conhecimento = ReferenciaAtomica(
+    carregar_artefato('banco') or BancoConhecimentoAprendizagem(carregar_dados_conhecimento())
+)
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""
+Base SQLite Compartilhada - LexAprendiz
+Arquivo somente leitura com tópicos, respostas e programas do CONAP (FTS5 nos programas),
+consultado por conexões de leitura reaproveitadas entre as requisições
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from artefatos import FONTES, impressao_fontes
+from normalizacao import normalizar
+
+logger = logging.getLogger(__name__)
+# Arquivo gerado a partir dos dados de banco_conhecimento.py e conap_database.py
+ARQUIVO_BASE = Path(__file__).with_name("lexaprendiz.db")
+
+# Conexões de leitura mantidas abertas por processo
+TAMANHO_POOL = 4
+
+# Código e dados de que a base é gerada; uma base de fontes antigas é ignorada,
+# para que o texto das respostas no arquivo não se sobreponha ao código atual
+FONTES_BASE = [fonte for nome in ('banco', 'conap') for fonte in FONTES[nome] if fonte != ARQUIVO_BASE]
+
+ESQUEMA = """
+CREATE TABLE metadados (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE TABLE topicos (
+    topico TEXT PRIMARY KEY,
+    pergunta_padrao TEXT NOT NULL,
+    legislacao_base TEXT NOT NULL,
+    keywords TEXT NOT NULL
+);
+CREATE TABLE respostas (
+    topico TEXT PRIMARY KEY,
+    texto TEXT NOT NULL
+);
+CREATE TABLE programas (
+    numero TEXT PRIMARY KEY,
+    area_key TEXT NOT NULL,
+    area_nome TEXT NOT NULL,
+    dados TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE programas_fts USING fts5(
+    numero UNINDEXED, nome, descricao, cbo, area, escolas,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def gerar_base_sqlite(caminho=ARQUIVO_BASE):
+    """Gera o arquivo SQLite a partir dos dados atuais do banco de conhecimento e do CONAP"""
+    from banco_conhecimento import banco_conhecimento
+    from conap_database import conap_db
+
+    caminho = Path(caminho)
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    if temporario.exists():
+        temporario.unlink()
+
+    conn = sqlite3.connect(temporario)
+    try:
+        conn.executescript(ESQUEMA)
+        conn.execute("INSERT INTO metadados VALUES ('fontes', ?)", (impressao_fontes(FONTES_BASE),))
+
+        for topico, dados in banco_conhecimento.conhecimento.items():
+            texto = banco_conhecimento._gerar_resposta(topico)
+
+            conn.execute(
+                "INSERT INTO topicos VALUES (?, ?, ?, ?)",
+                (topico, dados['pergunta_padrao'],
+                 json.dumps(dados['legislacao_base'], ensure_ascii=False),
+                 json.dumps(dados['keywords'], ensure_ascii=False))
+            )
+            conn.execute("INSERT INTO respostas VALUES (?, ?)", (topico, texto))
+
+        for area_key, area_data in conap_db.programas.items():
+            for programa in area_data["programas"]:
+                conn.execute(
+                    "INSERT INTO programas VALUES (?, ?, ?, ?)",
+                    (programa["numero"], area_key, area_data["nome"],
+                     json.dumps(programa, ensure_ascii=False))
+                )
+                conn.execute(
+                    "INSERT INTO programas_fts VALUES (?, ?, ?, ?, ?, ?)",
+                    (programa["numero"], programa["nome"], programa["descricao"],
+                     " ".join(programa["cbo"]), area_data["nome"],
+                     " ".join(programa["escolas_sistema_s"]))
+                )
+
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    # Troca atômica: leitores abertos continuam vendo o arquivo anterior
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def montar_consulta_fts(consulta):
+    """Converte texto livre em expressão MATCH do FTS5 (radicais como prefixo, unidos por OR)"""
+    termos = normalizar(consulta).termos
+    return " OR ".join('"{}"*'.format(termo.replace('"', '""')) for termo in termos)
+
+
+class PoolLeitura:
+    """Pool de conexões SQLite somente leitura compartilhadas entre threads"""
+
+    def __init__(self, caminho=ARQUIVO_BASE, tamanho=TAMANHO_POOL):
+        self.caminho = Path(caminho)
+        self.tamanho = tamanho
+        self.ociosas = []
+        # Conexões vivas (ociosas + emprestadas); nunca passa de `tamanho`
+        self.criadas = 0
+        # Incrementada por fechar(): conexões de gerações antigas são fechadas na devolução
+        self.geracao = 0
+        # Resultado da conferência das fontes, refeita após fechar()
+        self.atualizada = None
+        self.livre = threading.Condition(threading.Lock())
+
+    def disponivel(self):
+        """Indica se o arquivo da base foi gerado a partir do código e dos dados atuais"""
+        if not self.caminho.exists():
+            return False
+        if self.atualizada is None:
+            self.atualizada = self._conferir_fontes()
+        return self.atualizada
+
+    def _conferir_fontes(self):
+        try:
+            linhas = self.consultar("SELECT valor FROM metadados WHERE chave = 'fontes'")
+        except sqlite3.Error:
+            linhas = []
+        if linhas and linhas[0][0] == impressao_fontes(FONTES_BASE):
+            return True
+        logger.warning("%s foi gerada de outras fontes e será ignorada; rode `python base_sqlite.py`", self.caminho.name)
+        return False
+
+    def _abrir(self):
+        uri = "file:{}?mode=ro".format(self.caminho.resolve().as_posix())
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @contextmanager
+    def conexao(self):
+        """Empresta uma conexão de leitura e a devolve ao pool ao final"""
+        with self.livre:
+            while not self.ociosas and self.criadas >= self.tamanho:
+                self.livre.wait()
+            geracao = self.geracao
+            conn = self.ociosas.pop() if self.ociosas else None
+            if conn is None:
+                self.criadas += 1
+
+        if conn is None:
+            try:
+                conn = self._abrir()
+            except BaseException:
+                with self.livre:
+                    self.criadas -= 1
+                    self.livre.notify()
+                raise
+
+        try:
+            yield conn
+        finally:
+            self._devolver(conn, geracao)
+
+    def _devolver(self, conn, geracao):
+        with self.livre:
+            atual = geracao == self.geracao
+            if atual:
+                self.ociosas.append(conn)
+            else:
+                self.criadas -= 1
+            self.livre.notify()
+        if not atual:
+            conn.close()
+
+    def consultar(self, sql, parametros=()):
+        """Executa uma consulta e retorna todas as linhas"""
+        with self.conexao() as conn:
+            return conn.execute(sql, parametros).fetchall()
+
+    def fechar(self):
+        """Fecha as conexões ociosas (ex.: após regerar o arquivo); as emprestadas são fechadas ao voltar"""
+        with self.livre:
+            ociosas, self.ociosas = self.ociosas, []
+            self.criadas -= len(ociosas)
+            self.geracao += 1
+            self.atualizada = None
+            self.livre.notify_all()
+        for conn in ociosas:
+            conn.close()
+
+
+# Instância global do pool de leitura
+pool_leitura = PoolLeitura()
+
+
+def obter_resposta_armazenada(topico):
+    """Lê o texto completo de uma resposta na base SQLite (None se indisponível)"""
+    if not pool_leitura.disponivel():
+        return None
+    linhas = pool_leitura.consultar("SELECT texto FROM respostas WHERE topico = ?", (topico,))
+    return linhas[0][0] if linhas else None
+
+
+def buscar_programas_fts(consulta, limite=5):
+    """Busca textual nos programas do CONAP; retorna (programa, nome da área)"""
+    expressao = montar_consulta_fts(consulta)
+    if not expressao or not pool_leitura.disponivel():
+        return []
+
+    linhas = pool_leitura.consultar(
+        """
+        SELECT p.dados, p.area_nome FROM programas_fts f
+        JOIN programas p ON p.numero = f.numero
+        WHERE programas_fts MATCH ? ORDER BY f.rank LIMIT ?
+        """,
+        (expressao, limite)
+    )
+    return [(json.loads(dados), area_nome) for dados, area_nome in linhas]
+
+
+if __name__ == "__main__":
+    print(f"Base gerada em {gerar_base_sqlite()}")
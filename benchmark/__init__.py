@@ -0,0 +1,4 @@
+"""
+Benchmark do LexAprendiz
+Perguntas de referência rotuladas para medir acurácia e latência dos roteadores
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from benchmark.executar import main
+
+sys.exit(main())
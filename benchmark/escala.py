@@ -0,0 +1,221 @@
+"""
+Benchmark de Escala - LexAprendiz
+Monta o banco de conhecimento e o CONAP sobre bases sintéticas de tamanho crescente
+e mede tempo de montagem, memória e latência das consultas em cada tamanho, com o
+expoente de crescimento entre o menor e o maior (0 = constante, 1 = linear).
+
+Uso:
+    python -m benchmark.escala                                  # 100/1.000/10.000 tópicos e 1.000/10.000/100.000 programas
+    python -m benchmark.escala --topicos 100 1000 --programas   # só o banco de conhecimento
+    python -m benchmark.escala --saida escala.json --sem-memoria
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmark.executar import resumir
+from benchmark.sintetico import gerar_conap, gerar_conhecimento, gravar_conhecimento
+from cache_consultas import limpar_caches
+from normalizacao import dobrar_acentos
+from recarga import carregar_dados_conhecimento
+
+TOPICOS_PADRAO = [100, 1000, 10000]
+PROGRAMAS_PADRAO = [1000, 10000, 100000]
+
+# Consultas sorteadas por operação e tamanho
+CONSULTAS = 100
+
+
+def montar_banco(diretorio):
+    """Banco de conhecimento com os índices preguiçosos (BM25 e passagens) já montados"""
+    from banco_conhecimento import BancoConhecimentoAprendizagem
+
+    banco = BancoConhecimentoAprendizagem(carregar_dados_conhecimento(diretorio))
+    banco.indice_bm25
+    banco.passagens
+    return banco
+
+
+def montar_conap(dados):
+    """CONAP com o índice aproximado dos nomes já montado"""
+    from conap_database import CONAPDatabase
+
+    db = CONAPDatabase(dados)
+    db.buscar_programa_aproximado('')
+    return db
+
+
+def consultas_banco(dados, quantidade, aleatorio):
+    """Operação -> (função sobre o banco, consultas) para o banco de conhecimento"""
+    registros = aleatorio.choices(list(dados['conhecimento'].values()), k=quantidade)
+    por_keyword = [f"o que diz a lei sobre {registro['keywords'][0]}?" for registro in registros]
+    # Frases da resposta sem a keyword: caem na busca ranqueada
+    por_texto = [registro['texto_resposta'].split('\n')[3].split(':** ')[-1] for registro in registros]
+    return {
+        'buscar_resposta': (lambda banco, consulta: banco._buscar_resposta(consulta), por_keyword),
+        'buscar_passagens': (lambda banco, consulta: banco._buscar_resposta(consulta, modo='passagens'), por_keyword),
+        'buscar_ranqueado': (lambda banco, consulta: banco.buscar_ranqueado(consulta), por_texto),
+    }
+
+
+def consultas_conap(dados, quantidade, aleatorio):
+    """Operação -> (função sobre o CONAP, consultas) para o catálogo"""
+    programas = aleatorio.choices(
+        [programa for area in dados['programas'].values() for programa in area['programas']], k=quantidade
+    )
+    areas = [area['nome'] for area in dados['programas'].values()]
+    return {
+        'por_numero': (lambda db, numero: db.buscar_programa_por_numero(numero), [p['numero'] for p in programas]),
+        'por_nome': (lambda db, nome: db.buscar_programa_por_nome(nome), [p['nome'] for p in programas]),
+        'por_cbo': (lambda db, cbo: db.buscar_programa_por_cbo(cbo), [p['cbo'][0] for p in programas]),
+        'aproximado': (
+            lambda db, texto: db.buscar_programa_aproximado(texto),
+            [f"curso de {dobrar_acentos(p['nome']).lower()}" for p in programas],
+        ),
+        'por_area': (lambda db, area: db.buscar_programas_por_area(area), aleatorio.choices(areas, k=quantidade)),
+        'por_sistema_s': (
+            lambda db, escola: db.buscar_por_sistema_s(escola), [p['escolas_sistema_s'][0] for p in programas]
+        ),
+        'por_faixa_etaria': (
+            lambda db, idade: db.buscar_por_faixa_etaria(idade), [aleatorio.randint(14, 24) for _ in programas]
+        ),
+        'facetada': (
+            lambda db, filtros: db.consultar_programas(**filtros, limite=3),
+            [
+                {'area': area, 'escola': p['escolas_sistema_s'][0], 'idade': aleatorio.randint(14, 24)}
+                for p, area in zip(programas, aleatorio.choices(areas, k=quantidade))
+            ],
+        ),
+    }
+
+
+def medir_montagem(montar, entrada, memoria=True):
+    """(estrutura, segundos, memória {pico, retida} em bytes ou None)"""
+    gc.collect()
+    inicio = time.perf_counter()
+    estrutura = montar(entrada)
+    segundos = time.perf_counter() - inicio
+
+    medida = None
+    if memoria:
+        # Passada separada: o tracemalloc distorce o tempo
+        del estrutura
+        gc.collect()
+        tracemalloc.start()
+        try:
+            estrutura = montar(entrada)
+            retida, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        medida = {'pico': pico, 'retida': retida}
+    return estrutura, round(segundos, 4), medida
+
+
+def medir_consultas(estrutura, operacoes):
+    """Latência (ms) de cada operação, com os caches do processo esvaziados antes de cada chamada"""
+    latencias = {}
+    for nome, (funcao, consultas) in operacoes.items():
+        tempos = []
+        for consulta in consultas:
+            limpar_caches()
+            inicio = time.perf_counter_ns()
+            funcao(estrutura, consulta)
+            tempos.append((time.perf_counter_ns() - inicio) / 1e6)
+        latencias[nome] = resumir(tempos)
+    return latencias
+
+
+def expoente(pontos, medida):
+    """Inclinação log-log entre o menor e o maior tamanho"""
+    menor, maior = pontos[0], pontos[-1]
+    if len(pontos) < 2 or not medida(menor) or not medida(maior):
+        return None
+    return round(math.log(medida(maior) / medida(menor)) / math.log(maior['tamanho'] / menor['tamanho']), 2)
+
+
+def resumir_curva(pontos):
+    """Expoentes de crescimento da montagem, da memória e do p50 de cada operação"""
+    if len(pontos) < 2:
+        return {}
+    curva = {'montagem_s': expoente(pontos, lambda ponto: ponto['montagem_s'])}
+    if pontos[0]['memoria_bytes']:
+        curva['memoria_retida'] = expoente(pontos, lambda ponto: ponto['memoria_bytes']['retida'])
+    for operacao in pontos[0]['latencia_ms']:
+        curva[operacao] = expoente(pontos, lambda ponto: ponto['latencia_ms'][operacao]['p50'])
+    return curva
+
+
+def escala_banco(tamanhos, consultas=CONSULTAS, semente=0, memoria=True):
+    """Pontos da curva do banco de conhecimento, um por quantidade de tópicos"""
+    pontos = []
+    for tamanho in tamanhos:
+        dados = gerar_conhecimento(tamanho, semente)
+        with tempfile.TemporaryDirectory(prefix="lexaprendiz_escala_") as diretorio:
+            gravar_conhecimento(dados, diretorio)
+            banco, segundos, medida = medir_montagem(montar_banco, diretorio, memoria)
+            latencias = medir_consultas(banco, consultas_banco(dados, consultas, random.Random(semente)))
+        pontos.append({'tamanho': tamanho, 'montagem_s': segundos, 'memoria_bytes': medida, 'latencia_ms': latencias})
+        del banco
+    return {'pontos': pontos, 'expoentes': resumir_curva(pontos)}
+
+
+def escala_conap(tamanhos, consultas=CONSULTAS, semente=0, memoria=True):
+    """Pontos da curva do CONAP, um por quantidade de programas"""
+    pontos = []
+    for tamanho in tamanhos:
+        dados = gerar_conap(tamanho, semente)
+        db, segundos, medida = medir_montagem(montar_conap, dados, memoria)
+        latencias = medir_consultas(db, consultas_conap(dados, consultas, random.Random(semente)))
+        pontos.append({'tamanho': tamanho, 'montagem_s': segundos, 'memoria_bytes': medida, 'latencia_ms': latencias})
+        del db
+    return {'pontos': pontos, 'expoentes': resumir_curva(pontos)}
+
+
+def executar(topicos=TOPICOS_PADRAO, programas=PROGRAMAS_PADRAO, consultas=CONSULTAS, semente=0, memoria=True):
+    """Roda as curvas pedidas e retorna o resultado em formato serializável"""
+    resultado = {'python': platform.python_version(), 'consultas': consultas, 'semente': semente, 'curvas': {}}
+    if topicos:
+        resultado['curvas']['banco'] = escala_banco(topicos, consultas, semente, memoria)
+    if programas:
+        resultado['curvas']['conap'] = escala_conap(programas, consultas, semente, memoria)
+    return resultado
+
+
+def main(argv=None):
+    """Ponto de entrada de `python -m benchmark.escala`"""
+    parser = argparse.ArgumentParser(description="Benchmark de escala do LexAprendiz com bases sintéticas")
+    parser.add_argument('--topicos', type=int, nargs='*', default=TOPICOS_PADRAO, help="tamanhos do banco de conhecimento")
+    parser.add_argument('--programas', type=int, nargs='*', default=PROGRAMAS_PADRAO, help="tamanhos do catálogo CONAP")
+    parser.add_argument('--consultas', type=int, default=CONSULTAS, help="consultas sorteadas por operação")
+    parser.add_argument('--semente', type=int, default=0, help="semente das bases e das consultas")
+    parser.add_argument('--sem-memoria', action='store_true', help="dispensa a passada com tracemalloc")
+    parser.add_argument('--saida', help="grava o resultado JSON neste arquivo")
+    args = parser.parse_args(argv)
+
+    resultado = executar(args.topicos, args.programas, args.consultas, args.semente, not args.sem_memoria)
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+    if args.saida:
+        Path(args.saida).write_text(texto + "\n", encoding='utf-8')
+    else:
+        print(texto)
+
+    # Tabela legível na saída de erro, para não misturar com o JSON
+    for nome, curva in resultado['curvas'].items():
+        for ponto in curva['pontos']:
+            memoria = f" | retida {ponto['memoria_bytes']['retida'] / 2**20:.1f} MiB" if ponto['memoria_bytes'] else ""
+            operacoes = ' '.join(f"{operacao} {medidas['p50']:.3f}" for operacao, medidas in ponto['latencia_ms'].items())
+            print(f"{nome} {ponto['tamanho']:>7}: montagem {ponto['montagem_s']:.2f} s{memoria} | p50 ms: {operacoes}", file=sys.stderr)
+        if curva['expoentes']:
+            print(f"{nome} expoentes: " + ' '.join(f"{chave} {valor}" for chave, valor in curva['expoentes'].items()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
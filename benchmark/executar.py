@@ -0,0 +1,259 @@
+"""
+Executor do Benchmark - LexAprendiz
+Roda as perguntas de referência nos roteadores e mede acurácia, latência
+(p50/p95/p99, com caches frios e quentes) e memória alocada por chamada.
+
+Uso:
+    python -m benchmark                          # resultado JSON na saída padrão
+    python -m benchmark --saida atual.json       # grava o resultado
+    python -m benchmark --comparar anterior.json # mostra as diferenças entre versões
+
+Perguntas marcadas com "regressao": true já foram quebradas por alguma mudança e
+precisam continuar certas: se alguma errar, o comando termina com código 1.
+"""
+import argparse
+import json
+import math
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from cache_consultas import limpar_caches
+
+ARQUIVO_PERGUNTAS = Path(__file__).with_name("perguntas_ouro.json")
+
+# Rodadas de medição de latência por pergunta
+REPETICOES = 5
+
+PADRAO_NUMERO_CONAP = re.compile(r'\*\*Número CONAP:\*\* (\d+)')
+
+
+def carregar_perguntas(caminho=ARQUIVO_PERGUNTAS):
+    """Conjunto de perguntas rotuladas: {'versao': n, 'perguntas': [{pergunta, alvo, esperado, regressao?}]}"""
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def alvo_banco():
+    """banco_conhecimento.buscar_resposta; rótulo é o tópico cuja resposta foi devolvida"""
+    from banco_conhecimento import banco_conhecimento
+
+    respostas = {banco_conhecimento.obter_resposta(topico): topico for topico in banco_conhecimento.conhecimento}
+    return banco_conhecimento.buscar_resposta, lambda resultado: respostas.get(resultado, '?') if resultado else None
+
+
+def alvo_streamlit():
+    """streamlit_app.get_response; rótulo é a intenção cuja resposta foi devolvida"""
+    from streamlit_app import get_response, INTENCOES_RESPOSTA
+
+    respostas = {get_response(termos[0]): intencao for intencao, termos in INTENCOES_RESPOSTA.items()}
+    respostas[get_response('')] = 'padrao'
+    return get_response, lambda resultado: respostas.get(resultado, '?')
+
+
+def alvo_conap():
+    """consultar_conap; rótulo é o primeiro número de programa CONAP da resposta"""
+    from conap_database import consultar_conap
+
+    def rotular(resultado):
+        if resultado is None:
+            return None
+        numero = PADRAO_NUMERO_CONAP.search(resultado)
+        return numero.group(1) if numero else 'outro'
+
+    return consultar_conap, rotular
+
+
+def alvo_relevancia():
+    """Filtro de relevância do web_app; rótulo é o próprio booleano"""
+    from web_app import e_sobre_aprendizagem
+
+    return e_sobre_aprendizagem, lambda resultado: resultado
+
+
+def alvo_autocompletar():
+    """autocompletar.sugerir; rótulo é o destino da primeira sugestão"""
+    from autocompletar import sugerir
+
+    return sugerir, lambda resultado: resultado[0]['destino'] if resultado else None
+
+
+ALVOS = {
+    'banco': alvo_banco,
+    'streamlit': alvo_streamlit,
+    'conap': alvo_conap,
+    'relevancia': alvo_relevancia,
+    'autocompletar': alvo_autocompletar,
+}
+
+
+def percentil(valores, p):
+    """Percentil pelo método do posto mais próximo"""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    posicao = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[posicao]
+
+
+def resumir(valores, casas=4):
+    """Média e percentis p50/p95/p99 de uma série"""
+    if not valores:
+        return {'media': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    return {
+        'media': round(sum(valores) / len(valores), casas),
+        'p50': round(percentil(valores, 50), casas),
+        'p95': round(percentil(valores, 95), casas),
+        'p99': round(percentil(valores, 99), casas),
+    }
+
+
+def medir_alvo(funcao, rotular, perguntas, repeticoes=REPETICOES):
+    """Acurácia, latência fria/quente (ms) e pico de memória (bytes) por chamada"""
+    acertos = 0
+    erros = []
+    for item in perguntas:
+        obtido = rotular(funcao(item['pergunta']))
+        if obtido == item['esperado']:
+            acertos += 1
+        else:
+            erro = {'pergunta': item['pergunta'], 'esperado': item['esperado'], 'obtido': obtido}
+            if item.get('regressao'):
+                erro['regressao'] = True
+            erros.append(erro)
+
+    # Fria: caches do processo esvaziados antes de cada chamada; quente: chamada repetida
+    frias, quentes = [], []
+    for _ in range(repeticoes):
+        for item in perguntas:
+            limpar_caches()
+            inicio = time.perf_counter_ns()
+            funcao(item['pergunta'])
+            meio = time.perf_counter_ns()
+            funcao(item['pergunta'])
+            fim = time.perf_counter_ns()
+            frias.append((meio - inicio) / 1e6)
+            quentes.append((fim - meio) / 1e6)
+
+    # Memória em passada separada: o tracemalloc distorce o tempo
+    picos = []
+    tracemalloc.start()
+    try:
+        for item in perguntas:
+            limpar_caches()
+            tracemalloc.reset_peak()
+            antes, _ = tracemalloc.get_traced_memory()
+            funcao(item['pergunta'])
+            _, pico = tracemalloc.get_traced_memory()
+            picos.append(pico - antes)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'perguntas': len(perguntas),
+        'acertos': acertos,
+        'acuracia': round(acertos / len(perguntas), 4) if perguntas else 0.0,
+        'latencia_ms': {'fria': resumir(frias), 'quente': resumir(quentes)},
+        'memoria_pico_bytes': resumir(picos, casas=0),
+        'erros': erros,
+    }
+
+
+def executar(caminho=ARQUIVO_PERGUNTAS, repeticoes=REPETICOES, alvos=None):
+    """Roda o benchmark e retorna o resultado em formato serializável"""
+    conjunto = carregar_perguntas(caminho)
+    resultado = {
+        'versao_perguntas': conjunto['versao'],
+        'python': platform.python_version(),
+        'repeticoes': repeticoes,
+        'alvos': {},
+        'indisponiveis': {},
+    }
+
+    for nome, preparar in ALVOS.items():
+        if alvos and nome not in alvos:
+            continue
+        perguntas = [item for item in conjunto['perguntas'] if item['alvo'] == nome]
+        try:
+            funcao, rotular = preparar()
+        except ImportError as e:
+            # Ex.: streamlit ausente no ambiente de medição
+            resultado['indisponiveis'][nome] = str(e)
+            continue
+        resultado['alvos'][nome] = medir_alvo(funcao, rotular, perguntas, repeticoes)
+
+    return resultado
+
+
+def comparar(atual, anterior):
+    """Linhas com a variação de acurácia e latência entre dois resultados"""
+    linhas = []
+    for nome, medidas in atual['alvos'].items():
+        base = anterior.get('alvos', {}).get(nome)
+        if base is None:
+            linhas.append(f"{nome}: sem resultado anterior")
+            continue
+        linhas.append(
+            f"{nome}: acurácia {base['acuracia']:.1%} -> {medidas['acuracia']:.1%} "
+            f"({medidas['acuracia'] - base['acuracia']:+.1%})"
+        )
+        for modo in ('fria', 'quente'):
+            for chave in ('p50', 'p95', 'p99'):
+                antes = base['latencia_ms'][modo][chave]
+                depois = medidas['latencia_ms'][modo][chave]
+                variacao = f" ({(depois - antes) / antes:+.0%})" if antes else ""
+                linhas.append(f"    {modo} {chave}: {antes:.3f} -> {depois:.3f} ms{variacao}")
+
+        esperados = {(erro['pergunta'], erro['esperado']) for erro in base['erros']}
+        for erro in medidas['erros']:
+            if (erro['pergunta'], erro['esperado']) not in esperados:
+                linhas.append(f"    novo erro: {erro['pergunta']!r} esperado={erro['esperado']} obtido={erro['obtido']}")
+    return linhas
+
+
+def main(argv=None):
+    """Ponto de entrada de `python -m benchmark`"""
+    parser = argparse.ArgumentParser(description="Benchmark de acurácia e latência do LexAprendiz")
+    parser.add_argument('--perguntas', default=str(ARQUIVO_PERGUNTAS), help="arquivo JSON de perguntas rotuladas")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES, help="rodadas de medição de latência")
+    parser.add_argument('--alvo', action='append', choices=list(ALVOS), help="limita a um ou mais alvos")
+    parser.add_argument('--saida', help="grava o resultado JSON neste arquivo")
+    parser.add_argument('--comparar', help="resultado JSON anterior para comparação")
+    args = parser.parse_args(argv)
+
+    resultado = executar(args.perguntas, args.repeticoes, args.alvo)
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2, sort_keys=True)
+
+    if args.saida:
+        Path(args.saida).write_text(texto + "\n", encoding='utf-8')
+    else:
+        print(texto)
+
+    # Resumo legível na saída de erro, para não misturar com o JSON
+    for nome, medidas in resultado['alvos'].items():
+        latencia = medidas['latencia_ms']
+        print(
+            f"{nome}: acurácia {medidas['acuracia']:.1%} ({medidas['acertos']}/{medidas['perguntas']}) | "
+            f"fria p50 {latencia['fria']['p50']:.3f} ms p95 {latencia['fria']['p95']:.3f} ms "
+            f"p99 {latencia['fria']['p99']:.3f} ms | quente p50 {latencia['quente']['p50']:.3f} ms | "
+            f"pico {medidas['memoria_pico_bytes']['media']:.0f} B",
+            file=sys.stderr
+        )
+    for nome, motivo in resultado['indisponiveis'].items():
+        print(f"{nome}: indisponível ({motivo})", file=sys.stderr)
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)
+        for linha in comparar(resultado, anterior):
+            print(linha, file=sys.stderr)
+
+    regressoes = [
+        (nome, erro) for nome, medidas in resultado['alvos'].items() for erro in medidas['erros'] if erro.get('regressao')
+    ]
+    for nome, erro in regressoes:
+        print(f"{nome}: regressão {erro['pergunta']!r} esperado={erro['esperado']} obtido={erro['obtido']}", file=sys.stderr)
+    return 1 if regressoes else 0
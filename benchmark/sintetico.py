@@ -0,0 +1,186 @@
+"""
+Bases Sintéticas do LexAprendiz
+Gera bancos de conhecimento e catálogos CONAP no formato de dados/ (conhecimento.json,
+conap.json e respostas/<tópico>.md), em tamanhos arbitrários e de forma
+determinística pela semente, para medir a escala antes da chegada dos dados reais
+"""
+import random
+from pathlib import Path
+
+from recarga import gravar_json
+
+# Vocabulário real da aprendizagem; as palavras sintéticas completam a cauda longa
+PALAVRAS_JURIDICAS = [
+    'aprendiz', 'aprendizagem', 'contrato', 'cota', 'jornada', 'salário', 'férias', 'rescisão',
+    'fiscalização', 'multa', 'portaria', 'decreto', 'empresa', 'estabelecimento', 'entidade',
+    'formação', 'profissional', 'técnico', 'metódica', 'teórica', 'prática', 'frequência',
+    'escola', 'matrícula', 'idade', 'deficiência', 'gestante', 'estabilidade', 'insalubre',
+    'perigoso', 'noturno', 'horas', 'compensação', 'fgts', 'inss', 'vale-transporte',
+    'cadastro', 'programa', 'curso', 'carga horária', 'auditor', 'notificação', 'prazo',
+    'contratação', 'indireta', 'cumprimento', 'alternativo', 'sistema s', 'ocupação', 'função',
+]
+
+SILABAS = ['ba', 'ca', 'da', 'fa', 'ga', 'la', 'ma', 'na', 'pa', 'ra', 'sa', 'ta', 'va',
+           'be', 'ce', 'de', 'le', 'me', 'ne', 'pe', 're', 'se', 'te', 'bi', 'ci', 'di',
+           'li', 'mi', 'ni', 'pi', 'ri', 'si', 'ti', 'bo', 'co', 'do', 'lo', 'mo', 'no',
+           'po', 'ro', 'so', 'to', 'bu', 'cu', 'du', 'lu', 'mu', 'nu', 'pu', 'ru', 'tu']
+
+TIPOS_NORMA = [('Portaria', 'portaria'), ('Decreto', 'decreto'), ('Lei', 'lei'), ('IN SIT', 'in_sit')]
+
+TITULOS_SECAO = ['FUNDAMENTAÇÃO', 'REQUISITOS', 'PROCEDIMENTOS', 'EXCEÇÕES', 'PRAZOS', 'OBRIGAÇÕES']
+
+OCUPACOES = ['Auxiliar', 'Assistente', 'Operador', 'Técnico', 'Montador', 'Mecânico',
+             'Eletricista', 'Recepcionista', 'Vendedor', 'Conferente', 'Ajudante', 'Instalador']
+
+ESCOLAS_SISTEMA_S = ['SENAI', 'SENAC', 'SENAT', 'SENAR', 'SESCOOP']
+
+FAIXAS_ETARIAS = ['14 a 24 anos', '16 a 24 anos', '18 a 24 anos']
+
+# Ordem de grandeza da CBO 2002: cerca de 2.700 ocupações em 600 famílias
+FAMILIAS_CBO = 600
+OCUPACOES_POR_FAMILIA = 5
+
+
+def gerar_vocabulario(tamanho, aleatorio):
+    """Palavras jurídicas seguidas de palavras sintéticas distintas ("balepi", "tocura")"""
+    palavras = list(PALAVRAS_JURIDICAS)
+    vistas = set(palavras)
+    while len(palavras) < tamanho:
+        palavra = ''.join(aleatorio.choice(SILABAS) for _ in range(aleatorio.randint(3, 4)))
+        if palavra not in vistas:
+            vistas.add(palavra)
+            palavras.append(palavra)
+    return palavras
+
+
+def sortear_zipf(vocabulario, aleatorio, quantidade):
+    """Palavras com frequência decrescente pela posição, como num texto real"""
+    pesos = [1 / posicao for posicao in range(1, len(vocabulario) + 1)]
+    return aleatorio.choices(vocabulario, weights=pesos, k=quantidade)
+
+
+def gerar_normas(quantidade, aleatorio):
+    """legislacao_vigente sintética: chave -> registro com rótulo e datas"""
+    normas = {}
+    while len(normas) < quantidade:
+        tipo, prefixo = aleatorio.choice(TIPOS_NORMA)
+        numero, ano = aleatorio.randint(1, 9999), aleatorio.randint(1990, 2024)
+        chave = f"{prefixo}_{numero}_{ano}"
+        if chave in normas:
+            continue
+        inicio = f"{ano}-{aleatorio.randint(1, 12):02d}-{aleatorio.randint(1, 28):02d}"
+        revogada = aleatorio.random() < 0.2 and ano < 2024
+        normas[chave] = {
+            'rotulo': f"{tipo} nº {numero:,}/{ano}".replace(',', '.') + f" - Norma sintética {len(normas) + 1}",
+            'publicacao': inicio, 'inicio_vigencia': inicio,
+            'revogacao': f"{ano + 1}-01-01" if revogada else None, 'revogada_por': None,
+        }
+    return normas
+
+
+def gerar_resposta(titulo, citacoes, vocabulario, aleatorio):
+    """Resposta no formato das respostas da base: cabeçalho, seções 🔹 e fontes"""
+    linhas = [f"⚖️ **LexAprendiz** - {titulo}", ""]
+    for secao in aleatorio.sample(TITULOS_SECAO, aleatorio.randint(2, 4)):
+        linhas.append(f"**🔹 {secao}**")
+        for _ in range(aleatorio.randint(2, 4)):
+            linhas.append(f"- **{aleatorio.choice(citacoes)}:** " + ' '.join(sortear_zipf(vocabulario, aleatorio, 12)))
+        linhas.append("")
+    linhas.append("**🔗 FONTES OFICIAIS:**")
+    linhas.extend(f"- {citacao}" for citacao in citacoes)
+    return '\n'.join(linhas)
+
+
+def gerar_conhecimento(topicos, semente=0):
+    """Dados no formato de conhecimento.json, com as respostas em 'texto_resposta' (ainda sem arquivo)"""
+    aleatorio = random.Random(semente)
+    vocabulario = gerar_vocabulario(max(500, topicos * 3), aleatorio)
+    normas = gerar_normas(max(10, topicos // 10), aleatorio)
+    rotulos = [registro['rotulo'].split(' - ')[0] for registro in normas.values()]
+
+    conhecimento = {}
+    for posicao in range(topicos):
+        # Uma keyword própria do tópico (cauda do vocabulário) e outras compartilhadas
+        propria = vocabulario[len(PALAVRAS_JURIDICAS) + posicao % (len(vocabulario) - len(PALAVRAS_JURIDICAS))]
+        keywords = list(dict.fromkeys([propria] + sortear_zipf(vocabulario, aleatorio, aleatorio.randint(2, 6))))
+        titulo = ' '.join([propria] + keywords[1:3]).capitalize()
+        citacoes = aleatorio.sample(rotulos, min(len(rotulos), aleatorio.randint(1, 3)))
+        conhecimento[f"topico_{posicao:05d}"] = {
+            'pergunta_padrao': titulo,
+            'legislacao_base': citacoes,
+            'texto_resposta': gerar_resposta(titulo, citacoes, vocabulario, aleatorio),
+            'keywords': keywords,
+        }
+    return {'versao': f"sintetico-{topicos}-{semente}", 'legislacao_vigente': normas, 'conhecimento': conhecimento}
+
+
+def gravar_conhecimento(dados, diretorio):
+    """Grava conhecimento.json e respostas/<tópico>.md como exportar_dados faria"""
+    diretorio = Path(diretorio)
+    respostas = diretorio / "respostas"
+    respostas.mkdir(parents=True, exist_ok=True)
+
+    conhecimento = {}
+    for topico, registro in dados['conhecimento'].items():
+        registro = dict(registro)
+        (respostas / f"{topico}.md").write_text(registro.pop('texto_resposta'), encoding='utf-8')
+        conhecimento[topico] = dict(registro, resposta=f"respostas/{topico}.md")
+
+    gravar_json(diretorio / "conhecimento.json", dict(dados, conhecimento=conhecimento))
+    return diretorio
+
+
+def gerar_cbos(aleatorio):
+    """Códigos CBO ("4110-10") na ordem de grandeza da classificação completa"""
+    familias = sorted(aleatorio.sample(range(1000, 10000), FAMILIAS_CBO))
+    return [
+        f"{familia}-{ocupacao * 5:02d}"
+        for familia in familias
+        for ocupacao in range(1, OCUPACOES_POR_FAMILIA + 1)
+    ]
+
+
+def gerar_conap(programas, semente=0, areas=40):
+    """Dados no formato de conap.json; todas as CBOs aparecem quando há programas suficientes"""
+    aleatorio = random.Random(semente)
+    vocabulario = gerar_vocabulario(max(500, programas // 20), aleatorio)
+    cbos = gerar_cbos(aleatorio)
+
+    catalogo = {
+        f"area_{posicao:02d}": {'nome': f"Área {vocabulario[posicao].capitalize()}", 'programas': []}
+        for posicao in range(areas)
+    }
+    chaves_areas = list(catalogo)
+    for posicao in range(programas):
+        especialidade = ' '.join(vocabulario[indice] for indice in divmod(posicao, len(vocabulario)))
+        carga = aleatorio.choice([400, 600, 800, 1000, 1200, 1600])
+        catalogo[chaves_areas[posicao % areas]]['programas'].append({
+            'numero': f"{posicao + 1:06d}",
+            'nome': f"{aleatorio.choice(OCUPACOES)} de {especialidade.title()}",
+            'cbo': [cbos[posicao % len(cbos)]] + ([aleatorio.choice(cbos)] if aleatorio.random() < 0.3 else []),
+            'descricao': ' '.join(sortear_zipf(vocabulario, aleatorio, 14)).capitalize(),
+            'faixa_etaria': aleatorio.choice(FAIXAS_ETARIAS),
+            'carga_horaria': f"{carga} horas",
+            'duracao': f"{carga // 66} meses",
+            'escolas_sistema_s': sorted(aleatorio.sample(ESCOLAS_SISTEMA_S, aleatorio.randint(1, 2))),
+        })
+
+    arcos = {
+        f"arco_{posicao:02d}": {
+            'nome': f"Arco {vocabulario[areas + posicao].capitalize()}",
+            'areas': [catalogo[chave]['nome'] for chave in chaves_areas[posicao::8]],
+            'programas_relacionados': [
+                programa['numero'] for chave in chaves_areas[posicao::8] for programa in catalogo[chave]['programas'][:5]
+            ],
+        }
+        for posicao in range(8)
+    }
+    return {'versao': f"sintetico-{programas}-{semente}", 'programas': catalogo, 'arcos_ocupacionais': arcos}
+
+
+def gravar_conap(dados, diretorio):
+    """Grava conap.json"""
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    gravar_json(diretorio / "conap.json", dados)
+    return diretorio
@@ -0,0 +1,159 @@
+"""
+Busca em Lote do Banco de Conhecimento - LexAprendiz
+Avaliação de muitas consultas de uma vez, usada na reexecução noturna das
+perguntas registradas: consultas repetidas são avaliadas uma vez, a análise dos
+termos divide entre as consultas o trabalho do índice aproximado e os scores
+são acumulados com NumPy
+"""
+import numpy as np
+
+from indice_conhecimento import IndiceBM25
+from normalizacao import normalizar
+
+# Consultas processadas por bloco (limita a memória dos pares consulta-tópico)
+TAMANHO_BLOCO = 1024
+
+
+def _postings_arrays(postings, dtype):
+    """termo -> (posições dos tópicos, pesos) em arrays contíguos"""
+    return {
+        termo: (np.fromiter((posicao for posicao, _ in lista), dtype=np.int64, count=len(lista)),
+                np.fromiter((peso for _, peso in lista), dtype=dtype, count=len(lista)))
+        for termo, lista in postings.items()
+    }
+
+
+class AvaliadorLote:
+    """Listas de postings dos índices do banco de conhecimento em arrays NumPy.
+
+    Os scores são acumulados só nos pares (consulta, tópico) que aparecem nas listas
+    dos termos de cada consulta, sem matrizes densas vocabulário × tópicos
+    """
+
+    def __init__(self, indice, indice_bm25, casador):
+        self.topicos = indice.topicos
+        self.casador = casador
+        # Termos que os tópicos só têm como sinônimos do tesauro: no empate, perdem para as keywords
+        self.sinonimos = casador.exatos.get('topicos', set())
+
+        # Keywords: contagem inteira de ocorrências (mesma pontuação da busca individual)
+        self.postings_keywords = _postings_arrays(
+            {termo: [(indice.ordem[topico], ocorrencias) for topico, ocorrencias in lista]
+             for termo, lista in indice.postings.items()},
+            np.int64
+        )
+
+        # BM25: pesos já calculados no índice ranqueado
+        self.topicos_bm25 = indice_bm25.topicos
+        self.postings_bm25 = _postings_arrays(indice_bm25.postings, np.float64)
+
+    @staticmethod
+    def _acumular(conjuntos_termos, postings, largura, dtype):
+        """(consultas, posições, scores) somados por par consulta-tópico presente nas listas"""
+        linhas, posicoes, pesos = [], [], []
+        for linha, termos in enumerate(conjuntos_termos):
+            for termo in termos:
+                lista = postings.get(termo)
+                if lista is not None:
+                    linhas.append(np.full(len(lista[0]), linha, dtype=np.int64))
+                    posicoes.append(lista[0])
+                    pesos.append(lista[1])
+        if not linhas:
+            vazio = np.zeros(0, dtype=np.int64)
+            return vazio, vazio, np.zeros(0, dtype=dtype)
+
+        # Cada par vira uma chave inteira; termos diferentes no mesmo par são somados
+        chaves = np.concatenate(linhas) * largura + np.concatenate(posicoes)
+        pares, inversos = np.unique(chaves, return_inverse=True)
+        scores = np.bincount(inversos, weights=np.concatenate(pesos), minlength=len(pares)).astype(dtype)
+        return pares // largura, pares % largura, scores
+
+    @staticmethod
+    def _primeiros(linhas, ordem):
+        """Índices do primeiro par de cada consulta na ordem dada"""
+        linhas = linhas[ordem]
+        inicio = np.ones(len(linhas), dtype=bool)
+        inicio[1:] = linhas[1:] != linhas[:-1]
+        return ordem[inicio]
+
+    def _melhores_keywords(self, exatos, aproximados):
+        """{consulta: (posição, score)} com o mesmo critério de IndiceInvertido.melhor_topico"""
+        # Termos só aproximados entram com score à parte: eles apenas desempatam
+        largura = len(self.topicos)
+        declarados = [set(termos) - self.sinonimos for termos in exatos]
+        linhas_e, posicoes_e, scores_e = self._acumular(exatos, self.postings_keywords, largura, np.int64)
+        linhas_d, posicoes_d, scores_d = self._acumular(declarados, self.postings_keywords, largura, np.int64)
+        linhas_a, posicoes_a, scores_a = self._acumular(aproximados, self.postings_keywords, largura, np.int64)
+
+        # União dos pares exatos e aproximados, com os scores lado a lado
+        chaves_e = linhas_e * largura + posicoes_e
+        chaves_d = linhas_d * largura + posicoes_d
+        chaves_a = linhas_a * largura + posicoes_a
+        pares = np.union1d(chaves_e, chaves_a)
+        exato = np.zeros(len(pares), dtype=np.int64)
+        declarado = np.zeros(len(pares), dtype=np.int64)
+        aproximado = np.zeros(len(pares), dtype=np.int64)
+        exato[np.searchsorted(pares, chaves_e)] = scores_e
+        declarado[np.searchsorted(pares, chaves_d)] = scores_d
+        aproximado[np.searchsorted(pares, chaves_a)] = scores_a
+        linhas, posicoes = pares // largura, pares % largura
+
+        # Maior score exato, depois aproximado, depois só keywords declaradas, depois o tópico declarado primeiro
+        ordem = np.lexsort((posicoes, -declarado, -aproximado, -exato, linhas))
+        primeiros = self._primeiros(linhas, ordem)
+        melhores = {}
+        for i in primeiros:
+            total = int(exato[i] + aproximado[i])
+            if total > 0:
+                melhores[int(linhas[i])] = (int(posicoes[i]), total)
+        return melhores
+
+    def _melhores_bm25(self, consultas, limiar):
+        """{índice na lista: (tópico, score)} das consultas com score BM25 acima do limiar"""
+        tokens = [set(IndiceBM25.tokenizar(consulta)) for consulta in consultas]
+        linhas, posicoes, scores = self._acumular(tokens, self.postings_bm25, len(self.topicos_bm25), np.float64)
+        ordem = np.lexsort((posicoes, -scores, linhas))
+        melhores = {}
+        for i in self._primeiros(linhas, ordem):
+            if scores[i] > limiar:
+                melhores[int(linhas[i])] = (self.topicos_bm25[posicoes[i]], float(scores[i]))
+        return melhores
+
+    def avaliar(self, consultas, limiar):
+        """Retorna (tópico, score) por consulta; (None, 0) quando não há resposta local"""
+        # Consultas iguais depois da normalização são avaliadas uma vez
+        posicoes = {}
+        unicas = []
+        for consulta in consultas:
+            chave = normalizar(consulta).chave
+            if chave not in posicoes:
+                posicoes[chave] = len(unicas)
+                unicas.append(consulta)
+
+        # Termos de todas as consultas numa passada: as janelas de palavras repetidas entre
+        # perguntas passam uma só vez pelo índice aproximado (o custo dominante da análise)
+        termos = self.casador.encontrar_termos_lote(unicas)
+
+        resultados = []
+        for inicio in range(0, len(unicas), TAMANHO_BLOCO):
+            bloco = unicas[inicio:inicio + TAMANHO_BLOCO]
+
+            # Keywords: uma acumulação sobre as listas por bloco
+            exatos, aproximados = zip(*termos[inicio:inicio + TAMANHO_BLOCO])
+            melhores = self._melhores_keywords(exatos, aproximados)
+
+            # Consultas sem keyword seguem para o BM25, como em buscar_resposta
+            sem_keyword = [i for i in range(len(bloco)) if i not in melhores]
+            melhores_bm25 = {
+                sem_keyword[linha]: resultado
+                for linha, resultado in self._melhores_bm25([bloco[i] for i in sem_keyword], limiar).items()
+            }
+
+            for i in range(len(bloco)):
+                if i in melhores:
+                    posicao, score = melhores[i]
+                    resultados.append((self.topicos[posicao], score))
+                else:
+                    resultados.append(melhores_bm25.get(i, (None, 0)))
+
+        return [resultados[posicoes[normalizar(consulta).chave]] for consulta in consultas]
@@ -0,0 +1,131 @@
+"""
+Cache de Consultas do LexAprendiz
+Memorização LRU limitada (com TTL opcional) compartilhada por todo o processo,
+incluindo cache negativo para consultas sem resposta local
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from normalizacao import limpar_cache_normalizacao, normalizar
+
+# Marca interna para distinguir "não está no cache" de "resposta vazia em cache"
+_AUSENTE = object()
+
+
+def normalizar_chave(consulta):
+    """Chave de cache da consulta (minúsculas, espaços colapsados), da normalização compartilhada"""
+    return normalizar(consulta).chave
+
+
+class CacheLRU:
+    """Cache LRU limitado por tamanho, com expiração opcional e contadores de uso"""
+
+    def __init__(self, nome, tamanho_maximo=256, ttl=None):
+        self.nome = nome
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl = ttl
+        self.itens = OrderedDict()  # chave -> (valor, instante de gravação)
+        self.trava = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirados = 0
+
+    def obter(self, chave, padrao=_AUSENTE):
+        """Retorna o valor em cache (inclusive None) ou `padrao` se ausente/expirado"""
+        with self.trava:
+            item = self.itens.get(chave, _AUSENTE)
+            if item is _AUSENTE:
+                self.misses += 1
+                return padrao
+
+            valor, gravado_em = item
+            if self.ttl is not None and time.monotonic() - gravado_em > self.ttl:
+                del self.itens[chave]
+                self.expirados += 1
+                self.misses += 1
+                return padrao
+
+            self.itens.move_to_end(chave)
+            self.hits += 1
+            return valor
+
+    def guardar(self, chave, valor):
+        """Grava o valor e descarta o item menos usado se o limite for excedido"""
+        with self.trava:
+            self.itens[chave] = (valor, time.monotonic())
+            self.itens.move_to_end(chave)
+            while len(self.itens) > self.tamanho_maximo:
+                self.itens.popitem(last=False)
+                self.evictions += 1
+
+    def limpar(self):
+        """Remove todos os itens (os contadores são mantidos)"""
+        with self.trava:
+            self.itens.clear()
+
+    def estatisticas(self):
+        """Contadores para ajuste de tamanho e TTL"""
+        with self.trava:
+            consultas = self.hits + self.misses
+            return {
+                'nome': self.nome,
+                'tamanho': len(self.itens),
+                'tamanho_maximo': self.tamanho_maximo,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirados': self.expirados,
+                'taxa_acerto': (self.hits / consultas) if consultas else 0.0,
+            }
+
+
+# Caches globais do processo
+cache_respostas = CacheLRU("banco_conhecimento", tamanho_maximo=512)
+cache_referencias = CacheLRU("banco_referencias", tamanho_maximo=512)
+cache_conap = CacheLRU("conap", tamanho_maximo=512)
+cache_pesquisa = CacheLRU("pesquisa_legislacao", tamanho_maximo=128, ttl=3600)
+# Análises das keywords dos tópicos, divididas pelos casadores de todos os snapshots do banco
+cache_topicos = CacheLRU("intencoes_topicos", tamanho_maximo=1024)
+
+CACHES = [cache_respostas, cache_referencias, cache_conap, cache_pesquisa, cache_topicos]
+
+
+def memorizar(cache, geracao=None):
+    """Decorador que memoriza uma função de consulta pela chave normalizada.
+
+    Resultados None também são guardados (cache negativo), de modo que uma
+    pergunta repetida sem resposta local não refaz toda a cascata de buscas.
+    `geracao` (função sem argumentos) entra na chave para que respostas de
+    uma base recarregada nunca sejam servidas a partir da base anterior.
+    """
+    def decorador(funcao):
+        @wraps(funcao)
+        def envoltorio(consulta, *args, **kwargs):
+            chave = (normalizar_chave(consulta),) + args + tuple(sorted(kwargs.items()))
+            if geracao is not None:
+                chave = (geracao(),) + chave
+            valor = cache.obter(chave)
+            if valor is _AUSENTE:
+                valor = funcao(consulta, *args, **kwargs)
+                cache.guardar(chave, valor)
+            return valor
+
+        envoltorio.cache = cache
+        return envoltorio
+    return decorador
+
+
+def estatisticas_caches():
+    """Estatísticas de todos os caches do processo"""
+    return [cache.estatisticas() for cache in CACHES]
+
+
+def limpar_caches():
+    """Esvazia todos os caches do processo (ex.: após atualizar a base)"""
+    for cache in CACHES:
+        cache.limpar()
+    limpar_cache_normalizacao()
@@ -0,0 +1,181 @@
+"""
+Catálogo CONAP Compacto - LexAprendiz
+Programas guardados em colunas em vez de um dicionário por programa: números e
+códigos em arrays contíguos, textos repetidos (CBO, escola, faixa etária, carga
+horária, arco) em tabelas de valores, e descrições comprimidas com um dicionário
+compartilhado (zlib). Os dicionários de cada programa são remontados só quando
+pedidos (formatação, exportação, base SQLite)
+"""
+import sys
+import zlib
+from array import array
+
+from indice_conap import duracao_meses, faixa_etaria_numerica, quantidade_horas
+
+# Campos de todo programa, na ordem em que são remontados
+CAMPOS_PROGRAMA = (
+    "numero", "nome", "cbo", "descricao", "faixa_etaria", "carga_horaria", "duracao", "escolas_sistema_s"
+)
+
+# Tamanho máximo do dicionário compartilhado de compressão (limite do zlib)
+TAMANHO_DICIONARIO = 32 * 1024
+
+# Maior valor guardado nas colunas numéricas (array 'H'); 0 = não informado
+MAXIMO_COLUNA = 0xFFFF
+
+
+def _limitar(valor):
+    """Valor da coluna numérica (None -> 0)"""
+    return min(valor or 0, MAXIMO_COLUNA)
+
+
+class TabelaValores:
+    """Valores distintos (textos repetidos entre programas) e seus códigos inteiros"""
+
+    def __init__(self):
+        self.valores = []
+        self.codigos = {}
+
+    def codigo(self, valor):
+        """Código do valor, incluído na primeira ocorrência"""
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = self.codigos[valor] = len(self.valores)
+            self.valores.append(sys.intern(valor) if isinstance(valor, str) else valor)
+        return codigo
+
+
+class ListasCompactas:
+    """Listas de inteiros de tamanho variável num único array, com o início de cada uma"""
+
+    def __init__(self):
+        self.inicios = array('I', [0])
+        self.valores = array('I')
+
+    def adicionar(self, valores):
+        self.valores.extend(valores)
+        self.inicios.append(len(self.valores))
+
+    def __getitem__(self, posicao):
+        return self.valores[self.inicios[posicao]:self.inicios[posicao + 1]]
+
+
+class DescricoesComprimidas:
+    """Descrições distintas comprimidas uma a uma com um dicionário zlib compartilhado.
+
+    As descrições do catálogo repetem muitos trechos ("normas regulamentadoras de saúde e
+    segurança no trabalho"); o dicionário, montado com uma amostra delas, reduz cada uma
+    a cerca de um quarto do tamanho sem perder o acesso direto por programa
+    """
+
+    def __init__(self, descricoes):
+        distintas = list(dict.fromkeys(descricoes))
+        passo = max(1, len(distintas) * 200 // TAMANHO_DICIONARIO)
+        self.dicionario = '\n'.join(distintas[::passo]).encode('utf-8')[-TAMANHO_DICIONARIO:]
+
+        codigos = {descricao: codigo for codigo, descricao in enumerate(distintas)}
+        blocos = [self._comprimir(descricao) for descricao in distintas]
+        self.dados = b''.join(blocos)
+        self.inicios = array('I', [0])
+        for bloco in blocos:
+            self.inicios.append(self.inicios[-1] + len(bloco))
+        self.codigos = array('I', (codigos[descricao] for descricao in descricoes))
+
+    def _comprimir(self, texto):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, self.dicionario)
+        return compressor.compress(texto.encode('utf-8')) + compressor.flush()
+
+    def __getitem__(self, posicao):
+        codigo = self.codigos[posicao]
+        bloco = self.dados[self.inicios[codigo]:self.inicios[codigo + 1]]
+        return zlib.decompressobj(-15, self.dicionario).decompress(bloco).decode('utf-8')
+
+
+class CatalogoCompacto:
+    """Programas do CONAP em colunas; a posição de cada programa segue a ordem das áreas"""
+
+    def __init__(self, programas_por_area):
+        self.areas = []  # código da área -> (chave, nome)
+        self.area = array('H')
+        self.numeros = []
+        self.nomes = []
+        self.cbos = TabelaValores()
+        self.cbo = ListasCompactas()
+        self.escolas = TabelaValores()
+        self.escola = ListasCompactas()
+        # Faixa etária, carga horária, duração e arco: poucos textos distintos no catálogo
+        self.textos = TabelaValores()
+        self.textos.codigo(None)  # código 0: campo ausente (ex.: programa sem arco)
+        self.faixa_etaria = array('I')
+        self.carga_horaria = array('I')
+        self.duracao = array('I')
+        self.arco = array('I')
+        # Valores numéricos para os filtros
+        self.idade_minima = array('H')
+        self.idade_maxima = array('H')
+        self.horas = array('H')
+        self.meses = array('H')
+        self.extras = {}  # posição -> campos fora do padrão
+
+        descricoes = []
+        for area_key, area_data in programas_por_area.items():
+            codigo_area = len(self.areas)
+            self.areas.append((area_key, area_data["nome"]))
+            for programa in area_data["programas"]:
+                posicao = len(self.numeros)
+                self.area.append(codigo_area)
+                self.numeros.append(sys.intern(programa["numero"]))
+                self.nomes.append(programa["nome"])
+                self.cbo.adicionar(self.cbos.codigo(cbo) for cbo in programa["cbo"])
+                self.escola.adicionar(self.escolas.codigo(escola) for escola in programa["escolas_sistema_s"])
+                # Faixa etária, duração e arco podem faltar (programas extraídos do PDF): código 0
+                self.faixa_etaria.append(self.textos.codigo(programa.get("faixa_etaria")))
+                self.carga_horaria.append(self.textos.codigo(programa["carga_horaria"]))
+                self.duracao.append(self.textos.codigo(programa.get("duracao")))
+                self.arco.append(self.textos.codigo(programa.get("arco")))
+                # Sem faixa informada valem os limites legais da aprendizagem
+                minima, maxima = faixa_etaria_numerica(programa.get("faixa_etaria", ""))
+                self.idade_minima.append(_limitar(minima))
+                self.idade_maxima.append(_limitar(maxima))
+                self.horas.append(_limitar(quantidade_horas(programa["carga_horaria"])))
+                self.meses.append(_limitar(duracao_meses(programa.get("duracao", ""))))
+                descricoes.append(programa["descricao"])
+                extras = {campo: valor for campo, valor in programa.items() if campo not in CAMPOS_PROGRAMA and campo != "arco"}
+                if extras:
+                    self.extras[posicao] = extras
+        self.descricoes = DescricoesComprimidas(descricoes)
+
+    def __len__(self):
+        return len(self.numeros)
+
+    def nome_area(self, posicao):
+        return self.areas[self.area[posicao]][1]
+
+    def cbos_programa(self, posicao):
+        return [self.cbos.valores[codigo] for codigo in self.cbo[posicao]]
+
+    def escolas_programa(self, posicao):
+        return [self.escolas.valores[codigo] for codigo in self.escola[posicao]]
+
+    def programa(self, posicao):
+        """Dicionário do programa, remontado a partir das colunas"""
+        programa = {
+            "numero": self.numeros[posicao],
+            "nome": self.nomes[posicao],
+            "cbo": self.cbos_programa(posicao),
+            "descricao": self.descricoes[posicao],
+            "carga_horaria": self.textos.valores[self.carga_horaria[posicao]],
+            "escolas_sistema_s": self.escolas_programa(posicao),
+        }
+        for campo, coluna in (("faixa_etaria", self.faixa_etaria), ("duracao", self.duracao), ("arco", self.arco)):
+            if coluna[posicao]:
+                programa[campo] = self.textos.valores[coluna[posicao]]
+        programa.update(self.extras.get(posicao, {}))
+        return programa
+
+    def programas_por_area(self):
+        """Estrutura original {área: {nome, programas}}, remontada (exportação, base SQLite)"""
+        areas = {area_key: {"nome": nome, "programas": []} for area_key, nome in self.areas}
+        for posicao in range(len(self)):
+            areas[self.areas[self.area[posicao]][0]]["programas"].append(self.programa(posicao))
+        return areas
@@ -2,12 +2,28 @@
 Módulo CONAP - Catálogo Nacional de Programas de Aprendizagem Profissional
 Base de dados estruturada dos programas de aprendizagem por área ocupacional
 """
+import hashlib
+from bisect import bisect_left
+from itertools import count
+
+from artefatos import carregar_artefato
+from base_sqlite import buscar_programas_fts
+from cache_consultas import cache_conap, memorizar
+from catalogo_conap import CatalogoCompacto
+from intencoes import analisar, registrar_intencoes
+from indice_conap import IndiceCatalogo, faixa_etaria_numerica
+from indice_fuzzy import IndiceFuzzy
+from normalizacao import PADRAO_CBO, PADRAO_IDADE, normalizar
+from recarga import ReferenciaAtomica, carregar_dados_conap, impressao
+
+# Cada snapshot recebe uma geração própria (chave do cache de consultas)
+GERACOES = count(1)
 
 class CONAPDatabase:
     """Base de dados do CONAP com programas de aprendizagem por área"""
     
-    def __init__(self):
-        self.programas = {
+    def __init__(self, dados=None, anterior=None):
+        programas = {
             # ADMINISTRAÇÃO E COMÉRCIO
             "administracao": {
                 "nome": "Administração e Comércio",
@@ -241,76 +257,132 @@ class CONAPDatabase:
                 "programas_relacionados": ["401", "402"]
             }
         }
+        
+        # Dados carregados de arquivos versionados substituem os registrados em código
+        if dados is not None:
+            programas = dados['programas']
+            self.arcos_ocupacionais = dados['arcos_ocupacionais']
+        self.versao = dados.get('versao') if dados else None
+        self.geracao = next(GERACOES)
+        
+        # Programas (por número) novos ou alterados em relação ao snapshot anterior;
+        # guarda só o resumo de cada impressão, não a cópia serializada do programa
+        self.impressoes = {
+            programa["numero"]: hashlib.blake2b(
+                impressao([area_key, area_data["nome"], programa]).encode('utf-8'), digest_size=8
+            ).digest()
+            for area_key, area_data in programas.items()
+            for programa in area_data["programas"]
+        }
+        self.alterados = {
+            numero for numero, marca in self.impressoes.items()
+            if anterior is None or anterior.impressoes.get(numero) != marca
+        }
+        
+        # Catálogo em colunas, índices (hash e faixas etárias) e índice aproximado dos nomes,
+        # este montado na primeira consulta; reaproveitados do snapshot anterior quando nenhum programa mudou
+        self._indice_nomes = None
+        if anterior is not None and anterior.impressoes == self.impressoes:
+            self.catalogo = anterior.catalogo
+            self.indice = anterior.indice
+            self._indice_nomes = anterior._indice_nomes
+        else:
+            self.catalogo = CatalogoCompacto(programas)
+            self.indice = IndiceCatalogo(self.catalogo)
+    
+    @property
+    def programas(self):
+        """Programas por área no formato original, remontados a partir do catálogo compacto"""
+        return self.catalogo.programas_por_area()
+    
+    def __getstate__(self):
+        """Dados e índices gravados no artefato (a geração é de cada processo)"""
+        estado = dict(self.__dict__)
+        del estado['geracao']
+        return estado
+    
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.geracao = next(GERACOES)
     
     def buscar_programa_por_nome(self, nome_programa):
-        """Busca programa por nome"""
-        nome_lower = nome_programa.lower()
+        """Busca programa por nome (palavras inteiras, sem diferenciar acentos)"""
+        return self.formatar_posicao(self.indice.nome(nome_programa))
+    
+    def buscar_programa_aproximado(self, texto):
+        """Busca programa cujo nome aparece no texto, tolerando falta de acento e erros de digitação"""
+        if self._indice_nomes is None:
+            self._indice_nomes = IndiceFuzzy((nome, posicao) for posicao, nome in enumerate(self.catalogo.nomes))
         
-        for area_key, area_data in self.programas.items():
-            for programa in area_data["programas"]:
-                if nome_lower in programa["nome"].lower():
-                    return self.formatar_programa(programa, area_data["nome"])
+        for _, posicao, _ in self._indice_nomes.buscar(texto):
+            return self.formatar_posicao(posicao)
         
         return None
     
     def buscar_programa_por_cbo(self, cbo):
         """Busca programa por CBO"""
-        for area_key, area_data in self.programas.items():
-            for programa in area_data["programas"]:
-                if cbo in programa["cbo"]:
-                    return self.formatar_programa(programa, area_data["nome"])
-        
-        return None
-    
+        posicoes = self.indice.cbo(cbo)
+        if not posicoes:
+            return None
+        # Prefere o programa em que a CBO é a principal (arcos reúnem várias ocupações)
+        principal = next((posicao for posicao in posicoes if self.catalogo.cbos_programa(posicao)[0] == cbo), posicoes[0])
+        return self.formatar_posicao(principal)
+
+    def buscar_programa_por_numero(self, numero):
+        """Busca programa pelo número CONAP"""
+        return self.formatar_posicao(self.indice.numero(numero))
+
     def buscar_programas_por_area(self, area):
-        """Busca todos os programas de uma área"""
-        area_lower = area.lower()
-        
-        for area_key, area_data in self.programas.items():
-            if area_lower in area_data["nome"].lower() or area_lower == area_key:
-                programas_formatados = []
-                for programa in area_data["programas"]:
-                    programas_formatados.append(self.formatar_programa(programa, area_data["nome"]))
-                return programas_formatados
-        
-        return []
+        """Busca todos os programas de uma área (chave ou nome da área)"""
+        return [self.formatar_posicao(posicao) for posicao in self.indice.area(area)]
     
     def buscar_por_sistema_s(self, escola):
         """Busca programas oferecidos por escola do Sistema S"""
-        escola_upper = escola.upper()
-        programas_encontrados = []
-        
-        for area_key, area_data in self.programas.items():
-            for programa in area_data["programas"]:
-                if escola_upper in programa["escolas_sistema_s"]:
-                    programas_encontrados.append(self.formatar_programa(programa, area_data["nome"]))
-        
-        return programas_encontrados
+        return [self.formatar_posicao(posicao) for posicao in self.indice.escola(escola)]
     
     def buscar_por_faixa_etaria(self, idade):
         """Busca programas adequados para determinada idade"""
-        programas_adequados = []
-        
-        for area_key, area_data in self.programas.items():
-            for programa in area_data["programas"]:
-                faixa = programa["faixa_etaria"]
-                if self.idade_adequada(idade, faixa):
-                    programas_adequados.append(self.formatar_programa(programa, area_data["nome"]))
-        
-        return programas_adequados
+        return [self.formatar_posicao(posicao) for posicao in self.indice.idade(idade)]
     
+    def consultar_programas(self, area=None, escola=None, idade=None, horas=None, arco=None, duracao=None,
+                            cursor=None, limite=10):
+        """Busca facetada: programas que atendem a todos os filtros, uma página por vez.
+
+        horas e duracao são faixas (mínimo, máximo) de carga horária e de meses. Retorna {total, programas (página
+        formatada), facetas (contagens por área, escola e arco), cursor (da próxima página, ou
+        None)}. O cursor vale para este snapshot: após uma recarga, a paginação recomeça
+        """
+        posicoes = self.indice.consultar(
+            area=area, escola=escola, idade=idade, horas=horas, arco=arco, duracao=duracao
+        )
+        inicio = 0 if cursor is None else bisect_left(posicoes, cursor)
+        pagina = posicoes[inicio:inicio + limite]
+        return {
+            "total": len(posicoes),
+            "programas": [self.formatar_posicao(posicao) for posicao in pagina],
+            "facetas": self.indice.facetas(posicoes),
+            "cursor": posicoes[inicio + limite] if inicio + limite < len(posicoes) else None,
+        }
+
     def idade_adequada(self, idade, faixa_etaria):
-        """Verifica se idade está na faixa adequada"""
-        try:
-            if "14 a 24" in faixa_etaria:
-                return 14 <= idade <= 24
-            elif "16 a 24" in faixa_etaria:
-                return 16 <= idade <= 24
-            elif "18 a 24" in faixa_etaria:
-                return 18 <= idade <= 24
-            return True
-        except:
-            return True
+        """Verifica se idade está na faixa adequada ("16 a 24 anos")"""
+        minimo, maximo = faixa_etaria_numerica(faixa_etaria)
+        return minimo <= idade <= maximo
+    
+    def buscar_programas_texto(self, consulta, limite=5):
+        """Busca textual (nome, descrição, CBO, área, escola) na base SQLite compartilhada.
+
+        Qualquer palavra em comum basta para o FTS ("previsão do tempo" encontra o
+        cronometrista), então só valem os programas cujo nome cobre a maioria dos termos
+        """
+        termos = [termo for termo in normalizar(consulta).termos if termo not in TERMOS_GENERICOS]
+        if not termos:
+            return []
+        return [
+            self.formatar_programa(programa, area_nome)
+            for programa, area_nome in buscar_programas_fts(consulta, CANDIDATOS_TEXTO)
+            if nome_cobre_termos(programa["nome"], termos)
+        ][:limite]
     
     def buscar_arco_ocupacional(self, nome_arco):
         """Busca informações sobre arco ocupacional"""
@@ -324,8 +396,15 @@ class CONAPDatabase:
     
     def formatar_programa(self, programa, area_nome):
         """Formata informações do programa"""
-        escolas = ", ".join(programa["escolas_sistema_s"])
+        escolas = ", ".join(programa["escolas_sistema_s"]) or "—"
         cbos = ", ".join(programa["cbo"])
+        # Programas extraídos do PDF nem sempre informam faixa etária e duração
+        opcionais = "".join(
+            f"**{rotulo}:** {programa[campo]}\n"
+            for campo, rotulo in (("faixa_etaria", "Faixa Etária"), ("requisitos", "Requisitos"),
+                                  ("carga_horaria", "Carga Horária"), ("duracao", "Duração"))
+            if campo in programa
+        )
         
         return f"""
 **📋 {programa['nome']}**
@@ -333,12 +412,15 @@ class CONAPDatabase:
 **Número CONAP:** {programa['numero']}
 **CBO(s):** {cbos}
 **Descrição:** {programa['descricao']}
-**Faixa Etária:** {programa['faixa_etaria']}
-**Carga Horária:** {programa['carga_horaria']}
-**Duração:** {programa['duracao']}
-**Escolas Sistema S:** {escolas}
+{opcionais}**Escolas Sistema S:** {escolas}
 """
     
+    def formatar_posicao(self, posicao):
+        """Formata o programa na posição do índice (None se não encontrado)"""
+        if posicao is None:
+            return None
+        return self.formatar_programa(self.catalogo.programa(posicao), self.catalogo.nome_area(posicao))
+    
     def formatar_arco(self, arco_data, arco_key):
         """Formata informações do arco ocupacional"""
         areas = ", ".join(arco_data["areas"])
@@ -351,11 +433,7 @@ class CONAPDatabase:
     
     def listar_todas_areas(self):
         """Lista todas as áreas disponíveis"""
-        areas = []
-        for area_key, area_data in self.programas.items():
-            areas.append(f"• {area_data['nome']}")
-        
-        return "\n".join(areas)
+        return "\n".join(f"• {nome}" for _, nome in self.catalogo.areas)
     
     def listar_escolas_sistema_s(self):
         """Lista todas as escolas do Sistema S"""
@@ -368,87 +446,178 @@ class CONAPDatabase:
 • **SESCOOP** - Serviço Nacional de Aprendizagem do Cooperativismo
 """
 
-# Instância global do CONAP
-conap_db = CONAPDatabase()
+# Instância global do CONAP (dados/ quando exportados; recarregável em execução)
+# Com `adk build-index`, o snapshot vem pronto do artefato, se o código e os dados não mudaram
+conap_db = ReferenciaAtomica(carregar_artefato('conap') or CONAPDatabase(carregar_dados_conap()))
+
+# Tabelas de keywords do roteador do CONAP (compiladas no casador de intenções)
+CONAP_PROGRAMAS = ['assistente administrativo', 'vendedor', 'soldador', 'pedreiro', 'eletricista']
+
+CONAP_AREAS = {
+    'administração': 'administracao',
+    'comércio': 'administracao', 
+    'metalúrgica': 'metalurgia',
+    'tecnologia': 'tecnologia',
+    'informática': 'tecnologia',
+    'construção': 'construcao',
+    'saúde': 'saude',
+    'logística': 'logistica',
+    'transporte': 'logistica',
+    'agronegócio': 'agronegocio',
+    'agricultura': 'agronegocio'
+}
+
+CONAP_ESCOLAS = ['senai', 'senac', 'senat', 'senar', 'sescoop']
+
+CONAP_ARCOS = ['gestão', 'indústria', 'informação', 'infraestrutura', 'recursos naturais', 'serviços']
+
+registrar_intencoes('conap', {
+    'programa': CONAP_PROGRAMAS,
+    'cbo': ['cbo'],
+    'area': list(CONAP_AREAS),
+    'escola': CONAP_ESCOLAS,
+    'idade': ['idade', 'anos', 'faixa etária'],
+    'arco': ['arco'],
+    'nome_arco': CONAP_ARCOS,
+    'generico': ['áreas', 'programas disponíveis', 'catálogo', 'conap'],
+})
+
+# Programas mostrados por resposta do chat
+LIMITE_PROGRAMAS = 3
+
+# Programas do FTS conferidos pelo nome na busca textual
+CANDIDATOS_TEXTO = 20
+
+# Palavras que não identificam um programa na busca textual ("curso de eletricista")
+TERMOS_GENERICOS = frozenset(normalizar("programa curso aprendizagem aprendiz").termos)
+
+# Filtros retirados, um de cada vez e nesta ordem, quando a combinação não completa a resposta
+ORDEM_RELAXAMENTO = ('idade', 'escola', 'area')
+
+
+def nome_cobre_termos(nome, termos):
+    """Indica se o nome contém mais da metade dos termos (como prefixo, igual ao FTS)"""
+    palavras = normalizar(nome).termos
+    cobertos = sum(any(palavra.startswith(termo) for palavra in palavras) for termo in termos)
+    return 2 * cobertos > len(termos)
+
+
+def titulo_consulta(db, filtros):
+    """ "**Programas de Saúde do SENAC adequados para 17 anos:**" """
+    partes = []
+    if 'area' in filtros:
+        partes.append(f"de {dict(db.catalogo.areas).get(filtros['area'], filtros['area'])}")
+    if 'escola' in filtros:
+        partes.append(f"do {filtros['escola'].upper()}")
+    if 'idade' in filtros:
+        partes.append(f"adequados para {filtros['idade']} anos")
+    return f"**Programas {' '.join(partes)}:**"
 
+
+def descrever_filtro(db, filtro, valor):
+    """Filtro retirado, como aparece na resposta ("idade de 30 anos")"""
+    if filtro == 'idade':
+        return f"idade de {valor} anos"
+    if filtro == 'escola':
+        return f"escola {valor.upper()}"
+    return f"área {dict(db.catalogo.areas).get(valor, valor)}"
+
+
+def consultar_combinado(db, filtros, limite=LIMITE_PROGRAMAS):
+    """Programas que atendem a todos os filtros; se não completam a resposta, os filtros são
+    retirados um a um (idade primeiro) e a resposta diz quais filtros deixaram de valer"""
+    resultado = db.consultar_programas(**filtros, limite=limite)
+    mostrados = list(resultado["programas"])
+    partes = []
+    if mostrados:
+        partes.append(titulo_consulta(db, filtros) + "\n" + "\n".join(mostrados))
+        if resultado["cursor"] is not None:
+            partes.append(f"*Exibindo {len(mostrados)} de {resultado['total']} programas encontrados.*")
+    
+    restantes = dict(filtros)
+    retirados = []
+    for filtro in ORDEM_RELAXAMENTO:
+        if len(mostrados) >= limite or len(restantes) == 1:
+            break
+        if filtro not in restantes:
+            continue
+        retirados.append(descrever_filtro(db, filtro, restantes.pop(filtro)))
+        # Pede os já mostrados a mais: eles voltam na consulta menos restrita
+        relaxado = db.consultar_programas(**restantes, limite=limite + len(mostrados))
+        novos = [programa for programa in relaxado["programas"] if programa not in mostrados][:limite - len(mostrados)]
+        if novos:
+            aviso = "Nenhum programa atende" if not mostrados else "Poucos programas atendem"
+            sem = "sem o filtro de" if len(retirados) == 1 else "sem os filtros de"
+            partes.append(
+                f"*{aviso} a todos os filtros; {sem} {' e '.join(retirados)}:*\n"
+                + titulo_consulta(db, restantes) + "\n" + "\n".join(novos)
+            )
+            mostrados.extend(novos)
+    
+    return "\n".join(partes) if mostrados else None
+
+@memorizar(cache_conap, geracao=lambda: conap_db.geracao)
 def consultar_conap(pergunta):
     """Função principal para consultar o CONAP"""
-    pergunta_lower = pergunta.lower()
+    consulta = normalizar(pergunta)
+    ocorrencias = analisar(consulta)
+    
+    # A consulta inteira usa o mesmo snapshot, mesmo que uma recarga ocorra no meio
+    db = conap_db.atual
     
     # Busca por nome de programa específico
-    if any(termo in pergunta_lower for termo in ['assistente administrativo', 'vendedor', 'soldador', 'pedreiro', 'eletricista']):
-        for termo in ['assistente administrativo', 'vendedor', 'soldador', 'pedreiro', 'eletricista']:
-            if termo in pergunta_lower:
-                resultado = conap_db.buscar_programa_por_nome(termo)
-                if resultado:
-                    return resultado
+    for termo in ocorrencias.termos('conap', 'programa'):
+        resultado = db.buscar_programa_por_nome(termo)
+        if resultado:
+            return resultado
     
     # Busca por CBO
-    if 'cbo' in pergunta_lower:
-        import re
-        cbo_match = re.search(r'\d{4}-\d{2}', pergunta)
+    if ocorrencias.tem('conap', 'cbo'):
+        cbo_match = PADRAO_CBO.search(consulta.chave)
         if cbo_match:
-            resultado = conap_db.buscar_programa_por_cbo(cbo_match.group())
+            resultado = db.buscar_programa_por_cbo(cbo_match.group())
             if resultado:
                 return resultado
     
-    # Busca por área
-    areas_keywords = {
-        'administração': 'administracao',
-        'comércio': 'administracao', 
-        'metalúrgica': 'metalurgia',
-        'tecnologia': 'tecnologia',
-        'informática': 'tecnologia',
-        'construção': 'construcao',
-        'saúde': 'saude',
-        'logística': 'logistica',
-        'transporte': 'logistica',
-        'agronegócio': 'agronegocio',
-        'agricultura': 'agronegocio'
-    }
-    
-    for keyword, area_key in areas_keywords.items():
-        if keyword in pergunta_lower:
-            programas = conap_db.buscar_programas_por_area(area_key)
-            if programas:
-                return "\n".join(programas[:3])  # Limita a 3 programas
-    
-    # Busca por Sistema S
-    escolas_s = ['senai', 'senac', 'senat', 'senar', 'sescoop']
-    for escola in escolas_s:
-        if escola in pergunta_lower:
-            programas = conap_db.buscar_por_sistema_s(escola)
-            if programas:
-                return f"**Programas do {escola.upper()}:**\n" + "\n".join(programas[:3])
-    
-    # Busca por faixa etária
-    if any(termo in pergunta_lower for termo in ['idade', 'anos', 'faixa etária']):
-        import re
-        idade_match = re.search(r'(\d+)\s*anos?', pergunta_lower)
+    # Área, escola do Sistema S e idade combinadas numa só consulta ("cursos do SENAI de metalurgia para 16 anos")
+    filtros = {}
+    areas = ocorrencias.termos('conap', 'area')
+    if areas:
+        filtros['area'] = CONAP_AREAS[areas[0]]
+    escolas = ocorrencias.termos('conap', 'escola')
+    if escolas:
+        filtros['escola'] = escolas[0]
+    if ocorrencias.tem('conap', 'idade'):
+        idade_match = PADRAO_IDADE.search(consulta.chave)
         if idade_match:
-            idade = int(idade_match.group(1))
-            programas = conap_db.buscar_por_faixa_etaria(idade)
-            if programas:
-                return f"**Programas adequados para {idade} anos:**\n" + "\n".join(programas[:3])
+            filtros['idade'] = int(idade_match.group(1))
+    if filtros:
+        resultado = consultar_combinado(db, filtros)
+        if resultado:
+            return resultado
+    
+    # Nome de programa sem acento ou com erro de digitação; depois dos filtros, pois o catálogo
+    # completo tem programas com o nome de uma área ("Saúde", "Logística")
+    resultado = db.buscar_programa_aproximado(consulta)
+    if resultado:
+        return resultado
     
     # Busca por arcos ocupacionais
-    if 'arco' in pergunta_lower:
-        arcos = ['gestão', 'indústria', 'informação', 'infraestrutura', 'recursos naturais', 'serviços']
-        for arco in arcos:
-            if arco in pergunta_lower:
-                resultado = conap_db.buscar_arco_ocupacional(arco)
-                if resultado:
-                    return resultado
+    if ocorrencias.tem('conap', 'arco'):
+        for arco in ocorrencias.termos('conap', 'nome_arco'):
+            resultado = db.buscar_arco_ocupacional(arco)
+            if resultado:
+                return resultado
     
     # Lista áreas se pergunta for genérica
-    if any(termo in pergunta_lower for termo in ['áreas', 'programas disponíveis', 'catálogo', 'conap']):
+    if ocorrencias.tem('conap', 'generico'):
         return f"""
 **📚 CONAP - Catálogo Nacional de Programas de Aprendizagem**
 
 **Áreas Disponíveis:**
-{conap_db.listar_todas_areas()}
+{db.listar_todas_areas()}
 
-{conap_db.listar_escolas_sistema_s()}
+{db.listar_escolas_sistema_s()}
 
 **💡 Exemplos de consulta:**
 • "Programas de administração"
@@ -457,4 +626,9 @@ def consultar_conap(pergunta):
 • "CBO 4110-10"
 """
     
+    # Busca textual na base compartilhada, quando gerada
+    programas = db.buscar_programas_texto(consulta, limite=3)
+    if programas:
+        return "\n".join(programas)
+    
     return None
\ No newline at end of file
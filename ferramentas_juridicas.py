@@ -7,6 +7,51 @@ import re
 from urllib.parse import quote
 from datetime import datetime
 import time
+from cache_consultas import cache_pesquisa, memorizar
+
+# Jurisprudências do TST sobre aprendizagem usadas na busca simulada
+JURISPRUDENCIAS_TST = [
+    {
+        'titulo': 'Súmula 74 do TST - Aprendiz - Contribuição Sindical',
+        'conteudo': 'A contribuição sindical é devida pelos aprendizes, considerando-se a natureza do contrato de trabalho.',
+        'link': 'https://www.tst.jus.br/sumulas',
+        'fonte': 'TST - Súmulas'
+    },
+    {
+        'titulo': 'Orientação Jurisprudencial 422 - Aprendiz - Limitação de Idade',
+        'conteudo': 'O contrato de aprendizagem pode ser celebrado com pessoa até 24 anos incompletos.',
+        'link': 'https://www.tst.jus.br/orientacoes-jurisprudenciais',
+        'fonte': 'TST - Orientações Jurisprudenciais'
+    }
+]
+
+# Portarias com dispositivos detalhados, por (número, ano)
+PORTARIAS_DETALHADAS = {
+    ("3.872", "2023"): {
+        'titulo': 'Portaria MTE nº 3.872, de 2023',
+        'conteudo': 'Estabelece diretrizes para fiscalização de contratos de aprendizagem pelos Auditores-Fiscais do Trabalho.',
+        'dispositivos_principais': {
+            'art_1': 'Finalidade e âmbito de aplicação da fiscalização',
+            'art_2': 'Competência dos Auditores-Fiscais do Trabalho',
+            'art_3': 'Procedimentos específicos de fiscalização',
+            'art_4': 'Critérios para cálculo da cota obrigatória',
+            'art_5': 'Penalidades e multas por descumprimento',
+            'art_6': 'Prazos para regularização das empresas'
+        },
+        'incisos_relevantes': [
+            'Art. 3º, I - Inspeção dos contratos vigentes',
+            'Art. 3º, II - Verificação de anotações na CTPS',
+            'Art. 3º, III - Análise da jornada de trabalho',
+            'Art. 3º, IV - Conferência de frequência escolar'
+        ],
+        'link': 'https://www.in.gov.br/web/dou/-/portaria-mte-n-3.872-de-2023',
+        'fonte': 'Diário Oficial da União',
+        'orgao': 'Ministério do Trabalho e Emprego',
+        'ano': '2023',
+        'observacao': 'Norma fundamental para procedimentos de fiscalização da aprendizagem pelos AFT',
+        'fundamentacao': ['Lei 10.097/2000', 'Decreto 5.598/2005', 'CLT art. 634-A']
+    },
+}
 
 class FerramentasJuridicas:
     """Conjunto de ferramentas para pesquisa jurídica em tempo real"""
@@ -88,30 +133,15 @@ class FerramentasJuridicas:
         Busca jurisprudências no TST relacionadas à aprendizagem
         """
         try:
-            # Simulação de busca no TST (o TST tem sistema complexo de busca)
-            jurisprudencias_relevantes = [
-                {
-                    'titulo': 'Súmula 74 do TST - Aprendiz - Contribuição Sindical',
-                    'conteudo': 'A contribuição sindical é devida pelos aprendizes, considerando-se a natureza do contrato de trabalho.',
-                    'link': 'https://www.tst.jus.br/sumulas',
-                    'fonte': 'TST - Súmulas'
-                },
-                {
-                    'titulo': 'Orientação Jurisprudencial 422 - Aprendiz - Limitação de Idade',
-                    'conteudo': 'O contrato de aprendizagem pode ser celebrado com pessoa até 24 anos incompletos.',
-                    'link': 'https://www.tst.jus.br/orientacoes-jurisprudenciais',
-                    'fonte': 'TST - Orientações Jurisprudenciais'
-                }
-            ]
-            
-            # Filtra por termo de busca
+            # Simulação de busca no TST (o TST tem sistema complexo de busca):
+            # filtra as jurisprudências registradas pelo termo de busca
             results = []
-            for jurisprudencia in jurisprudencias_relevantes:
+            for jurisprudencia in JURISPRUDENCIAS_TST:
                 if any(termo in jurisprudencia['titulo'].lower() or termo in jurisprudencia['conteudo'].lower() 
                       for termo in termo_busca.lower().split()):
                     results.append(jurisprudencia)
             
-            return results if results else jurisprudencias_relevantes[:2]
+            return results if results else JURISPRUDENCIAS_TST[:2]
             
         except Exception as e:
             return [{'erro': f'Erro na busca TST: {str(e)}'}]
@@ -127,32 +157,9 @@ class FerramentasJuridicas:
             dou_results = self.buscar_portaria_dou(numero, ano)
             results.extend(dou_results)
             
-            # Informações específicas sobre Portaria 3.872/2023 (detalhada)
-            if numero == "3.872" and ano == "2023":
-                results.append({
-                    'titulo': 'Portaria MTE nº 3.872, de 2023',
-                    'conteudo': 'Estabelece diretrizes para fiscalização de contratos de aprendizagem pelos Auditores-Fiscais do Trabalho.',
-                    'dispositivos_principais': {
-                        'art_1': 'Finalidade e âmbito de aplicação da fiscalização',
-                        'art_2': 'Competência dos Auditores-Fiscais do Trabalho',
-                        'art_3': 'Procedimentos específicos de fiscalização',
-                        'art_4': 'Critérios para cálculo da cota obrigatória',
-                        'art_5': 'Penalidades e multas por descumprimento',
-                        'art_6': 'Prazos para regularização das empresas'
-                    },
-                    'incisos_relevantes': [
-                        'Art. 3º, I - Inspeção dos contratos vigentes',
-                        'Art. 3º, II - Verificação de anotações na CTPS',
-                        'Art. 3º, III - Análise da jornada de trabalho',
-                        'Art. 3º, IV - Conferência de frequência escolar'
-                    ],
-                    'link': 'https://www.in.gov.br/web/dou/-/portaria-mte-n-3.872-de-2023',
-                    'fonte': 'Diário Oficial da União',
-                    'orgao': 'Ministério do Trabalho e Emprego',
-                    'ano': '2023',
-                    'observacao': 'Norma fundamental para procedimentos de fiscalização da aprendizagem pelos AFT',
-                    'fundamentacao': ['Lei 10.097/2000', 'Decreto 5.598/2005', 'CLT art. 634-A']
-                })
+            # Informações específicas de portarias detalhadas (ex.: Portaria 3.872/2023)
+            if (numero, ano) in PORTARIAS_DETALHADAS:
+                results.append(dict(PORTARIAS_DETALHADAS[(numero, ano)]))
             
             return results
             
@@ -200,6 +207,7 @@ class FerramentasJuridicas:
 # Instância global das ferramentas
 ferramentas_juridicas = FerramentasJuridicas()
 
+@memorizar(cache_pesquisa)
 def pesquisar_legislacao(consulta):
     """Função simplificada para uso nos agentes"""
     return ferramentas_juridicas.pesquisa_completa_aprendizagem(consulta)
\ No newline at end of file
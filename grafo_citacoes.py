@@ -0,0 +1,224 @@
+"""
+Grafo de Citações do LexAprendiz
+Extrai, na montagem, as normas e artigos citados pelas respostas do banco de
+conhecimento, do streamlit_app e das ferramentas jurídicas, e guarda listas de
+adjacência nos dois sentidos: "quais respostas dependem do Decreto 5.598, art. 10"
+e "tópicos relacionados" custam O(grau), sem varrer os textos a cada pergunta
+"""
+import logging
+import re
+import threading
+
+from banco_conhecimento import banco_conhecimento
+from normalizacao import dobrar_acentos
+
+logger = logging.getLogger(__name__)
+
+# Prefixo das chaves por tipo de norma (as mesmas de legislacao_vigente: "decreto_5598_2005")
+TIPOS_NORMA = {
+    'lei complementar': 'lc', 'lei': 'lei', 'decreto-lei': 'decreto_lei', 'decreto': 'decreto',
+    'portaria': 'portaria', 'instrucao normativa': 'in', 'in': 'in', 'resolucao': 'resolucao',
+    'medida provisoria': 'mp', 'mp': 'mp', 'sumula': 'sumula',
+    'orientacao jurisprudencial': 'oj', 'oj': 'oj',
+}
+
+# Normas citadas sem número
+NORMAS_POR_NOME = {'clt': 'clt_1943', 'cf': 'cf_1988', 'constituicao federal': 'cf_1988'}
+
+# Textos sem acento e em minúsculas; "Portaria/MTP nº 1.019/2021", "Decreto 5.598, de 1º/12/2005"
+PADRAO_NORMA = re.compile(
+    r'\b(' + '|'.join(sorted(TIPOS_NORMA, key=len, reverse=True)) + r')'
+    r'(?:[\s/]+(?:mte|mtp|sepec/me|sepec|me|sit|conanda))*'
+    r'\s+(?:no\.?\s*)?(\d{1,3}(?:\.\d{3})*)(?!\d)(?:\s*/\s*(\d{4}|\d{2})\b)?'
+)
+PADRAO_NORMA_NOME = re.compile(r'\b(' + '|'.join(NORMAS_POR_NOME) + r')\b(?:/88)?')
+PADRAO_ARTIGOS = re.compile(
+    r'\barts?\.?\s*(\d+o?(?:-[a-z]\b)?(?:\s*(?:,|e|a|-)\s*\d+o?(?:-[a-z]\b)?)*)'
+)
+PADRAO_ITEM_ARTIGO = re.compile(r'(\d+)o?(-[a-z]\b)?(?:\s*(?:a|-)\s*(\d+))?')
+PADRAO_URL = re.compile(r'https?://[^\s)]+')
+
+# Trecho entre a norma e o artigo ("CLT, art. 428", "Decreto 5.598/2005 - art. 10")
+PADRAO_LIGACAO_ANTES = re.compile(r'[\s,:\-)*]{0,4}')
+# Trecho entre o artigo e a norma ("art. 428 da CLT")
+PADRAO_LIGACAO_DEPOIS = re.compile(r'[^.;\n]{0,12}?\b(?:da|do)\s+')
+
+# Faixas de artigos maiores que isto ("arts. 1 a 400") não são expandidas
+MAX_FAIXA_ARTIGOS = 20
+
+
+def indexar_chaves(chaves):
+    """(prefixo, número) -> chaves conhecidas, a partir de chaves como "in_sit_146_2018" """
+    conhecidas = {}
+    for chave in chaves:
+        partes = chave.split('_')
+        if len(partes) >= 3 and partes[-1].isdigit() and partes[-2].isdigit():
+            conhecidas.setdefault((partes[0], partes[-2]), []).append(chave)
+    return conhecidas
+
+
+def chave_norma(tipo, numero, ano, conhecidas):
+    """Chave canônica da norma, reaproveitando a de legislacao_vigente quando existir"""
+    prefixo = TIPOS_NORMA[tipo]
+    numero = numero.replace('.', '')
+    if prefixo in ('sumula', 'oj'):
+        return f"{prefixo}_{numero}_tst"
+    if ano and len(ano) == 2:
+        ano = ('19' if int(ano) >= 30 else '20') + ano
+
+    candidatas = conhecidas.get((prefixo, numero), [])
+    if ano:
+        return next((chave for chave in candidatas if chave.endswith(f"_{ano}")), f"{prefixo}_{numero}_{ano}")
+    return candidatas[0] if len(candidatas) == 1 else f"{prefixo}_{numero}"
+
+
+def extrair_artigos(lista):
+    """Artigos de "428", "62 e 224", "391-A a 396", "424-433" """
+    artigos = []
+    for numero, letra, fim in PADRAO_ITEM_ARTIGO.findall(lista):
+        artigos.append(numero + letra)
+        if fim and 0 < int(fim) - int(numero) <= MAX_FAIXA_ARTIGOS:
+            artigos.extend(str(artigo) for artigo in range(int(numero) + 1, int(fim) + 1))
+    return artigos
+
+
+def extrair_citacoes(texto, conhecidas=None):
+    """Nós citados no texto: normas ("decreto_5598_2005") e artigos ("decreto_5598_2005:art_10")"""
+    texto = PADRAO_URL.sub(' ', dobrar_acentos(texto))
+    conhecidas = conhecidas or {}
+
+    normas = [
+        (encontrada.start(), encontrada.end(), chave_norma(*encontrada.groups(), conhecidas))
+        for encontrada in PADRAO_NORMA.finditer(texto)
+    ] + [
+        (encontrada.start(), encontrada.end(), NORMAS_POR_NOME[encontrada.group(1)])
+        for encontrada in PADRAO_NORMA_NOME.finditer(texto)
+    ]
+    normas.sort()
+
+    citacoes = [chave for _, _, chave in normas]
+    for encontrada in PADRAO_ARTIGOS.finditer(texto):
+        # Artigo ligado à norma logo a seguir ("art. 428 da CLT") ou logo antes ("CLT, art. 428")
+        ligacao = PADRAO_LIGACAO_DEPOIS.match(texto, encontrada.end())
+        seguinte = next((norma for norma in normas if ligacao and norma[0] == ligacao.end()), None)
+        anterior = next((
+            norma for norma in reversed(normas)
+            if norma[1] <= encontrada.start()
+            and PADRAO_LIGACAO_ANTES.fullmatch(texto, norma[1], encontrada.start())
+        ), None)
+        norma = seguinte or anterior
+        if norma is not None:
+            citacoes.extend(f"{norma[2]}:art_{artigo}" for artigo in extrair_artigos(encontrada.group(1)))
+
+    return list(dict.fromkeys(citacoes))
+
+
+def textos_respostas(banco):
+    """Textos de todas as respostas conhecidas, por (fonte, chave)"""
+    textos = {
+        ('banco', topico): '\n'.join(dados['legislacao_base'] + [banco.obter_resposta(topico)])
+        for topico, dados in banco.conhecimento.items()
+    }
+
+    # Fontes opcionais: dependem de streamlit e requests, ausentes em alguns ambientes
+    try:
+        from streamlit_app import get_response, INTENCOES_RESPOSTA
+        for intencao, termos in INTENCOES_RESPOSTA.items():
+            textos[('streamlit', intencao)] = get_response(termos[0])
+    except ImportError as e:
+        logger.warning("Grafo de citações sem as respostas do streamlit_app: %s", e)
+
+    try:
+        from ferramentas_juridicas import JURISPRUDENCIAS_TST, PORTARIAS_DETALHADAS
+        for jurisprudencia in JURISPRUDENCIAS_TST:
+            textos[('ferramentas', jurisprudencia['titulo'])] = jurisprudencia['titulo'] + '\n' + jurisprudencia['conteudo']
+        for portaria in PORTARIAS_DETALHADAS.values():
+            textos[('ferramentas', portaria['titulo'])] = '\n'.join(
+                [portaria['titulo']] + portaria['incisos_relevantes'] + portaria['fundamentacao']
+            )
+    except ImportError as e:
+        logger.warning("Grafo de citações sem as ferramentas jurídicas: %s", e)
+
+    return textos
+
+
+class GrafoCitacoes:
+    """Grafo bipartido respostas <-> normas e artigos, com adjacência nos dois sentidos"""
+
+    def __init__(self, textos, chaves_normas=()):
+        self.conhecidas = indexar_chaves(chaves_normas)
+        self.citacoes = {}  # resposta -> normas e artigos citados
+        self.dependentes = {}  # norma ou artigo -> respostas que o citam
+        for resposta, texto in textos.items():
+            citacoes = extrair_citacoes(texto, self.conhecidas)
+            self.citacoes[resposta] = tuple(citacoes)
+            for no in citacoes:
+                self.dependentes.setdefault(no, []).append(resposta)
+
+        # Respostas relacionadas pelas normas em comum; normas citadas por quase todas
+        # (como a CLT) pesam menos que as específicas
+        self.relacionadas = {}
+        for resposta, citacoes in self.citacoes.items():
+            comuns = {}
+            for no in citacoes:
+                if ':' in no:
+                    continue
+                peso = 1 / len(self.dependentes[no])
+                for outra in self.dependentes[no]:
+                    if outra != resposta:
+                        comuns[outra] = comuns.get(outra, 0) + peso
+            self.relacionadas[resposta] = sorted(comuns.items(), key=lambda item: -item[1])
+
+    def respostas_que_citam(self, referencia):
+        """Respostas que dependem da norma ou do artigo citado na referência"""
+        nos = extrair_citacoes(referencia, self.conhecidas)
+        artigos = [no for no in nos if ':' in no]
+        respostas = []
+        for no in artigos or nos:
+            respostas.extend(self.dependentes.get(no, ()))
+        return list(dict.fromkeys(respostas))
+
+    def respostas_relacionadas(self, resposta, k=5):
+        """Até k respostas (fonte, chave) que citam as mesmas normas"""
+        return [outra for outra, _ in self.relacionadas.get(resposta, [])[:k]]
+
+
+class ServicoGrafoCitacoes:
+    """Grafo do snapshot atual da base, remontado após cada recarga"""
+
+    def __init__(self):
+        self.trava = threading.Lock()
+        self._grafo = None
+        self._geracao = None
+
+    def grafo(self):
+        geracao = banco_conhecimento.geracao
+        if self._geracao != geracao:
+            with self.trava:
+                if self._geracao != geracao:
+                    banco = banco_conhecimento.atual
+                    self._grafo = GrafoCitacoes(textos_respostas(banco), banco.legislacao_vigente)
+                    self._geracao = geracao
+        return self._grafo
+
+
+# Instância global do grafo de citações
+grafo_citacoes = ServicoGrafoCitacoes()
+
+
+def respostas_que_citam(referencia):
+    """Respostas (fonte, chave) que citam a norma ou o artigo: "Decreto 5.598 art. 10" """
+    return grafo_citacoes.grafo().respostas_que_citam(referencia)
+
+
+def topicos_relacionados(topico, k=5):
+    """Tópicos do banco de conhecimento que citam as mesmas normas que o tópico"""
+    relacionadas = grafo_citacoes.grafo().respostas_relacionadas(('banco', topico), k=None)
+    return [chave for fonte, chave in relacionadas if fonte == 'banco'][:k]
+
+
+if __name__ == "__main__":
+    grafo = grafo_citacoes.grafo()
+    print(f"{len(grafo.citacoes)} respostas, {len(grafo.dependentes)} normas e artigos citados")
+    for no, respostas in sorted(grafo.dependentes.items(), key=lambda item: -len(item[1]))[:10]:
+        print(f"  {no}: {len(respostas)} respostas")
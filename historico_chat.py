@@ -0,0 +1,57 @@
+"""
+Histórico de Chat do LexAprendiz
+As mensagens das sessões guardam uma referência compacta à resposta (identificador e
+versão) e o texto canônico, compartilhado por todas as mensagens com a mesma referência.
+Com centenas de sessões fazendo a mesma pergunta, a resposta é mantida uma só vez
+"""
+import threading
+
+from cache_consultas import CacheLRU, CACHES
+
+# Respostas distintas lembradas pelo repositório (as menos usadas saem primeiro)
+TAMANHO_REPOSITORIO = 256
+
+
+class RepositorioRespostas:
+    """Texto canônico de cada resposta referenciada pelos históricos das sessões.
+
+    O repositório é limitado: uma referência descartada (versão antiga, pergunta rara)
+    continua legível nas mensagens que já a guardam, pois elas seguram o próprio texto
+    """
+
+    def __init__(self, tamanho_maximo=TAMANHO_REPOSITORIO):
+        self.textos = CacheLRU("historico_respostas", tamanho_maximo=tamanho_maximo)
+        self.trava = threading.Lock()
+        CACHES.append(self.textos)
+
+    def referenciar(self, referencia, gerar):
+        """Texto compartilhado da resposta; gerado só se a referência não estiver no repositório"""
+        texto = self.textos.obter(referencia, None)
+        if texto is None:
+            texto = gerar()
+            with self.trava:
+                # Outra sessão pode ter gerado o mesmo texto enquanto isso: fica o primeiro
+                existente = self.textos.obter(referencia, None)
+                if existente is None:
+                    self.textos.guardar(referencia, texto)
+                else:
+                    texto = existente
+        return texto
+
+    def resolver(self, referencia):
+        """Texto da resposta referenciada (None se já descartada do repositório)"""
+        return self.textos.obter(referencia, None)
+
+
+# Instância global, compartilhada por todas as sessões do processo
+repositorio_respostas = RepositorioRespostas()
+
+
+def mensagem_resposta(referencia, gerar):
+    """Mensagem do assistente com a referência e o texto compartilhado da resposta"""
+    return {"role": "assistant", "ref": referencia, "content": repositorio_respostas.referenciar(referencia, gerar)}
+
+
+def texto_mensagem(mensagem):
+    """Texto a exibir"""
+    return mensagem["content"]
@@ -0,0 +1,276 @@
+"""
+Índice do Catálogo CONAP - LexAprendiz
+Tabelas de hash sobre os programas (número, CBO, escola do Sistema S, área e palavras
+do nome), montadas uma vez por snapshot: cada busca custa O(1) mais o tamanho do
+resultado, em vez de percorrer todas as áreas e programas. Faixa etária, carga horária
+e duração são convertidas em números (colunas do catalogo_conap); a busca por idade usa
+um índice de intervalos, e as faixas de carga horária e de duração, as colunas em ordem.
+Consultas com vários filtros intersectam as listas de posições, da menor para a maior
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+from normalizacao import PADRAO_NUMERO, normalizar_fuzzy
+
+# Limites de idade da aprendizagem (CLT, art. 428), usados quando a faixa não informa um deles
+IDADE_MINIMA = 14
+IDADE_MAXIMA = 24
+
+
+def faixa_etaria_numerica(texto):
+    """ "16 a 24 anos" -> (16, 24); "a partir de 18 anos" -> (18, 24); "até 21 anos" -> (14, 21)"""
+    texto = normalizar_fuzzy(texto)
+    # Números abaixo da idade mínima não são idades ("habilitado há 01 ano")
+    numeros = [int(numero) for numero in PADRAO_NUMERO.findall(texto) if int(numero) >= IDADE_MINIMA]
+    if len(numeros) >= 2:
+        return min(numeros[:2]), max(numeros[:2])
+    if not numeros:
+        return IDADE_MINIMA, IDADE_MAXIMA
+    if texto.startswith('ate '):
+        return IDADE_MINIMA, numeros[0]
+    return numeros[0], IDADE_MAXIMA
+
+
+def quantidade_horas(texto):
+    """ "1.200 horas" -> 1200 (None sem número)"""
+    numeros = PADRAO_NUMERO.findall(normalizar_fuzzy(texto))
+    return int(numeros[0]) if numeros else None
+
+
+def duracao_meses(texto):
+    """ "18 meses" -> 18; "até 10 meses" -> 10; "2 anos" -> 24 (None sem número)"""
+    texto = normalizar_fuzzy(texto)
+    numeros = PADRAO_NUMERO.findall(texto)
+    if not numeros:
+        return None
+    return int(numeros[0]) * (12 if ' ano' in texto else 1)
+
+
+def intersecao(listas):
+    """Posições (em ordem) presentes em todas as listas ordenadas.
+
+    Cada posição da menor lista é procurada nas demais por busca binária, a partir de onde
+    a procura anterior parou: o custo acompanha a menor lista, não o tamanho do catálogo
+    """
+    menor, *demais = sorted(listas, key=len)
+    if not demais:
+        return menor
+    inicios = [0] * len(demais)
+    resultado = array('I')
+    for posicao in menor:
+        for numero, lista in enumerate(demais):
+            indice = inicios[numero] = bisect_left(lista, posicao, inicios[numero])
+            if indice == len(lista) or lista[indice] != posicao:
+                break
+        else:
+            resultado.append(posicao)
+    return resultado
+
+
+class IndiceFaixas:
+    """Índice de intervalos estático sobre faixas inteiras [mínimo, máximo].
+
+    Os limites das faixas dividem a reta em segmentos; cada segmento guarda as posições
+    das faixas que o cobrem, então a consulta "faixas que contêm x" é uma busca binária.
+    """
+
+    def __init__(self, faixas):
+        eventos = {}  # valor -> (posições que entram, posições que saem)
+        for posicao, (minimo, maximo) in enumerate(faixas):
+            eventos.setdefault(minimo, ([], []))[0].append(posicao)
+            eventos.setdefault(maximo + 1, ([], []))[1].append(posicao)
+
+        # fronteiras[i] inicia o segmento i + 1; o segmento 0 fica abaixo de todas as faixas
+        self.fronteiras = sorted(eventos)
+        self.segmentos = [array('I')]
+        cobrem = set()
+        for fronteira in self.fronteiras:
+            entram, saem = eventos[fronteira]
+            cobrem.update(entram)
+            cobrem.difference_update(saem)
+            self.segmentos.append(array('I', sorted(cobrem)))
+
+    def contendo(self, valor):
+        """Posições (em ordem) das faixas que contêm o valor"""
+        return self.segmentos[bisect_right(self.fronteiras, valor)]
+
+
+class ColunaOrdenada:
+    """Posições de uma coluna numérica em ordem de valor (0 = não informado, fica de fora).
+
+    Os programas com valor numa faixa [mínimo, máximo] formam um trecho contíguo,
+    localizado com duas buscas binárias
+    """
+
+    def __init__(self, valores):
+        ordem = sorted((valor, posicao) for posicao, valor in enumerate(valores) if valor)
+        self.valores = array('H', (valor for valor, _ in ordem))
+        self.posicoes = array('I', (posicao for _, posicao in ordem))
+
+    def trecho(self, minimo, maximo):
+        """Início e fim, em posicoes, dos valores na faixa (None no limite aberto)"""
+        inicio = bisect_left(self.valores, minimo or 0)
+        fim = len(self.valores) if maximo is None else bisect_right(self.valores, maximo)
+        return inicio, max(inicio, fim)
+
+    def entre(self, minimo=None, maximo=None):
+        """Posições (em ordem) com valor entre minimo e maximo"""
+        inicio, fim = self.trecho(minimo, maximo)
+        return array('I', sorted(self.posicoes[inicio:fim]))
+
+
+class IndiceCatalogo:
+    """Índices de hash sobre as colunas do catálogo compacto; as listas de posições são arrays em ordem"""
+
+    def __init__(self, catalogo):
+        self.catalogo = catalogo
+        self.por_numero = {}
+        self.por_cbo = {}
+        self.por_escola = {}
+        self.por_palavra = {}  # palavra canônica do nome -> posições
+        self.por_area = {}  # chave e nome canônico da área -> posições
+        self.areas = []  # (chave, nome canônico) na ordem do catálogo
+        self.por_arco = {}  # nome canônico do arco ocupacional -> posições
+
+        posicoes_areas = []
+        for area_key, nome in catalogo.areas:
+            nome_area = normalizar_fuzzy(nome)
+            self.areas.append((area_key, nome_area))
+            posicoes_areas.append(self.por_area.setdefault(area_key, array('I')))
+            if nome_area != area_key:
+                self.por_area[nome_area] = posicoes_areas[-1]
+
+        for posicao in range(len(catalogo)):
+            posicoes_areas[catalogo.area[posicao]].append(posicao)
+            self.por_numero.setdefault(catalogo.numeros[posicao], posicao)
+            for cbo in catalogo.cbos_programa(posicao):
+                self.por_cbo.setdefault(cbo, array('I')).append(posicao)
+            for escola in catalogo.escolas_programa(posicao):
+                self.por_escola.setdefault(escola, array('I')).append(posicao)
+            for palavra in dict.fromkeys(normalizar_fuzzy(catalogo.nomes[posicao]).split()):
+                self.por_palavra.setdefault(palavra, array('I')).append(posicao)
+            if catalogo.arco[posicao]:
+                arco = normalizar_fuzzy(catalogo.textos.valores[catalogo.arco[posicao]])
+                self.por_arco.setdefault(arco, array('I')).append(posicao)
+
+        self.por_idade = IndiceFaixas(zip(catalogo.idade_minima, catalogo.idade_maxima))
+        # Programas sem carga horária ou duração informada ficam fora destes filtros
+        self.por_horas = ColunaOrdenada(catalogo.horas)
+        self.por_meses = ColunaOrdenada(catalogo.meses)
+
+    def numero(self, numero):
+        """Posição do programa com o número CONAP, ou None"""
+        return self.por_numero.get(numero)
+
+    def cbo(self, cbo):
+        """Posições dos programas com a CBO"""
+        return self.por_cbo.get(cbo, ())
+
+    def escola(self, escola):
+        """Posições dos programas oferecidos pela escola ("SENAI")"""
+        return self.por_escola.get(escola.upper(), ())
+
+    def idade(self, idade):
+        """Posições dos programas cuja faixa etária inclui a idade"""
+        return self.por_idade.contendo(idade)
+
+    def area(self, area):
+        """Posições dos programas da área, pela chave ("saude") ou pelo nome, inteiro ou em parte"""
+        area = normalizar_fuzzy(area)
+        posicoes = self.por_area.get(area)
+        if posicoes is not None:
+            return posicoes
+        # Trecho do nome ("metalurgica" em "industria metalurgica"): poucas áreas, busca direta
+        for area_key, nome_area in self.areas:
+            if area in nome_area:
+                return self.por_area[area_key]
+        return ()
+
+    def arco(self, arco):
+        """Posições dos programas do arco ocupacional, pelo nome inteiro ou em parte"""
+        arco = normalizar_fuzzy(arco)
+        posicoes = self.por_arco.get(arco)
+        if posicoes is not None:
+            return posicoes
+        for nome_arco, posicoes in self.por_arco.items():
+            if arco in nome_arco:
+                return posicoes
+        return ()
+
+    def horas(self, minimo=None, maximo=None):
+        """Posições (em ordem) dos programas com carga horária entre minimo e maximo"""
+        return self.por_horas.entre(minimo, maximo)
+
+    def duracao(self, minimo=None, maximo=None):
+        """Posições (em ordem) dos programas com duração entre minimo e maximo meses"""
+        return self.por_meses.entre(minimo, maximo)
+
+    def consultar(self, area=None, escola=None, idade=None, horas=None, arco=None, duracao=None):
+        """Posições (em ordem) dos programas que atendem a todos os filtros informados.
+
+        horas e duracao (em meses) são faixas (mínimo, máximo), com None no limite aberto. Cada
+        faixa só vira lista quando é o menor filtro; senão, confere a coluna dos candidatos
+        """
+        listas = []
+        if area is not None:
+            listas.append(self.area(area))
+        if escola is not None:
+            listas.append(self.escola(escola))
+        if idade is not None:
+            listas.append(self.idade(idade))
+        if arco is not None:
+            listas.append(self.arco(arco))
+
+        conferir = []
+        for faixa, ordenada, coluna in (
+            (horas, self.por_horas, self.catalogo.horas), (duracao, self.por_meses, self.catalogo.meses),
+        ):
+            if faixa is None:
+                continue
+            minimo, maximo = faixa
+            inicio, fim = ordenada.trecho(minimo, maximo)
+            if not listas or fim - inicio < min(map(len, listas)):
+                listas.append(ordenada.entre(minimo, maximo))
+            else:
+                # Coluna 0 = valor não informado, fora de qualquer faixa
+                conferir.append((coluna, max(minimo or 0, 1), maximo))
+
+        posicoes = intersecao(listas) if listas else array('I', range(len(self.catalogo)))
+        if conferir:
+            posicoes = array('I', (
+                posicao for posicao in posicoes
+                if all(minimo <= coluna[posicao] and (maximo is None or coluna[posicao] <= maximo)
+                       for coluna, minimo, maximo in conferir)
+            ))
+        return posicoes
+
+    def facetas(self, posicoes):
+        """Contagem das posições por área, escola do Sistema S e arco ocupacional"""
+        catalogo = self.catalogo
+        areas, escolas, arcos = Counter(), Counter(), Counter()
+        for posicao in posicoes:
+            areas[catalogo.area[posicao]] += 1
+            escolas.update(catalogo.escola[posicao])
+            arcos[catalogo.arco[posicao]] += 1
+        return {
+            "area": {catalogo.areas[codigo][1]: total for codigo, total in areas.most_common()},
+            "escola": {catalogo.escolas.valores[codigo]: total for codigo, total in escolas.most_common()},
+            "arco": {catalogo.textos.valores[codigo]: total for codigo, total in arcos.most_common() if codigo},
+        }
+
+    def nome(self, texto):
+        """Posição do primeiro programa cujo nome contém as palavras do texto, em sequência"""
+        texto = normalizar_fuzzy(texto)
+        palavras = texto.split()
+        if not palavras:
+            return 0 if len(self.catalogo) else None
+
+        listas = [self.por_palavra.get(palavra) for palavra in palavras]
+        if not all(listas):
+            return None
+        # Candidatos da palavra mais rara, em ordem; confirma a sequência no nome completo
+        for posicao in min(listas, key=len):
+            if f" {texto} " in f" {normalizar_fuzzy(self.catalogo.nomes[posicao])} ":
+                return posicao
+        return None
@@ -0,0 +1,252 @@
+"""
+Índices de Busca do Banco de Conhecimento - LexAprendiz
+Estruturas montadas uma única vez para localizar tópicos sem varrer toda a base
+"""
+import heapq
+import math
+import re
+
+from normalizacao import extrair_termos, limite_de_palavra, normalizar, normalizar_espacos
+
+# Título de seção das respostas: linha iniciada por "**" seguido de emoji ("**🔹 ...", "**📋 ...")
+PADRAO_SECAO = re.compile(r'^\*\*[^\w\s*]', re.MULTILINE)
+
+# Marcadores antes do rótulo da seção ("**🔹 ", "**📋 ")
+PADRAO_ROTULO = re.compile(r'^[^\w]+')
+
+# Seções que acompanham qualquer trecho selecionado
+SECOES_CABECALHO = ('CONSULTA',)
+SECOES_FONTES = ('FUNDAMENTAÇÃO', 'FONTES')
+
+
+def dividir_passagens(texto):
+    """Divide uma resposta em passagens nas linhas de título de seção.
+
+    Retorna [{'titulo', 'texto', 'tipo'}] na ordem original, com tipo
+    'cabecalho' (título da resposta e consulta), 'fontes' (fundamentação e
+    fontes oficiais) ou 'conteudo'. Títulos sem corpo próprio (ex.: o que
+    introduz os itens 🔹) são unidos à seção seguinte.
+    """
+    inicios = [m.start() for m in PADRAO_SECAO.finditer(texto)]
+    passagens = []
+    if not inicios or inicios[0] > 0:
+        passagens.append({'titulo': '', 'texto': texto[:inicios[0] if inicios else len(texto)].strip(), 'tipo': 'cabecalho'})
+
+    pendente = ''
+    for inicio, fim in zip(inicios, inicios[1:] + [len(texto)]):
+        secao = texto[inicio:fim].strip()
+        titulo, _, corpo = secao.partition('\n')
+        if not corpo.strip() and fim < len(texto) and titulo.rstrip('*').endswith(':'):
+            pendente += secao + '\n\n'
+            continue
+
+        rotulo = PADRAO_ROTULO.sub('', titulo).upper()
+        if rotulo.startswith(SECOES_CABECALHO):
+            tipo = 'cabecalho'
+        elif rotulo.startswith(SECOES_FONTES):
+            tipo = 'fontes'
+        else:
+            tipo = 'conteudo'
+        passagens.append({'titulo': titulo, 'texto': pendente + secao, 'tipo': tipo})
+        pendente = ''
+
+    return [passagem for passagem in passagens if passagem['texto']]
+
+
+class IndiceInvertido:
+    """Índice invertido termo → tópicos construído a partir das keywords da base"""
+
+    def __init__(self, keywords_por_topico):
+        # Ordem dos tópicos preserva o critério de desempate da busca original
+        self.topicos = list(keywords_por_topico.keys())
+        self.ordem = {topico: posicao for posicao, topico in enumerate(self.topicos)}
+
+        # Termo normalizado -> lista de (tópico, ocorrências no tópico)
+        self.postings = {}
+        self.contagens = {}
+        for topico in self.topicos:
+            self._indexar_topico(topico, keywords_por_topico[topico])
+
+        # Comprimentos distintos dos termos (janelas usadas na varredura da consulta)
+        self.comprimentos = sorted({len(termo) for termo in self.postings})
+
+    def _indexar_topico(self, topico, keywords):
+        contagem = {}
+        for keyword in keywords:
+            termo = self.normalizar(keyword)
+            if termo:
+                contagem[termo] = contagem.get(termo, 0) + 1
+
+        self.contagens[topico] = contagem
+        for termo, ocorrencias in contagem.items():
+            # Listas nunca são alteradas no lugar: índices derivados podem compartilhá-las
+            self.postings[termo] = self.postings.get(termo, []) + [(topico, ocorrencias)]
+
+    def atualizar(self, keywords_por_topico, alterados):
+        """Novo índice reindexando apenas os tópicos alterados; este índice não é modificado"""
+        novo = IndiceInvertido({})
+        novo.topicos = list(keywords_por_topico.keys())
+        novo.ordem = {topico: posicao for posicao, topico in enumerate(novo.topicos)}
+        novo.postings = dict(self.postings)
+        novo.contagens = dict(self.contagens)
+
+        # Retira as postings antigas dos tópicos alterados ou removidos
+        saindo = {topico for topico in self.contagens if topico in alterados or topico not in novo.ordem}
+        afetados = {termo for topico in saindo for termo in self.contagens[topico]}
+        for termo in afetados:
+            restantes = [item for item in novo.postings[termo] if item[0] not in saindo]
+            if restantes:
+                novo.postings[termo] = restantes
+            else:
+                del novo.postings[termo]
+        for topico in saindo:
+            del novo.contagens[topico]
+
+        for topico in novo.topicos:
+            if topico in alterados or topico not in novo.contagens:
+                novo._indexar_topico(topico, keywords_por_topico[topico])
+
+        novo.comprimentos = sorted({len(termo) for termo in novo.postings})
+        return novo
+
+    @staticmethod
+    def normalizar(texto):
+        """Normalização aplicada tanto aos termos indexados quanto às consultas"""
+        return normalizar_espacos(texto)
+
+    def termos_encontrados(self, consulta):
+        """Retorna os termos indexados que ocorrem como palavras inteiras da consulta"""
+        texto = normalizar(consulta).chave
+        encontrados = set()
+
+        # Custo proporcional ao tamanho da consulta, não ao número de tópicos
+        for comprimento in self.comprimentos:
+            for inicio in range(len(texto) - comprimento + 1):
+                trecho = texto[inicio:inicio + comprimento]
+                if trecho in self.postings and limite_de_palavra(texto, inicio, inicio + comprimento):
+                    encontrados.add(trecho)
+
+        return encontrados
+
+    def pontuar(self, consulta, termos=None):
+        """Pontua os tópicos (tópico -> score) somando as postings dos termos encontrados
+
+        `termos` permite reaproveitar termos já localizados por um casador externo.
+        """
+        if termos is None:
+            termos = self.termos_encontrados(consulta)
+
+        scores = {}
+        for termo in termos:
+            for topico, ocorrencias in self.postings.get(termo, ()):
+                scores[topico] = scores.get(topico, 0) + ocorrencias
+        return scores
+
+    def melhor_topico(self, consulta, termos=None, aproximados=(), sinonimos=()):
+        """Retorna (tópico, score) de maior pontuação ou (None, 0)
+
+        Termos em `aproximados` (casados com erro de digitação ou flexão) só desempatam:
+        o tópico com mais pontos de termos exatos vence sempre. Termos em `sinonimos`
+        (vindos do tesauro) contam como exatos; no empate que ainda restar, as keywords
+        declaradas no tópico passam à frente deles
+        """
+        if termos is None:
+            termos = self.termos_encontrados(consulta)
+        aproximados = set(aproximados)
+        exatos = [termo for termo in termos if termo not in aproximados]
+        scores = self.pontuar(consulta, exatos)
+        scores_declarados = self.pontuar(consulta, [termo for termo in exatos if termo not in sinonimos])
+        scores_aproximados = self.pontuar(consulta, [termo for termo in termos if termo in aproximados])
+        if not scores and not scores_aproximados:
+            return None, 0
+
+        # Empate resolvido pelo tópico declarado primeiro, como na varredura linear
+        topico = min(
+            scores.keys() | scores_aproximados.keys(),
+            key=lambda t: (-scores.get(t, 0), -scores_aproximados.get(t, 0), -scores_declarados.get(t, 0), self.ordem[t]),
+        )
+        return topico, scores.get(topico, 0) + scores_aproximados.get(topico, 0)
+
+
+class IndiceBM25:
+    """Índice ranqueado (Okapi BM25) sobre títulos, legislação base e corpo das respostas"""
+
+    def __init__(self, documentos, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+
+        # Frequências por tópico ficam guardadas para recálculos incrementais
+        self.frequencias = {topico: self._contar(texto) for topico, texto in documentos.items()}
+        self._calcular_pesos(list(documentos.keys()))
+
+    def _contar(self, texto):
+        contagem = {}
+        for termo in self.tokenizar(texto):
+            contagem[termo] = contagem.get(termo, 0) + 1
+        return contagem
+
+    def atualizar(self, topicos, documentos_alterados):
+        """Novo índice retokenizando só os documentos alterados; IDF e pesos são recalculados"""
+        novo = IndiceBM25({}, k1=self.k1, b=self.b)
+        novo.frequencias = {
+            topico: (
+                self._contar(documentos_alterados[topico])
+                if topico in documentos_alterados else self.frequencias[topico]
+            )
+            for topico in topicos
+        }
+        novo._calcular_pesos(list(topicos))
+        return novo
+
+    def _calcular_pesos(self, topicos):
+        self.topicos = topicos
+        frequencias = [self.frequencias[topico] for topico in topicos]
+        k1, b = self.k1, self.b
+
+        total = len(frequencias)
+        comprimentos = [sum(contagem.values()) for contagem in frequencias]
+        media = (sum(comprimentos) / total) if total else 0.0
+
+        documentos_por_termo = {}
+        for contagem in frequencias:
+            for termo in contagem:
+                documentos_por_termo[termo] = documentos_por_termo.get(termo, 0) + 1
+
+        self.idf = {
+            termo: math.log((total - df + 0.5) / (df + 0.5) + 1.0)
+            for termo, df in documentos_por_termo.items()
+        }
+
+        # Termo -> lista de (posição do tópico, peso BM25 já calculado)
+        self.postings = {}
+        for posicao, contagem in enumerate(frequencias):
+            normalizacao = k1 * (1 - b + b * comprimentos[posicao] / media) if media else k1
+            for termo, tf in contagem.items():
+                peso = self.idf[termo] * tf * (k1 + 1) / (tf + normalizacao)
+                self.postings.setdefault(termo, []).append((posicao, peso))
+
+    @staticmethod
+    def tokenizar(texto):
+        """Quebra o texto em termos sem acento e no singular, descartando stopwords"""
+        return extrair_termos(texto)
+
+    def _pontuar_posicoes(self, consulta):
+        scores = {}
+        for termo in set(normalizar(consulta).termos):
+            for posicao, peso in self.postings.get(termo, ()):
+                scores[posicao] = scores.get(posicao, 0.0) + peso
+        return scores
+
+    def pontuar(self, consulta):
+        """Scores de todos os documentos com algum termo da consulta (documento -> score)"""
+        return {self.topicos[posicao]: score for posicao, score in self._pontuar_posicoes(consulta).items()}
+
+    def buscar(self, consulta, k=3, limiar=0.0):
+        """Retorna até k pares (tópico, score) com score acima do limiar, do maior para o menor"""
+        scores = self._pontuar_posicoes(consulta)
+        melhores = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [
+            (self.topicos[posicao], score)
+            for posicao, score in melhores
+            if score > limiar
+        ]
@@ -0,0 +1,163 @@
+"""
+Índice Aproximado do LexAprendiz
+Trigramas de caracteres com verificação por distância de edição limitada, para
+recuperar consultas sem acento ou com pequenos erros de digitação. Só palavras fora
+do vocabulário dos termos são corrigidas; flexões de gênero ou particípio de uma
+palavra conhecida ("proibidas" -> "proibidos") casam pelo radical, com distância 1,
+e o plural casa como termo exato. Outras flexões ("contratado" de "contrato") não casam
+"""
+from normalizacao import PADRAO_NAO_DIGITO, normalizar, normalizar_fuzzy, radical, radical_flexao, radical_genero
+
+# Máximo de palavras consideradas em um termo composto ("falta disciplinar")
+MAX_PALAVRAS = 4
+
+
+def distancia_maxima(comprimento):
+    """Edições toleradas conforme o tamanho do termo (termos curtos só sem acento)"""
+    if comprimento < 7:
+        return 0
+    if comprimento < 10:
+        return 1
+    return 2
+
+
+def trigramas(texto):
+    """Trigramas de caracteres do texto com bordas marcadas"""
+    texto = f' {texto} '
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def distancia_limitada(a, b, limite):
+    """Distância de Levenshtein, interrompida assim que ultrapassa o limite"""
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        atual = [i]
+        for j, cb in enumerate(b, 1):
+            atual.append(min(
+                anterior[j] + 1,
+                atual[j - 1] + 1,
+                anterior[j - 1] + (ca != cb)
+            ))
+        if min(atual) > limite:
+            return limite + 1
+        anterior = atual
+    return anterior[-1]
+
+
+class IndiceFuzzy:
+    """Índice de trigramas sobre termos, com verificação por distância de edição"""
+
+    def __init__(self, entradas):
+        # Cada entrada: (forma normalizada, termo original, valor associado, dígitos, nº de trigramas)
+        self.entradas = []
+        self.exatos = {}
+        self.por_radical = {}  # forma no singular ("hora extra") -> posições
+        self.por_genero = {}  # radicais sem gênero ("proibid") -> posições
+        self.vocabulario = set()  # palavras dos termos e seus radicais de flexão
+        self.postings = {}
+        self.max_palavras = 1
+
+        for termo, valor in entradas:
+            forma = normalizar_fuzzy(termo)
+            if not forma:
+                continue
+            posicao = len(self.entradas)
+            grams = trigramas(forma)
+            self.entradas.append((forma, termo, valor, PADRAO_NAO_DIGITO.sub('', forma), len(grams)))
+            self.exatos.setdefault(forma, []).append(posicao)
+            self.por_radical.setdefault(self._singular(forma), []).append(posicao)
+            self.por_genero.setdefault(self._genero(forma), []).append(posicao)
+            for palavra in forma.split():
+                self.vocabulario.update((palavra, radical_flexao(palavra)))
+            for trigrama in grams:
+                self.postings.setdefault(trigrama, []).append(posicao)
+            self.max_palavras = min(MAX_PALAVRAS, max(self.max_palavras, len(forma.split())))
+
+    @staticmethod
+    def _singular(forma):
+        return ' '.join(radical(palavra) for palavra in forma.split())
+
+    @staticmethod
+    def _genero(forma):
+        return ' '.join(radical_genero(palavra) for palavra in forma.split())
+
+    def _conhecida(self, palavra):
+        """Palavra do vocabulário ou flexão de uma delas: não é erro de digitação"""
+        return palavra in self.vocabulario or radical_flexao(palavra) in self.vocabulario
+
+    def _candidatos(self, janela, limite):
+        """Entradas com trigramas suficientes em comum para estarem a até `limite` edições"""
+        grams = trigramas(janela)
+        comuns = {}
+        for trigrama in grams:
+            for posicao in self.postings.get(trigrama, ()):
+                comuns[posicao] = comuns.get(posicao, 0) + 1
+
+        # Cada edição destrói no máximo 3 trigramas
+        candidatos = []
+        for posicao, quantidade in comuns.items():
+            if quantidade >= max(len(grams), self.entradas[posicao][4]) - 3 * limite:
+                candidatos.append(posicao)
+        return candidatos
+
+    def _casar_janela(self, janela, conhecidas):
+        """[(posição, distância)] das entradas que casam com a janela de palavras da consulta"""
+        melhores = {}
+        for posicao in self.exatos.get(janela, ()):
+            melhores[posicao] = 0
+        for posicao in self.por_radical.get(self._singular(janela), ()):
+            melhores[posicao] = 0
+        for posicao in self.por_genero.get(self._genero(janela), ()):
+            melhores[posicao] = min(melhores.get(posicao, 1), 1)
+
+        # Só janelas com alguma palavra desconhecida podem ter erro de digitação
+        limite = distancia_maxima(len(janela))
+        if limite and not conhecidas:
+            digitos = PADRAO_NAO_DIGITO.sub('', janela)
+            for posicao in self._candidatos(janela, limite):
+                forma, _, _, digitos_entrada, _ = self.entradas[posicao]
+                # Números de normas e CBOs nunca são aproximados
+                if digitos != digitos_entrada:
+                    continue
+                distancia = distancia_limitada(janela, forma, limite)
+                if distancia <= limite and distancia < melhores.get(posicao, limite + 1):
+                    melhores[posicao] = distancia
+        return list(melhores.items())
+
+    def buscar(self, texto, memoria=None):
+        """Retorna [(termo, valor, distância)] das entradas presentes no texto, da mais próxima à mais distante.
+
+        `memoria` (janela -> casamentos) é compartilhada entre as consultas de um lote: as
+        janelas que se repetem entre perguntas são verificadas uma só vez
+        """
+        palavras = normalizar(texto).dobrada.split()
+        conhecidas = None  # calculadas só se alguma janela não estiver na memória
+        melhores = {}
+
+        for tamanho in range(1, self.max_palavras + 1):
+            for inicio in range(len(palavras) - tamanho + 1):
+                janela = ' '.join(palavras[inicio:inicio + tamanho])
+                casamentos = None if memoria is None else memoria.get(janela)
+                if casamentos is None:
+                    if conhecidas is None:
+                        conhecidas = [self._conhecida(palavra) for palavra in palavras]
+                    casamentos = self._casar_janela(janela, all(conhecidas[inicio:inicio + tamanho]))
+                    if memoria is not None:
+                        memoria[janela] = casamentos
+                for posicao, distancia in casamentos:
+                    if distancia < melhores.get(posicao, distancia + 1):
+                        melhores[posicao] = distancia
+
+        ordenadas = sorted(melhores.items(), key=lambda item: (item[1], item[0]))
+        return [
+            (self.entradas[posicao][1], self.entradas[posicao][2], distancia)
+            for posicao, distancia in ordenadas
+        ]
+
+    def buscar_lote(self, textos):
+        """buscar() de cada texto, verificando uma só vez as janelas repetidas no lote"""
+        memoria = {}
+        return [self.buscar(texto, memoria) for texto in textos]
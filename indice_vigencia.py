@@ -0,0 +1,92 @@
+"""
+Índice de Vigência das Normas - LexAprendiz
+Registros estruturados da legislação (publicação, início de vigência e revogação)
+num índice de intervalos para consultas "norma vigente na data X"
+"""
+import re
+from bisect import bisect_right
+from datetime import date
+
+from normalizacao import normalizar
+
+MESES = {
+    'janeiro': 1, 'fevereiro': 2, 'marco': 3, 'abril': 4, 'maio': 5, 'junho': 6,
+    'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
+}
+
+# "15/03/2021", "03/2021" (na forma original) e "15 de março de 2021", "março de 2021" (sem acentos)
+PADRAO_DATA_NUMERICA = re.compile(r'\b(?:(\d{1,2})/)?(0?[1-9]|1[0-2])/(\d{4})\b')
+PADRAO_DATA_EXTENSO = re.compile(
+    r'\b(?:(\d{1,2}) de )?(' + '|'.join(MESES) + r')(?: de)? (\d{4})\b'
+)
+
+
+def converter_data(valor):
+    """Data ISO ("2023-12-21") -> date; None permanece None"""
+    if valor is None or isinstance(valor, date):
+        return valor
+    return date.fromisoformat(valor)
+
+
+def registro_norma(valor):
+    """Registro {rotulo, publicacao, inicio_vigencia, revogacao, revogada_por}; aceita só o rótulo"""
+    if isinstance(valor, str):
+        valor = {'rotulo': valor}
+    return {
+        'rotulo': valor['rotulo'],
+        'publicacao': valor.get('publicacao'),
+        'inicio_vigencia': valor.get('inicio_vigencia') or valor.get('publicacao'),
+        'revogacao': valor.get('revogacao'),
+        'revogada_por': valor.get('revogada_por'),
+    }
+
+
+def extrair_data(consulta):
+    """Primeira data citada na pergunta (mês sem dia -> dia 1), ou None"""
+    consulta = normalizar(consulta)
+    for padrao, texto in ((PADRAO_DATA_NUMERICA, consulta.chave), (PADRAO_DATA_EXTENSO, consulta.dobrada)):
+        for encontrada in padrao.finditer(texto):
+            dia, mes, ano = encontrada.groups()
+            try:
+                return date(int(ano), MESES.get(mes) or int(mes), int(dia or 1))
+            except ValueError:
+                continue
+    return None
+
+
+class IndiceVigencia:
+    """Índice de intervalos estático sobre os períodos de vigência.
+
+    As datas de início e de revogação dividem a linha do tempo em segmentos; cada
+    segmento guarda as normas vigentes nele, então a consulta é uma busca binária.
+    """
+
+    def __init__(self, registros):
+        ordem = {chave: posicao for posicao, chave in enumerate(registros)}
+        eventos = {}  # data -> (normas que entram, normas que saem)
+        for chave, registro in registros.items():
+            inicio = converter_data(registro['inicio_vigencia'])
+            if inicio is None:
+                continue
+            eventos.setdefault(inicio, ([], []))[0].append(chave)
+            fim = converter_data(registro['revogacao'])
+            if fim is not None:
+                eventos.setdefault(fim, ([], []))[1].append(chave)
+
+        # fronteiras[i] inicia o segmento i + 1; o segmento 0 é anterior a todas as normas
+        self.fronteiras = sorted(eventos)
+        self.segmentos = [()]
+        vigentes = set()
+        for fronteira in self.fronteiras:
+            entram, saem = eventos[fronteira]
+            vigentes.update(entram)
+            vigentes.difference_update(saem)
+            self.segmentos.append(tuple(sorted(vigentes, key=ordem.get)))
+
+    def vigentes(self, data):
+        """Chaves das normas vigentes na data (revogação exclusiva: não vige no próprio dia)"""
+        return self.segmentos[bisect_right(self.fronteiras, converter_data(data))]
+
+    def vigentes_em_lote(self, datas):
+        """Normas vigentes em cada data, na ordem recebida"""
+        return [self.vigentes(data) for data in datas]
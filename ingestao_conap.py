@@ -0,0 +1,484 @@
+"""
+Ingestão do CONAP - LexAprendiz
+Extrai os programas do PDF oficial do catálogo (conap-janeiro-2021.pdf) e grava
+dados/conap.json, carregado pelo CONAPDatabase na partida (e na recarga a quente).
+
+As páginas são lidas uma a uma, distribuídas entre processos. O leitor de PDF usa só a
+biblioteca padrão e cobre o que o arquivo oficial usa ("Microsoft: Print To PDF"):
+tabela xref clássica, conteúdo comprimido com FlateDecode, fontes Type0 com CMap
+ToUnicode e tabelas desenhadas com retângulos preenchidos
+
+Uso:
+    python ingestao_conap.py [--pdf conap-janeiro-2021.pdf] [--saida dados/conap.json] [--processos 4]
+"""
+import argparse
+import mmap
+import os
+import re
+import struct
+import time
+import zlib
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from normalizacao import normalizar_fuzzy
+from recarga import DIRETORIO_DADOS, gravar_json
+
+PDF_CONAP = Path(__file__).with_name("conap-janeiro-2021.pdf")
+
+# Páginas por tarefa enviada aos processos
+PAGINAS_POR_TAREFA = 16
+
+# Distância (pt) abaixo da qual duas linhas da tabela são a mesma borda
+TOLERANCIA_BORDA = 3.0
+
+PADRAO_OBJETO = re.compile(rb'(\d+)\s+(\d+)\s+obj\b')
+PADRAO_REFERENCIA = re.compile(rb'(\d+)\s+\d+\s+R')
+PADRAO_ENTRADA_XREF = re.compile(rb'\s*(\d{10}) (\d{5}) ([nf])')
+PADRAO_SUBSECAO_XREF = re.compile(rb'\s*(\d+) (\d+)[ \t]*[\r\n]')
+PADRAO_HEX = re.compile(rb'<([0-9A-Fa-f\s]+)>')
+PADRAO_NUMERO_PDF = rb'(-?\d*\.?\d+)'
+
+# Operadores do conteúdo da página usados pelo catálogo
+PADRAO_BLOCO_TEXTO = re.compile(rb'\bBT\b(.*?)\bET\b', re.S)
+PADRAO_FONTE = re.compile(rb'/([^\s/]+)\s+' + PADRAO_NUMERO_PDF + rb'\s+Tf')
+PADRAO_MATRIZ = re.compile(rb'\s+'.join([PADRAO_NUMERO_PDF] * 6) + rb'\s+Tm')
+# Retângulo desenhado como caminho "x y m x y l x y l x y l h", um operador por linha
+PADRAO_RETANGULO = re.compile(
+    rb'(?m)^[ \t]*'
+    + rb'\s+'.join(PADRAO_NUMERO_PDF + rb'[ \t]+' + PADRAO_NUMERO_PDF + rb'[ \t]+' + operador for operador in (b'm', b'l', b'l', b'l'))
+    + rb'\s+h\b'
+)
+
+# Títulos das seções do catálogo
+PADRAO_SECAO_OCUPACAO = re.compile(r'^Programas por Ocupação$')
+PADRAO_SECAO_ARCOS = re.compile(r'^Relação de Arcos Ocupacionais$')
+PADRAO_SECAO_ESCOLA = re.compile(r'^Serviço Nacional d[eo] .*?\b(SENAC|SENAI|SENAR|SENAT|SESCOOP)\b')
+
+# Campos das linhas da tabela
+PADRAO_NUMERO_LINHA = re.compile(r'^(\d+)\b\s*(.*)$')
+PADRAO_CBO_PDF = re.compile(r'\b(\d{4})(?:\s*-?\s*(\d{2}))?\b')
+PADRAO_FAIXA_PDF = re.compile(r'(\d+)\s*(?:a|-|–)\s*(\d+)\s*anos')
+PADRAO_MINIMO = re.compile(r'm[ií]nim[oa]\s*[-–:]?\s*(\d[\d.]*)\s*h', re.I)
+PADRAO_MAXIMO = re.compile(r'm[aá]xim[oa]\s*[-–:]?\s*(\d[\d.]*)', re.I)
+PADRAO_HORAS = re.compile(r'(\d[\d.]*)\s*h', re.I)
+# Início da divisão da carga em teoria e prática (ou fase escolar e empresa)
+PADRAO_DIVISAO_CARGA = re.compile(r'Teori|Teóric|Fase Escolar\s*(?::|CH)|\(', re.I)
+
+PADRAO_TOTAL = re.compile(r'(?:Total(?: de)?|prática profissional na empresa)\s*[:=]?\s*(\d[\d.]*)\s*(?:h|$)', re.I)
+PADRAO_MESES = re.compile(r'(\d+)\s*meses', re.I)
+
+# Área de cada programa pela CBO (prefixo mais longo: subgrupo ou subgrupo principal).
+# As áreas do catálogo embutido mantêm as chaves usadas pelo roteador (CONAP_AREAS);
+# os demais subgrupos principais da CBO formam áreas próprias
+AREAS_CBO = {
+    '41': 'administracao', '42': 'administracao', '35': 'administracao', '39': 'administracao',
+    '52': 'administracao',
+    '72': 'metalurgia',
+    '212': 'tecnologia', '317': 'tecnologia',
+    '71': 'construcao',
+    '22': 'saude', '32': 'saude', '515': 'saude',
+    '34': 'logistica', '78': 'logistica', '414': 'logistica',
+    '61': 'agronegocio', '62': 'agronegocio', '63': 'agronegocio', '64': 'agronegocio',
+    '30': 'tecnicos', '31': 'tecnicos',
+    '26': 'cultura', '37': 'cultura',
+    '51': 'servicos',
+    '73': 'eletroeletronica', '95': 'eletroeletronica',
+    '74': 'precisao_artesanato', '75': 'precisao_artesanato', '79': 'precisao_artesanato',
+    '76': 'textil_vestuario',
+    '77': 'madeira_mobiliario',
+    '81': 'processos_industriais', '82': 'processos_industriais', '83': 'processos_industriais',
+    '86': 'processos_industriais',
+    '84': 'alimentos', '85': 'alimentos',
+    '91': 'manutencao', '99': 'manutencao',
+}
+
+NOMES_AREAS = {
+    'administracao': "Administração e Comércio",
+    'metalurgia': "Indústria Metalúrgica",
+    'tecnologia': "Tecnologia da Informação",
+    'construcao': "Construção Civil",
+    'saude': "Saúde",
+    'logistica': "Logística e Transporte",
+    'agronegocio': "Agronegócio",
+    'tecnicos': "Técnicos de Nível Médio",
+    'cultura': "Cultura, Comunicação e Desporto",
+    'servicos': "Serviços",
+    'eletroeletronica': "Eletroeletrônica",
+    'precisao_artesanato': "Instrumentos de Precisão, Joalheria e Artesanato",
+    'textil_vestuario': "Têxtil, Couro, Vestuário e Artes Gráficas",
+    'madeira_mobiliario': "Madeira e Mobiliário",
+    'processos_industriais': "Indústria de Processos",
+    'alimentos': "Alimentos e Bebidas",
+    'manutencao': "Manutenção e Reparação",
+    'outras': "Outras Ocupações",
+}
+
+
+class LeitorPDF:
+    """Leitor mínimo de PDF: objetos pela tabela xref, fluxos, páginas e texto das fontes Type0"""
+
+    def __init__(self, caminho):
+        with open(caminho, 'rb') as arquivo:
+            self.dados = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.posicoes = self._ler_xref()
+        self._cmaps = {}  # objeto da fonte -> {código: texto}
+
+    def _ler_xref(self):
+        """Objeto -> posição no arquivo (tabela xref clássica; sem ela, varre o arquivo)"""
+        posicoes = {}
+        inicio = self.dados.rfind(b'startxref')
+        try:
+            posicao = int(self.dados[inicio + 9:inicio + 40].split()[0])
+            if self.dados[posicao:posicao + 4] != b'xref':
+                raise ValueError
+            posicao += 4
+            while True:
+                subsecao = PADRAO_SUBSECAO_XREF.match(self.dados, posicao)
+                if subsecao is None:
+                    break
+                primeiro, quantidade = int(subsecao.group(1)), int(subsecao.group(2))
+                posicao = subsecao.end()
+                for numero in range(primeiro, primeiro + quantidade):
+                    entrada = PADRAO_ENTRADA_XREF.match(self.dados, posicao)
+                    posicao = entrada.end()
+                    if entrada.group(3) == b'n':
+                        posicoes[numero] = int(entrada.group(1))
+        except (ValueError, IndexError, AttributeError):
+            posicoes = {}
+        if not posicoes:
+            # PDF sem tabela xref clássica (ou corrompida): localiza os objetos no arquivo
+            posicoes = {int(objeto.group(1)): objeto.start() for objeto in PADRAO_OBJETO.finditer(self.dados)}
+        return posicoes
+
+    def _inicio(self, numero):
+        """Posição logo após "N 0 obj" (geradores costumam errar a posição por alguns bytes)"""
+        posicao = self.posicoes[numero]
+        return PADRAO_OBJETO.search(self.dados, max(posicao - 16, 0), posicao + 32).end()
+
+    def objeto(self, numero):
+        """Dicionário (bytes) do objeto, sem o fluxo"""
+        inicio = self._inicio(numero)
+        fim = self.dados.find(b'stream', inicio)
+        fim_objeto = self.dados.find(b'endobj', inicio)
+        if fim == -1 or fim > fim_objeto:
+            fim = fim_objeto
+        return self.dados[inicio:fim]
+
+    def fluxo(self, numero):
+        """Conteúdo descomprimido do fluxo do objeto"""
+        dicionario = self.objeto(numero)
+        inicio = self.dados.find(b'stream', self._inicio(numero)) + 6
+        inicio += 2 if self.dados[inicio:inicio + 2] == b'\r\n' else 1
+        tamanho = re.search(rb'/Length\s+(\d+)(\s+\d+\s+R)?', dicionario)
+        if tamanho.group(2):
+            tamanho = int(self.objeto(int(tamanho.group(1))).split()[0])
+        else:
+            tamanho = int(tamanho.group(1))
+        bruto = self.dados[inicio:inicio + tamanho]
+        return zlib.decompress(bruto) if b'/FlateDecode' in dicionario else bruto
+
+    def paginas(self):
+        """Objetos das páginas, na ordem do documento"""
+        raiz = re.search(rb'/Root\s+(\d+)', self.dados[self.dados.rfind(b'trailer'):])
+        catalogo = self.objeto(int(raiz.group(1)))
+        pendentes = [int(re.search(rb'/Pages\s+(\d+)', catalogo).group(1))]
+        paginas = []
+        while pendentes:
+            numero = pendentes.pop(0)
+            dicionario = self.objeto(numero)
+            filhos = re.search(rb'/Kids\s*\[(.*?)\]', dicionario, re.S)
+            if filhos is None:
+                paginas.append(numero)
+            else:
+                pendentes[:0] = [int(filho) for filho in PADRAO_REFERENCIA.findall(filhos.group(1))]
+        return paginas
+
+    def cmap(self, fonte):
+        """Códigos de 2 bytes da fonte Type0 -> texto, pelo CMap ToUnicode"""
+        if fonte not in self._cmaps:
+            mapa = {}
+            referencia = re.search(rb'/ToUnicode\s+(\d+)', self.objeto(fonte))
+            conteudo = self.fluxo(int(referencia.group(1))) if referencia else b''
+            for bloco in re.findall(rb'beginbfchar(.*?)endbfchar', conteudo, re.S):
+                for codigo, texto in re.findall(rb'<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>', bloco):
+                    mapa[int(codigo, 16)] = bytes.fromhex(texto.decode()).decode('utf-16-be')
+            for bloco in re.findall(rb'beginbfrange(.*?)endbfrange', conteudo, re.S):
+                for inicio, fim, destino in re.findall(rb'<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>', bloco):
+                    inicio, fim, destino = int(inicio, 16), int(fim, 16), int(destino, 16)
+                    for codigo in range(inicio, fim + 1):
+                        mapa[codigo] = chr(destino + codigo - inicio)
+            self._cmaps[fonte] = mapa
+        return self._cmaps[fonte]
+
+    def pagina(self, numero):
+        """(trechos de texto [(y, x, texto)], retângulos [(x0, y0, x1, y1)]) da página"""
+        dicionario = self.objeto(numero)
+        recursos = re.search(rb'/Resources\s+(\d+)\s+\d+\s+R', dicionario)
+        recursos = self.objeto(int(recursos.group(1))) if recursos else dicionario
+        fontes = {nome: int(objeto) for nome, objeto in re.findall(rb'/([^\s/]+)\s+(\d+)\s+\d+\s+R', recursos)}
+        conteudos = re.search(rb'/Contents\s*(\[.*?\]|\d+\s+\d+\s+R)', dicionario, re.S).group(1)
+        conteudo = b'\n'.join(self.fluxo(int(objeto)) for objeto in PADRAO_REFERENCIA.findall(conteudos))
+
+        trechos = []
+        for bloco in PADRAO_BLOCO_TEXTO.findall(conteudo):
+            fonte, matriz = PADRAO_FONTE.search(bloco), PADRAO_MATRIZ.search(bloco)
+            if fonte is None or matriz is None or fonte.group(1) not in fontes:
+                continue
+            mapa = self.cmap(fontes[fonte.group(1)])
+            # Identity-H: cada código tem 2 bytes, em strings hexadecimais dos operadores TJ/Tj
+            codigos = bytes.fromhex(b''.join(PADRAO_HEX.findall(bloco)).decode('ascii'))
+            texto = ''.join([mapa.get(codigo, '') for codigo in struct.unpack(f'>{len(codigos) // 2}H', codigos[:len(codigos) // 2 * 2])])
+            if texto.strip():
+                trechos.append((float(matriz.group(6)), float(matriz.group(5)), texto))
+
+        retangulos = []
+        for numeros in PADRAO_RETANGULO.findall(conteudo):
+            xs, ys = [float(valor) for valor in numeros[0::2]], [float(valor) for valor in numeros[1::2]]
+            retangulos.append((min(xs), min(ys), max(xs), max(ys)))
+        return trechos, retangulos
+
+
+def _agrupar(valores):
+    """Valores ordenados, unindo os que distam menos que a tolerância (bordas duplicadas)"""
+    agrupados = []
+    for valor in sorted(valores):
+        if not agrupados or valor - agrupados[-1] > TOLERANCIA_BORDA:
+            agrupados.append(valor)
+    return agrupados
+
+
+def _juntar(trechos):
+    """Texto de trechos [(y, x, texto)] em ordem de leitura, com espaços normalizados"""
+    return ' '.join(' '.join(texto for _, _, texto in sorted(trechos, key=lambda t: (round(t[0]), t[1]))).split())
+
+
+def tabela_pagina(trechos, retangulos):
+    """(linhas de texto fora da tabela, linhas da tabela como listas de células) da página.
+
+    As bordas da tabela são retângulos finos: os horizontais separam as linhas e os
+    verticais que atravessam cada linha separam as células
+    """
+    horizontais = _agrupar((y0 + y1) / 2 for x0, y0, x1, y1 in retangulos if y1 - y0 < TOLERANCIA_BORDA and x1 - x0 > 20)
+    verticais = [
+        ((x0 + x1) / 2, y0, y1) for x0, y0, x1, y1 in retangulos if x1 - x0 < TOLERANCIA_BORDA and y1 - y0 > 5
+    ]
+
+    # Faixas entre bordas horizontais consecutivas, com as colunas que as atravessam
+    colunas = []
+    for topo, base in zip(horizontais, horizontais[1:]):
+        meio = (topo + base) / 2
+        colunas.append(_agrupar(x for x, y0, y1 in verticais if y0 <= meio <= y1))
+
+    celulas = [{} for _ in colunas]  # faixa -> {coluna: trechos}
+    fora = {}  # y -> trechos fora da tabela
+    for trecho in trechos:
+        y, x, _ = trecho
+        faixa = bisect_right(horizontais, y) - 1
+        if 0 <= faixa < len(colunas) and len(colunas[faixa]) >= 2:
+            coluna = bisect_right(colunas[faixa], x) - 1
+            if 0 <= coluna < len(colunas[faixa]) - 1:
+                celulas[faixa].setdefault(coluna, []).append(trecho)
+                continue
+        fora.setdefault(round(y), []).append(trecho)
+
+    linhas = [
+        [_juntar(celulas[faixa].get(coluna, [])) for coluna in range(len(colunas[faixa]) - 1)]
+        for faixa in range(len(colunas))
+        if celulas[faixa]
+    ]
+    textos = [_juntar(fora[y]) for y in sorted(fora)]
+    return [texto for texto in textos if texto], linhas
+
+
+def extrair_paginas(caminho, paginas):
+    """Texto fora da tabela e linhas da tabela de cada página (executado nos processos)"""
+    leitor = LeitorPDF(caminho)
+    return [tabela_pagina(*leitor.pagina(pagina)) for pagina in paginas]
+
+
+def codigos_cbo(texto):
+    """Códigos CBO citados na célula: "4110 -10 - Assistente" -> "4110-10"; famílias ("7640") ficam com 4 dígitos"""
+    codigos = []
+    for familia, ocupacao in PADRAO_CBO_PDF.findall(texto):
+        codigo = f"{familia}-{ocupacao}" if ocupacao else familia
+        if codigo not in codigos:
+            codigos.append(codigo)
+    return codigos
+
+
+def carga_horaria_total(texto):
+    """Carga horária total da célula: "800 a 1280 horas", "800 horas" (sem a divisão teoria/prática)"""
+    fixa = PADRAO_TOTAL.search(texto)
+    if fixa:
+        return f"{int(fixa.group(1).replace('.', ''))} horas"
+    total = PADRAO_DIVISAO_CARGA.split(texto, 1)[0]
+    minimo, maximo = PADRAO_MINIMO.search(total), PADRAO_MAXIMO.search(total)
+    if minimo is None:
+        minimo = PADRAO_HORAS.search(total)
+    if minimo is None:
+        return ' '.join(texto.split())
+    minimo = int(minimo.group(1).replace('.', ''))
+    maximo = int(maximo.group(1).replace('.', '')) if maximo else minimo
+    return f"{minimo} horas" if maximo == minimo else f"{minimo} a {maximo} horas"
+
+
+def duracao_texto(texto):
+    """Duração citada no texto do programa ("Máximo de 10 meses" -> "até 10 meses"), ou None"""
+    meses = PADRAO_MESES.search(texto)
+    return f"até {meses.group(1)} meses" if meses else None
+
+
+def faixa_etaria_celula(texto):
+    """ "18 a 24anos*" -> "18 a 24 anos"; None se a célula não traz uma faixa de idades"""
+    faixa = PADRAO_FAIXA_PDF.search(texto)
+    return f"{faixa.group(1)} a {faixa.group(2)} anos" if faixa else None
+
+
+def secao_titulo(texto):
+    """('ocupacao' | 'arco' | 'escola', escola) do título de seção, ou None"""
+    if '...' in texto:
+        return None  # sumário
+    if PADRAO_SECAO_OCUPACAO.match(texto):
+        return 'ocupacao', None
+    if PADRAO_SECAO_ARCOS.match(texto):
+        return 'arco', None
+    escola = PADRAO_SECAO_ESCOLA.match(texto)
+    if escola:
+        return 'escola', escola.group(1)
+    return None
+
+
+def registros_programas(paginas):
+    """Linhas da tabela de todas as páginas, em ordem -> registros brutos dos programas.
+
+    Linhas sem número continuam o programa da página anterior; os títulos definem a seção
+    (programas por ocupação, arcos ocupacionais ou programas de uma escola do Sistema S)
+    """
+    secao, escola = None, None
+    registros = []
+    for textos, linhas in paginas:
+        for celulas in [[texto] for texto in textos] + linhas:
+            if len(celulas) == 1:
+                encontrada = secao_titulo(celulas[0])
+                if encontrada:
+                    secao, escola = encontrada
+                continue
+            if len(celulas) < 6 or secao is None:
+                continue
+
+            numero = PADRAO_NUMERO_LINHA.match(celulas[0])
+            if numero:
+                # "358 Administração": sem borda entre o número e o nome do arco
+                celulas = [numero.group(1), ' '.join(filter(None, [numero.group(2), celulas[1]])), *celulas[2:6]]
+                registros.append({'secao': secao, 'escola': escola, 'celulas': celulas})
+            elif not celulas[0] and registros and any(celulas):
+                anterior = registros[-1]['celulas']
+                for indice, texto in enumerate(celulas[:6]):
+                    if texto:
+                        anterior[indice] = f"{anterior[indice]} {texto}".strip()
+    return registros
+
+
+def area_cbo(codigo):
+    """Chave da área do programa pela CBO principal"""
+    return AREAS_CBO.get(codigo[:3]) or AREAS_CBO.get(codigo[:2]) or 'outras'
+
+
+def chave_arco(nome):
+    """ "Administração 1" -> "administracao_1" """
+    return normalizar_fuzzy(nome).replace(' ', '_')
+
+
+def montar_catalogo(registros):
+    """Registros brutos -> {'programas': {área: {nome, programas}}, 'arcos_ocupacionais': {...}}"""
+    programas = []
+    for registro in registros:
+        numero, nome, cbo, descricao, faixa, carga = registro['celulas']
+        programa = {
+            "numero": numero,
+            "nome": nome,
+            "cbo": codigos_cbo(cbo),
+            "descricao": descricao,
+            "carga_horaria": carga_horaria_total(carga),
+            "escolas_sistema_s": [registro['escola']] if registro['escola'] else [],
+            "arco": nome if registro['secao'] == 'arco' else None,
+        }
+        # Campos que o catálogo nem sempre informa ficam de fora, em vez de um texto genérico
+        faixa_etaria = faixa_etaria_celula(faixa)
+        if faixa_etaria:
+            programa["faixa_etaria"] = faixa_etaria
+        elif faixa.strip():
+            # Ex.: exigência de habilitação na coluna da idade ("Categoria D – ... há 01 ano na Categoria B")
+            programa["requisitos"] = ' '.join(faixa.split())
+        duracao = duracao_texto(f"{carga} {descricao}")
+        if duracao:
+            programa["duracao"] = duracao
+        programas.append(programa)
+
+    # Arcos ocupacionais: programas da seção de arcos e os programas que compartilham suas CBOs
+    arcos_por_cbo = {}
+    for programa in programas:
+        if programa["arco"]:
+            for codigo in programa["cbo"]:
+                arcos_por_cbo.setdefault(codigo, programa["arco"])
+    arcos = {}
+    for programa in programas:
+        arco = programa["arco"] or next((arcos_por_cbo[codigo] for codigo in programa["cbo"] if codigo in arcos_por_cbo), None)
+        if arco is None:
+            # Programa fora de arco: sem o campo (o catálogo compacto não guarda ausências)
+            del programa["arco"]
+            continue
+        programa["arco"] = arco
+        dados_arco = arcos.setdefault(chave_arco(arco), {"nome": arco, "areas": [], "programas_relacionados": []})
+        area = NOMES_AREAS[area_cbo(programa["cbo"][0])] if programa["cbo"] else NOMES_AREAS['outras']
+        if area not in dados_arco["areas"]:
+            dados_arco["areas"].append(area)
+        dados_arco["programas_relacionados"].append(programa["numero"])
+
+    areas = {}
+    for programa in programas:
+        chave = area_cbo(programa["cbo"][0]) if programa["cbo"] else 'outras'
+        areas.setdefault(chave, {"nome": NOMES_AREAS[chave], "programas": []})["programas"].append(programa)
+    return {'programas': areas, 'arcos_ocupacionais': arcos}
+
+
+def ingerir_pdf(caminho=PDF_CONAP, processos=None):
+    """Catálogo extraído do PDF; as páginas são lidas em paralelo, em blocos de PAGINAS_POR_TAREFA"""
+    caminho = str(caminho)
+    paginas = LeitorPDF(caminho).paginas()
+    tarefas = [paginas[inicio:inicio + PAGINAS_POR_TAREFA] for inicio in range(0, len(paginas), PAGINAS_POR_TAREFA)]
+    processos = min(processos or os.cpu_count() or 1, len(tarefas))
+    if processos <= 1:
+        blocos = [extrair_paginas(caminho, tarefa) for tarefa in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            blocos = list(executor.map(extrair_paginas, [caminho] * len(tarefas), tarefas))
+    return montar_catalogo(registros_programas([pagina for bloco in blocos for pagina in bloco]))
+
+
+def main(argv=None):
+    """Grava o catálogo extraído do PDF em dados/conap.json"""
+    parser = argparse.ArgumentParser(description="Ingestão do catálogo CONAP a partir do PDF oficial")
+    parser.add_argument('--pdf', type=Path, default=PDF_CONAP, help="PDF do catálogo")
+    parser.add_argument('--saida', type=Path, default=DIRETORIO_DADOS / "conap.json", help="catálogo gerado")
+    parser.add_argument('--processos', type=int, default=None, help="processos de extração (padrão: núcleos da máquina)")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    catalogo = ingerir_pdf(args.pdf, args.processos)
+    catalogo['versao'] = datetime.now().strftime("%Y%m%d%H%M%S")
+    args.saida.parent.mkdir(parents=True, exist_ok=True)
+    gravar_json(args.saida, catalogo, compacto=True)
+
+    total = sum(len(area['programas']) for area in catalogo['programas'].values())
+    print(
+        f"{total} programas em {len(catalogo['programas'])} áreas e {len(catalogo['arcos_ocupacionais'])} arcos: "
+        f"{args.saida} ({args.saida.stat().st_size / 1024:.0f} KiB, {time.perf_counter() - inicio:.2f} s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
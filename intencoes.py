@@ -0,0 +1,309 @@
+"""
+Casador de Intenções do LexAprendiz
+Autômato Aho-Corasick único, compilado a partir das tabelas de keywords de todos
+os roteadores, que encontra todas as ocorrências em uma só passada pela consulta
+"""
+import hashlib
+import threading
+import weakref
+from collections import deque
+from itertools import count
+
+from artefatos import carregar_artefato
+from cache_consultas import CacheLRU, CACHES
+from indice_fuzzy import IndiceFuzzy
+from normalizacao import limite_de_palavra, normalizar, normalizar_espacos
+from sinonimos import expandir_tabela
+
+
+class AutomatoAhoCorasick:
+    """Autômato de casamento simultâneo de vários padrões (substrings).
+
+    Com palavras_inteiras=True, um padrão só é encontrado entre limites de palavra:
+    "idade" não ocorre em "estabilidade"
+    """
+
+    def __init__(self, padroes, palavras_inteiras=False):
+        self.palavras_inteiras = palavras_inteiras
+        # Nó 0 é a raiz; transicoes[n] mapeia caractere -> próximo nó
+        self.transicoes = [{}]
+        self.falhas = [0]
+        self.saidas = [()]
+
+        saidas = [[]]
+        for padrao in padroes:
+            if not padrao:
+                continue
+            no = 0
+            for caractere in padrao:
+                proximo = self.transicoes[no].get(caractere)
+                if proximo is None:
+                    proximo = len(self.transicoes)
+                    self.transicoes[no][caractere] = proximo
+                    self.transicoes.append({})
+                    self.falhas.append(0)
+                    saidas.append([])
+                no = proximo
+            saidas[no].append(padrao)
+
+        # Links de falha em largura; cada nó herda as saídas do seu sufixo
+        fila = deque(self.transicoes[0].values())
+        while fila:
+            no = fila.popleft()
+            for caractere, filho in self.transicoes[no].items():
+                fila.append(filho)
+                falha = self.falhas[no]
+                while falha and caractere not in self.transicoes[falha]:
+                    falha = self.falhas[falha]
+                destino = self.transicoes[falha].get(caractere, 0)
+                self.falhas[filho] = destino if destino != filho else 0
+                saidas[filho].extend(saidas[self.falhas[filho]])
+
+        self.saidas = [tuple(lista) for lista in saidas]
+
+    def encontrar(self, texto):
+        """Retorna o conjunto de padrões que ocorrem no texto"""
+        encontrados = set()
+        transicoes = self.transicoes
+        falhas = self.falhas
+        saidas = self.saidas
+        palavras_inteiras = self.palavras_inteiras
+        no = 0
+        for fim, caractere in enumerate(texto, 1):
+            while no and caractere not in transicoes[no]:
+                no = falhas[no]
+            no = transicoes[no].get(caractere, 0)
+            if saidas[no]:
+                if not palavras_inteiras:
+                    encontrados.update(saidas[no])
+                    continue
+                encontrados.update(
+                    padrao for padrao in saidas[no] if limite_de_palavra(texto, fim - len(padrao), fim)
+                )
+        return encontrados
+
+
+def assinatura_termos(termos, aproximados):
+    """Identifica o par (autômato, índice aproximado) compilado para estes termos"""
+    resumo = hashlib.sha256()
+    for conjunto in (termos, aproximados):
+        resumo.update('\n'.join(sorted(conjunto)).encode('utf-8') + b'\0')
+    return resumo.hexdigest()
+
+
+class Ocorrencias:
+    """Resultado da análise de uma consulta, consumido pelos roteadores.
+
+    Termos casados só de forma aproximada (erro de digitação, flexão) nunca passam à
+    frente dos exatos: vêm depois deles em termos() e ficam fora de intencoes_exatas()
+    """
+
+    def __init__(self, termos, registro, aproximados=(), sinonimos=None):
+        self.aproximados = set(aproximados) - set(termos)
+        self._sinonimos = sinonimos or {}  # grupo -> termos que o grupo só tem como sinônimos do tesauro
+        self.encontrados = {}  # grupo -> intenção -> [(aproximado, ordem, termo)]
+        for termo in set(termos) | self.aproximados:
+            aproximado = termo in self.aproximados
+            for grupo, intencao, ordem in registro[termo]:
+                self.encontrados.setdefault(grupo, {}).setdefault(intencao, []).append((aproximado, ordem, termo))
+        for intencoes in self.encontrados.values():
+            for lista in intencoes.values():
+                lista.sort()
+
+    def intencoes(self, grupo):
+        """Intenções do grupo com pelo menos um termo encontrado"""
+        return set(self.encontrados.get(grupo, {}))
+
+    def intencoes_exatas(self, grupo):
+        """Intenções do grupo com pelo menos um termo casado exatamente"""
+        return {intencao for intencao, lista in self.encontrados.get(grupo, {}).items() if not lista[0][0]}
+
+    def sinonimos(self, grupo):
+        """Termos exatos do grupo encontrados só por serem sinônimos de uma keyword ("aft")"""
+        return {
+            termo for lista in self.encontrados.get(grupo, {}).values()
+            for aproximado, _, termo in lista if not aproximado and termo in self._sinonimos.get(grupo, ())
+        }
+
+    def tem(self, grupo, intencao):
+        """Indica se a intenção do grupo foi encontrada"""
+        return intencao in self.encontrados.get(grupo, {})
+
+    def termos(self, grupo, intencao=None):
+        """Termos encontrados do grupo (ou da intenção): os exatos primeiro, na ordem em que foram declarados"""
+        intencoes = self.encontrados.get(grupo, {})
+        if intencao is not None:
+            return [termo for _, _, termo in intencoes.get(intencao, [])]
+
+        vistos = {}
+        for lista in intencoes.values():
+            for aproximado, ordem, termo in lista:
+                if termo not in vistos or (aproximado, ordem) < vistos[termo]:
+                    vistos[termo] = (aproximado, ordem)
+        return sorted(vistos, key=vistos.get)
+
+
+# Cada tabela registrada recebe uma geração única entre todos os casadores (chave dos caches)
+GERACOES = count(1)
+
+# Casadores vivos do processo, exportados juntos por `adk build-index`
+CASADORES = weakref.WeakSet()
+
+_trava_prontos = threading.Lock()
+_prontos = None
+
+
+def casadores_prontos():
+    """Assinatura dos termos -> (autômato, índice aproximado) do artefato, lido uma vez por processo"""
+    global _prontos
+    with _trava_prontos:
+        if _prontos is None:
+            _prontos = carregar_artefato('intencoes') or {}
+        return _prontos
+
+
+class CasadorIntencoes:
+    """Registro das tabelas de keywords e do autômato compilado a partir delas.
+
+    O casador global atende os roteadores fixos; cada snapshot do banco de conhecimento
+    tem o seu, com as keywords dos tópicos, publicado junto com o snapshot. `cache`
+    permite que casadores de snapshots sucessivos dividam o mesmo cache de análises
+    """
+
+    def __init__(self, cache=None):
+        self.registro = {}  # termo normalizado -> [(grupo, intenção, ordem no grupo)]
+        self.tabelas = {}  # grupo -> tabela normalizada {intenção: [termos]}
+        self.exatos = {}  # grupo -> sinônimos do tesauro, casados só na forma exata
+        self.compilado = None  # (registro, autômato, índice aproximado) publicados juntos
+        self.geracao = next(GERACOES)
+        self.trava = threading.Lock()
+        if cache is None:
+            cache = CacheLRU("intencoes", tamanho_maximo=1024)
+            CACHES.append(cache)
+        self.cache = cache
+        CASADORES.add(self)
+
+    def registrar(self, grupo, tabela, sinonimos=False):
+        """Registra (ou substitui) a tabela {intenção: [termos]} de um grupo.
+
+        Com sinonimos=True a tabela é expandida pelo tesauro; os sinônimos entram
+        só no autômato (casamento exato), sem aumentar o índice aproximado.
+        O registro é copiado antes da alteração: análises em andamento continuam
+        usando o autômato anterior até a recompilação na próxima análise.
+        """
+        # Forma das chaves de consulta, sem passar pelo cache de consultas normalizadas
+        originais = {normalizar_espacos(termo) for termos in tabela.values() for termo in termos}
+        if sinonimos:
+            tabela = expandir_tabela(tabela)
+        tabela = {
+            intencao: [termo for termo in map(normalizar_espacos, termos) if termo]
+            for intencao, termos in tabela.items()
+        }
+        exatos = {termo for termos in tabela.values() for termo in termos} - originais
+        with self.trava:
+            if self.tabelas.get(grupo) == tabela and self.exatos.get(grupo, set()) == exatos:
+                return
+
+            # Listas novas: o registro anterior continua intacto para as análises em andamento
+            registro = {}
+            for termo, entradas in self.registro.items():
+                restantes = [entrada for entrada in entradas if entrada[0] != grupo]
+                if restantes:
+                    registro[termo] = restantes
+
+            ordem = 0
+            for intencao, termos in tabela.items():
+                for termo in termos:
+                    registro.setdefault(termo, []).append((grupo, intencao, ordem))
+                    ordem += 1
+
+            self.tabelas[grupo] = tabela
+            self.exatos[grupo] = exatos
+            self.registro = registro
+            self.compilado = None
+            # Análises da tabela anterior ficam no cache com a geração antiga até serem descartadas
+            self.geracao = next(GERACOES)
+
+    def _aproximados(self):
+        # Termos do índice aproximado: os que não são apenas sinônimos de casamento exato.
+        # Termos sem letras ("15%") casam só no autômato: sem o símbolo virariam um número qualquer
+        return [
+            termo for termo, entradas in self.registro.items()
+            if any(caractere.isalpha() for caractere in termo)
+            and any(termo not in self.exatos[grupo] for grupo, _, _ in entradas)
+        ]
+
+    def compilar(self):
+        """Compila (se necessário) o autômato e o índice aproximado com todos os termos registrados"""
+        with self.trava:
+            if self.compilado is None:
+                aproximados = self._aproximados()
+                automato, fuzzy = casadores_prontos().get(assinatura_termos(self.registro, aproximados)) or (
+                    AutomatoAhoCorasick(self.registro.keys(), palavras_inteiras=True),
+                    IndiceFuzzy((termo, termo) for termo in aproximados),
+                )
+                self.compilado = (self.registro, automato, fuzzy)
+            return self.compilado
+
+    def exportar(self):
+        """{assinatura: (autômato, índice aproximado)} das tabelas registradas, para o artefato"""
+        with self.trava:
+            aproximados = self._aproximados()
+        registro, automato, fuzzy = self.compilar()
+        return {assinatura_termos(registro, aproximados): (automato, fuzzy)}
+
+    @staticmethod
+    def _encontrar(consulta, automato, casamentos):
+        """(termos exatos, termos só aproximados); sem acento ou no plural ainda é exato"""
+        exatos = automato.encontrar(consulta.chave)
+        aproximados = set()
+        for termo, _, distancia in casamentos:
+            (aproximados if distancia else exatos).add(termo)
+        return exatos, aproximados - exatos
+
+    def encontrar_termos(self, texto):
+        """(termos exatos, termos com erro de digitação ou flexão) registrados presentes no texto"""
+        return self.encontrar_termos_lote([texto])[0]
+
+    def encontrar_termos_lote(self, textos):
+        """encontrar_termos() de cada texto; as janelas repetidas no lote passam uma só vez pelo índice aproximado"""
+        _, automato, fuzzy = self.compilar()
+        consultas = [normalizar(texto) for texto in textos]
+        return [
+            self._encontrar(consulta, automato, casamentos)
+            for consulta, casamentos in zip(consultas, fuzzy.buscar_lote(consultas))
+        ]
+
+    def analisar(self, texto):
+        """Analisa a consulta uma única vez; chamadas repetidas reaproveitam o resultado"""
+        consulta = normalizar(texto)
+        chave = (self.geracao, consulta.chave)
+        ocorrencias = self.cache.obter(chave, None)
+        if ocorrencias is None:
+            registro, automato, fuzzy = self.compilar()
+            exatos, aproximados = self._encontrar(consulta, automato, fuzzy.buscar(consulta))
+            ocorrencias = Ocorrencias(exatos, registro, aproximados, self.exatos)
+            self.cache.guardar(chave, ocorrencias)
+        return ocorrencias
+
+
+# Instância global do casador de intenções
+casador_intencoes = CasadorIntencoes()
+
+
+def exportar_casadores():
+    """{assinatura: (autômato, índice aproximado)} de todos os casadores vivos do processo"""
+    compilados = {}
+    for casador in list(CASADORES):
+        compilados.update(casador.exportar())
+    return compilados
+
+
+def registrar_intencoes(grupo, tabela, sinonimos=False):
+    """Registra (ou substitui) a tabela {intenção: [termos]} de um roteador"""
+    casador_intencoes.registrar(grupo, tabela, sinonimos)
+
+
+def analisar(texto):
+    """Retorna as ocorrências de todas as intenções registradas na consulta"""
+    return casador_intencoes.analisar(texto)
@@ -0,0 +1,217 @@
+"""
+CLI do LexAprendiz (`adk`)
+
+Uso:
+    adk web                    # interface web (Streamlit) em http://localhost:8501
+    adk list                   # agentes disponíveis
+    adk build-index            # compila base SQLite, banco, CONAP e intenções em indices/
+    adk build-index --sem-sqlite
+    adk info                   # artefatos gerados e se ainda valem para o código e os dados atuais
+    adk ingest-conap           # extrai o catálogo do PDF oficial do CONAP para dados/conap.json
+    adk perguntar "qual a cota de aprendizes?"
+    adk citacoes "Decreto 5.598 art. 10"   # respostas a revisar quando a norma muda
+"""
+import argparse
+import importlib.util
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from artefatos import FONTES, RAIZ, artefato_valido, caminho_artefato, gravar_artefato, ler_cabecalho
+
+# Módulos importados por cada aplicação: cada uma registra um conjunto próprio de
+# tabelas de intenções, então o casador é compilado uma vez para cada conjunto
+APLICACOES = {
+    'adk': ['banco_conhecimento', 'conap_database'],
+    'web_app': ['web_app'],
+    'streamlit_app': ['streamlit_app'],
+}
+
+# Executado em processo separado: importa a aplicação e grava os casadores compilados
+CODIGO_COMPILAR_INTENCOES = """
+import importlib, pickle, sys
+for modulo in sys.argv[2:]:
+    importlib.import_module(modulo)
+from intencoes import exportar_casadores
+with open(sys.argv[1], 'wb') as arquivo:
+    pickle.dump(exportar_casadores(), arquivo)
+"""
+
+
+def compilar_banco():
+    """Snapshot do banco de conhecimento com todos os índices montados"""
+    from banco_conhecimento import BancoConhecimentoAprendizagem
+    from recarga import carregar_dados_conhecimento
+
+    banco = BancoConhecimentoAprendizagem(carregar_dados_conhecimento())
+    banco.indice_bm25
+    banco.passagens
+    return banco
+
+
+def compilar_conap():
+    """Snapshot do CONAP com o índice aproximado dos nomes montado"""
+    from conap_database import CONAPDatabase
+    from recarga import carregar_dados_conap
+
+    db = CONAPDatabase(carregar_dados_conap())
+    db.buscar_programa_aproximado('')
+    return db
+
+
+def compilar_intencoes():
+    """(casadores compilados por assinatura, aplicações indisponíveis com o motivo)"""
+    compilados, indisponiveis = {}, {}
+    with tempfile.TemporaryDirectory(prefix="lexaprendiz_intencoes_") as diretorio:
+        for aplicacao, modulos in APLICACOES.items():
+            saida = Path(diretorio) / f"{aplicacao}.pkl"
+            processo = subprocess.run(
+                [sys.executable, '-c', CODIGO_COMPILAR_INTENCOES, str(saida), *modulos],
+                cwd=RAIZ, capture_output=True, text=True
+            )
+            if processo.returncode != 0:
+                # Ex.: streamlit ausente no ambiente de compilação
+                linhas = processo.stderr.strip().splitlines()
+                indisponiveis[aplicacao] = linhas[-1] if linhas else f"código {processo.returncode}"
+                continue
+            with open(saida, 'rb') as arquivo:
+                compilados.update(pickle.load(arquivo))
+    return compilados, indisponiveis
+
+
+def build_index(args):
+    """Compila os artefatos usados na partida das aplicações"""
+    if not args.sem_sqlite:
+        from base_sqlite import gerar_base_sqlite, pool_leitura
+
+        inicio = time.perf_counter()
+        print(f"Base SQLite: {gerar_base_sqlite()} ({time.perf_counter() - inicio:.2f} s)")
+        # Conexões abertas antes da troca ainda leem o arquivo anterior
+        pool_leitura.fechar()
+
+    for nome, compilar in (('banco', compilar_banco), ('conap', compilar_conap)):
+        inicio = time.perf_counter()
+        snapshot = compilar()
+        caminho = gravar_artefato(nome, snapshot, snapshot.versao)
+        print(f"{nome}: {caminho} ({caminho.stat().st_size / 1024:.0f} KiB, {time.perf_counter() - inicio:.2f} s)")
+
+    inicio = time.perf_counter()
+    compilados, indisponiveis = compilar_intencoes()
+    caminho = gravar_artefato('intencoes', compilados)
+    print(
+        f"intencoes: {caminho} ({len(compilados)} casadores, {caminho.stat().st_size / 1024:.0f} KiB, "
+        f"{time.perf_counter() - inicio:.2f} s)"
+    )
+    for aplicacao, motivo in indisponiveis.items():
+        print(f"  {aplicacao}: indisponível ({motivo})", file=sys.stderr)
+
+
+def info(args):
+    """Mostra os artefatos existentes e se ainda correspondem às fontes"""
+    for nome in FONTES:
+        caminho = caminho_artefato(nome)
+        cabecalho = ler_cabecalho(caminho)
+        if cabecalho is None:
+            print(f"{nome}: ausente")
+            continue
+        situacao = "válido" if artefato_valido(cabecalho, nome) else "desatualizado (rode `adk build-index`)"
+        print(
+            f"{nome}: {situacao} | formato {cabecalho['formato']} | dados {cabecalho['versao_dados'] or 'do código'} | "
+            f"gerado em {cabecalho['criado_em']} | {caminho.stat().st_size / 1024:.0f} KiB"
+        )
+
+
+def ingest_conap(args):
+    """Extrai o catálogo do PDF oficial do CONAP para dados/conap.json"""
+    from ingestao_conap import main as ingerir
+
+    argumentos = []
+    for opcao in ('pdf', 'saida', 'processos'):
+        if getattr(args, opcao):
+            argumentos += [f'--{opcao}', str(getattr(args, opcao))]
+    ingerir(argumentos)
+
+
+def web(args):
+    """Inicia a interface web"""
+    comando = [sys.executable, '-m', 'streamlit', 'run', str(RAIZ / "web_app.py"), '--server.port', str(args.porta)]
+    sys.exit(subprocess.call(comando, cwd=RAIZ))
+
+
+def listar(args):
+    """Lista os agentes (diretórios com agent.py)"""
+    for arquivo in sorted(RAIZ.glob('*/agent.py')):
+        descricao = ''
+        try:
+            spec = importlib.util.spec_from_file_location(f"agente_{arquivo.parent.name}", arquivo)
+            modulo = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(modulo)
+            descricao = getattr(getattr(modulo, 'root_agent', None), 'description', '')
+        except Exception as e:
+            # Agente com dependência ausente: lista mesmo assim
+            descricao = f"(não carregado: {e})"
+        print(f"{arquivo.parent.name}: {descricao}" if descricao else arquivo.parent.name)
+
+
+def perguntar(args):
+    """Responde pela base local (banco de conhecimento e CONAP), sem pesquisa online"""
+    from banco_conhecimento import banco_conhecimento
+    from conap_database import consultar_conap
+
+    resposta = banco_conhecimento.buscar_resposta(args.pergunta) or consultar_conap(args.pergunta)
+    print(resposta or "Nenhuma resposta na base local para esta pergunta.")
+
+
+def citacoes(args):
+    """Respostas que citam a norma ou o artigo, a revisar quando a redação muda"""
+    from grafo_citacoes import respostas_que_citam
+
+    respostas = respostas_que_citam(args.referencia)
+    if not respostas:
+        print("Nenhuma resposta cita esta norma.")
+    for fonte, chave in respostas:
+        print(f"{fonte}: {chave}")
+
+
+def main(argv=None):
+    """Ponto de entrada do comando `adk`"""
+    parser = argparse.ArgumentParser(prog='adk', description="LexAprendiz - ferramentas de linha de comando")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    comando = comandos.add_parser('web', help="inicia a interface web")
+    comando.add_argument('--porta', type=int, default=8501, help="porta do servidor")
+    comando.set_defaults(executar=web)
+
+    comando = comandos.add_parser('list', help="lista os agentes disponíveis")
+    comando.set_defaults(executar=listar)
+
+    comando = comandos.add_parser('build-index', help="compila os artefatos binários carregados na partida")
+    comando.add_argument('--sem-sqlite', action='store_true', help="não regera a base SQLite compartilhada")
+    comando.set_defaults(executar=build_index)
+
+    comando = comandos.add_parser('info', help="situação dos artefatos")
+    comando.set_defaults(executar=info)
+
+    comando = comandos.add_parser('ingest-conap', help="extrai o catálogo do PDF oficial do CONAP")
+    comando.add_argument('--pdf', help="PDF do catálogo (padrão: conap-janeiro-2021.pdf)")
+    comando.add_argument('--saida', help="catálogo gerado (padrão: dados/conap.json)")
+    comando.add_argument('--processos', type=int, help="processos de extração (padrão: núcleos da máquina)")
+    comando.set_defaults(executar=ingest_conap)
+
+    comando = comandos.add_parser('perguntar', help="consulta a base local")
+    comando.add_argument('pergunta')
+    comando.set_defaults(executar=perguntar)
+
+    comando = comandos.add_parser('citacoes', help="respostas que citam uma norma ou um artigo")
+    comando.add_argument('referencia', help='ex.: "Decreto 5.598 art. 10"')
+    comando.set_defaults(executar=citacoes)
+
+    args = parser.parse_args(argv)
+    args.executar(args)
+
+
+if __name__ == "__main__":
+    main()
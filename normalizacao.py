@@ -0,0 +1,146 @@
+"""
+Normalização de Texto do LexAprendiz
+Etapa única de normalização das perguntas (acentos, pontuação, números e radicais),
+com expressões pré-compiladas e um objeto de consulta reaproveitado por todos os
+roteadores e chaves de cache
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+# Consultas normalizadas mantidas por processo (uma mensagem passa por vários roteadores)
+TAMANHO_CACHE_NORMALIZACAO = 1024
+
+PADRAO_ESPACOS = re.compile(r'\s+')
+PADRAO_NAO_PALAVRA = re.compile(r'[^\w]+')
+PADRAO_NAO_DIGITO = re.compile(r'\D')
+
+# "3.872" / "10,097" -> "3872" / "10097"
+PADRAO_SEPARADOR_NUMERO = re.compile(r'(?<=\d)[.,](?=\d)')
+
+# "nº 3872" / "n 3872" (após remover acentos e pontuação) -> "3872"
+PADRAO_NUMERO_ORDINAL = re.compile(r'\bno?\s*(?=\d)')
+
+# Padrões usados pelos roteadores
+PADRAO_CBO = re.compile(r'\d{4}-\d{2}')
+PADRAO_IDADE = re.compile(r'(\d+)\s*anos?')
+PADRAO_NUMERO = re.compile(r'\d+')
+
+# Palavras sem valor discriminativo nas consultas em português
+STOPWORDS = {
+    'a', 'o', 'as', 'os', 'um', 'uma', 'de', 'da', 'do', 'das', 'dos', 'e', 'é',
+    'em', 'no', 'na', 'nos', 'nas', 'ao', 'aos', 'à', 'às', 'para', 'pra', 'por',
+    'pelo', 'pela', 'com', 'sem', 'que', 'qual', 'quais', 'como', 'se', 'ou',
+    'mais', 'sobre', 'ser', 'são', 'há', 'tem', 'eu', 'me', 'meu', 'minha'
+}
+
+# Sufixos de plural e sua forma no singular, do mais longo para o mais curto
+SUFIXOS_PLURAL = (
+    ('oes', 'ao'), ('aes', 'ao'), ('ais', 'al'), ('eis', 'el'), ('ois', 'ol'),
+    ('uis', 'ul'), ('res', 'r'), ('zes', 'z'), ('ns', 'm'), ('s', ''),
+)
+
+
+def dobrar_acentos(texto):
+    """Remove acentos e converte para minúsculas ("Rescisão" -> "rescisao")"""
+    decomposto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def limite_de_palavra(texto, inicio, fim):
+    """Indica se o trecho texto[inicio:fim] não começa nem termina no meio de uma palavra"""
+    return not (
+        (inicio > 0 and texto[inicio - 1].isalnum() and texto[inicio].isalnum())
+        or (fim < len(texto) and texto[fim].isalnum() and texto[fim - 1].isalnum())
+    )
+
+
+def normalizar_espacos(texto):
+    """Minúsculas e espaços colapsados: forma usada nas chaves de cache e no casamento exato"""
+    return PADRAO_ESPACOS.sub(' ', texto.lower()).strip()
+
+
+def normalizar_fuzzy(texto):
+    """Forma canônica para comparação aproximada: sem acentos, pontuação, separador de milhar ou "nº" """
+    texto = PADRAO_SEPARADOR_NUMERO.sub('', dobrar_acentos(texto))
+    texto = PADRAO_NAO_PALAVRA.sub(' ', texto)
+    return ' '.join(PADRAO_NUMERO_ORDINAL.sub('', texto).split())
+
+
+def radical(palavra):
+    """Radical leve (só o plural): "contratos" -> "contrato", "rescisoes" -> "rescisao" """
+    if len(palavra) <= 3 or palavra.isdigit():
+        return palavra
+    for sufixo, singular in SUFIXOS_PLURAL:
+        if palavra.endswith(sufixo) and len(palavra) - len(sufixo) >= 2:
+            return palavra[:-len(sufixo)] + singular
+    return palavra
+
+
+# Terminações de particípio e gerúndio, depois de retirado o gênero
+SUFIXOS_FLEXAO = ('and', 'end', 'ind', 'ad', 'id')
+
+
+def radical_genero(palavra):
+    """Radical sem plural nem gênero: "proibidas" e "proibidos" -> "proibid" """
+    palavra = radical(palavra)
+    if len(palavra) >= 5 and palavra[-1] in 'ao':
+        return palavra[:-1]
+    return palavra
+
+
+def radical_flexao(palavra):
+    """Radical sem plural, gênero ou particípio: "contratado" e "contrato" -> "contrat".
+    Só identifica palavras conhecidas (não são erro de digitação), não casa termos"""
+    palavra = radical_genero(palavra)
+    for sufixo in SUFIXOS_FLEXAO:
+        if palavra.endswith(sufixo) and len(palavra) - len(sufixo) >= 4:
+            return palavra[:-len(sufixo)]
+    return palavra
+
+
+STOPWORDS_DOBRADAS = {dobrar_acentos(palavra) for palavra in STOPWORDS}
+
+
+def radicais(dobrada):
+    """Radicais das palavras de um texto já em forma canônica, sem stopwords"""
+    return [radical(palavra) for palavra in dobrada.split() if palavra not in STOPWORDS_DOBRADAS]
+
+
+def extrair_termos(texto):
+    """Termos indexáveis do texto: sem acentos, sem stopwords, reduzidos ao radical"""
+    return radicais(normalizar_fuzzy(texto))
+
+
+class ConsultaNormalizada:
+    """Pergunta normalizada uma única vez e compartilhada pelos roteadores"""
+
+    def __init__(self, texto):
+        self.original = texto
+        self.chave = normalizar_espacos(texto)
+        self.dobrada = normalizar_fuzzy(texto)
+        self.termos = radicais(self.dobrada)
+        self.numeros = PADRAO_NUMERO.findall(self.dobrada)
+
+    def __str__(self):
+        return self.original
+
+    def __repr__(self):
+        return f"ConsultaNormalizada({self.original!r})"
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_NORMALIZACAO)
+def _normalizar(texto):
+    return ConsultaNormalizada(texto)
+
+
+def normalizar(consulta):
+    """Retorna a ConsultaNormalizada da pergunta (a mesma instância para o mesmo texto)"""
+    if isinstance(consulta, ConsultaNormalizada):
+        return consulta
+    return _normalizar(consulta)
+
+
+def limpar_cache_normalizacao():
+    """Descarta as consultas normalizadas memorizadas"""
+    _normalizar.cache_clear()
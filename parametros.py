@@ -0,0 +1,129 @@
+"""
+Parâmetros das Respostas - LexAprendiz
+Tabela central dos valores que mudam todo ano (salário mínimo, faixa de multas,
+ano de referência) e modelos de resposta pré-compilados, renderizados uma única
+vez por versão dos parâmetros que usam
+"""
+import re
+from functools import lru_cache
+from itertools import count
+from pathlib import Path
+
+from recarga import DIRETORIO_DADOS, ReferenciaAtomica, ler_json
+
+# Valores vigentes; a atualização anual é feita em dados/parametros.json, sem alterar o código
+PARAMETROS_PADRAO = {
+    'ano_salario_minimo': 2024,
+    'decreto_salario_minimo': 'Decreto 11.864/2023',
+    'salario_minimo': 1412.00,
+    'horas_mensais': 220,
+    'jornada_exemplo': 6,  # horas por dia no exemplo de cálculo do salário
+    'dias_exemplo': 22,  # dias trabalhados no mês do exemplo
+    'ano_multas': 2024,
+    'multa_minima': 402.53,
+    'multa_maxima': 4025.33,
+}
+
+# Alíquota do FGTS do aprendiz (Lei 8.036/1990, art. 15, §7º) - fixa em lei
+ALIQUOTA_FGTS_APRENDIZ = 0.02
+
+# Campo de modelo: "{salario_minimo}"; chaves com outros nomes ficam como texto
+PADRAO_CAMPO = re.compile(r'\{(\w+)\}')
+
+# Cada tabela carregada recebe uma geração própria
+GERACOES = count(1)
+
+
+def formatar_reais(valor):
+    """1412.0 -> "1.412,00" """
+    return f"{valor:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def calcular_campos(valores):
+    """Campos disponíveis aos modelos: parâmetros formatados e valores derivados"""
+    salario_hora = round(valores['salario_minimo'] / valores['horas_mensais'], 2)
+    # Horas do exemplo sempre derivadas da jornada e dos dias, para o texto nunca divergir
+    horas_exemplo = valores['jornada_exemplo'] * valores['dias_exemplo']
+    salario_exemplo = round(horas_exemplo * salario_hora, 2)
+    return {
+        'ano_salario_minimo': str(valores['ano_salario_minimo']),
+        'decreto_salario_minimo': valores['decreto_salario_minimo'],
+        'salario_minimo': formatar_reais(valores['salario_minimo']),
+        'horas_mensais': str(valores['horas_mensais']),
+        'jornada_exemplo': str(valores['jornada_exemplo']),
+        'dias_exemplo': str(valores['dias_exemplo']),
+        'horas_exemplo': str(horas_exemplo),
+        'salario_hora': formatar_reais(salario_hora),
+        'salario_exemplo': formatar_reais(salario_exemplo),
+        'fgts_exemplo': formatar_reais(round(salario_exemplo * ALIQUOTA_FGTS_APRENDIZ, 2)),
+        'ano_multas': str(valores['ano_multas']),
+        'multa_minima': formatar_reais(valores['multa_minima']),
+        'multa_maxima': formatar_reais(valores['multa_maxima']),
+    }
+
+
+CAMPOS = frozenset(calcular_campos(PARAMETROS_PADRAO))
+
+
+def carregar_dados_parametros(diretorio=DIRETORIO_DADOS):
+    """Parâmetros em dados/parametros.json (None se não exportados)"""
+    caminho = Path(diretorio) / "parametros.json"
+    if not caminho.exists():
+        return None
+    return ler_json(caminho)
+
+
+class TabelaParametros:
+    """Snapshot imutável dos parâmetros e dos campos formatados a partir deles"""
+
+    def __init__(self, dados=None):
+        self.valores = dict(PARAMETROS_PADRAO, **(dados or {}).get('parametros', {}))
+        self.versao = dados.get('versao') if dados else None
+        self.geracao = next(GERACOES)
+        self.campos = calcular_campos(self.valores)
+
+
+class ModeloResposta:
+    """Texto pré-compilado em partes literais e campos.
+
+    O resultado fica guardado com a assinatura dos campos usados: só os modelos
+    que dependem de um parâmetro alterado voltam a ser montados.
+    """
+
+    def __init__(self, texto):
+        self.partes = []  # literais em posições pares, nomes de campos nas ímpares
+        inicio = 0
+        for encontrado in PADRAO_CAMPO.finditer(texto):
+            if encontrado.group(1) in CAMPOS:
+                self.partes.extend([texto[inicio:encontrado.start()], encontrado.group(1)])
+                inicio = encontrado.end()
+        self.partes.append(texto[inicio:])
+        self.campos = tuple(dict.fromkeys(self.partes[1::2]))
+        self._renderizado = ((), texto) if not self.campos else (None, None)  # (assinatura, texto)
+
+    def assinatura(self, campos):
+        """Valores dos campos usados pelo modelo"""
+        return tuple(campos[campo] for campo in self.campos)
+
+    def renderizar(self, campos):
+        """Texto com os campos preenchidos (montado só quando a assinatura muda)"""
+        assinatura = self.assinatura(campos)
+        anterior, texto = self._renderizado
+        if anterior != assinatura:
+            texto = ''.join(
+                campos[parte] if posicao % 2 else parte for posicao, parte in enumerate(self.partes)
+            )
+            self._renderizado = (assinatura, texto)
+        return texto
+
+
+# Modelos compilados uma vez por texto
+compilar_modelo = lru_cache(maxsize=256)(ModeloResposta)
+
+# Instância global dos parâmetros (dados/ quando exportados; recarregável em execução)
+tabela_parametros = ReferenciaAtomica(TabelaParametros(carregar_dados_parametros()))
+
+
+def renderizar(texto, campos=None):
+    """Preenche o modelo com os parâmetros (os atuais, se não informados)"""
+    return compilar_modelo(texto).renderizar(campos if campos is not None else tabela_parametros.campos)
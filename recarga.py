@@ -0,0 +1,252 @@
+"""
+Recarga a Quente - LexAprendiz
+Carrega o banco de conhecimento e o CONAP de arquivos versionados em dados/ e
+troca o snapshot em uso de uma só vez, reindexando apenas o que mudou
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Diretório com conhecimento.json, conap.json, parametros.json e respostas/<tópico>.md
+DIRETORIO_DADOS = Path(__file__).with_name("dados")
+
+# Intervalo mínimo (segundos) entre verificações de alteração nos arquivos
+INTERVALO_VERIFICACAO = 5.0
+
+
+class ReferenciaAtomica:
+    """Referência ao snapshot em uso; atributos são delegados ao snapshot atual.
+
+    Snapshots nunca são alterados depois de montados: a recarga monta um novo
+    e o publica com uma única atribuição, então quem já obteve um método
+    termina a consulta inteira no mesmo snapshot.
+    """
+
+    def __init__(self, atual):
+        self.atual = atual
+        self.trava = threading.Lock()  # serializa recargas; leituras não bloqueiam
+
+    def __getattr__(self, nome):
+        return getattr(self.atual, nome)
+
+    def trocar(self, novo):
+        """Publica o novo snapshot e retorna o anterior"""
+        anterior, self.atual = self.atual, novo
+        return anterior
+
+
+def ler_json(caminho):
+    """Lê um arquivo JSON em UTF-8"""
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def gravar_json(caminho, dados, compacto=False):
+    """Grava JSON em arquivo temporário e troca de uma vez (leitores nunca veem arquivo parcial)"""
+    caminho = Path(caminho)
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        if compacto:
+            json.dump(dados, arquivo, ensure_ascii=False, separators=(',', ':'))
+        else:
+            json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def impressao(dados, arquivo=None):
+    """Impressão digital de um registro (e do arquivo associado) para detectar alterações"""
+    texto = json.dumps(dados, sort_keys=True, ensure_ascii=False)
+    if arquivo is not None and Path(arquivo).exists():
+        estado = Path(arquivo).stat()
+        texto += f"|{estado.st_mtime_ns}|{estado.st_size}"
+    return texto
+
+
+def carregar_dados_conhecimento(diretorio=DIRETORIO_DADOS):
+    """Dados do banco de conhecimento em dados/conhecimento.json (None se não exportados)"""
+    diretorio = Path(diretorio)
+    caminho = diretorio / "conhecimento.json"
+    if not caminho.exists():
+        return None
+
+    dados = ler_json(caminho)
+    # Respostas em arquivo são referenciadas pelo caminho relativo ao diretório de dados
+    for topico in dados['conhecimento'].values():
+        if topico['resposta'].endswith('.md'):
+            topico['resposta'] = str(diretorio / topico['resposta'])
+    return dados
+
+
+def carregar_dados_conap(diretorio=DIRETORIO_DADOS):
+    """Dados do CONAP em dados/conap.json (None se não exportados)"""
+    caminho = Path(diretorio) / "conap.json"
+    if not caminho.exists():
+        return None
+    return ler_json(caminho)
+
+
+def exportar_dados(diretorio=DIRETORIO_DADOS, versao=None):
+    """Exporta os dados em uso para arquivos versionados editáveis sem reiniciar a aplicação"""
+    from banco_conhecimento import banco_conhecimento
+    from conap_database import conap_db
+    from parametros import tabela_parametros
+
+    diretorio = Path(diretorio)
+    respostas = diretorio / "respostas"
+    respostas.mkdir(parents=True, exist_ok=True)
+    versao = versao or datetime.now().strftime("%Y%m%d%H%M%S")
+
+    conhecimento = {}
+    for topico, dados in banco_conhecimento.conhecimento.items():
+        arquivo = respostas / f"{topico}.md"
+        arquivo.write_text(banco_conhecimento._gerar_resposta(topico), encoding='utf-8')
+        conhecimento[topico] = dict(dados, resposta=f"respostas/{topico}.md")
+
+    gravar_json(diretorio / "conhecimento.json", {
+        'versao': versao,
+        'legislacao_vigente': banco_conhecimento.legislacao_vigente,
+        'conhecimento': conhecimento,
+    })
+    gravar_json(diretorio / "conap.json", {
+        'versao': versao,
+        'programas': conap_db.programas,
+        'arcos_ocupacionais': conap_db.arcos_ocupacionais,
+    })
+    gravar_json(diretorio / "parametros.json", {
+        'versao': versao,
+        'parametros': tabela_parametros.valores,
+    })
+    return diretorio
+
+
+def recarregar_parametros(diretorio=DIRETORIO_DADOS):
+    """Publica a nova tabela de parâmetros se os valores mudaram (None caso contrário)"""
+    from parametros import tabela_parametros, TabelaParametros, carregar_dados_parametros
+
+    dados = carregar_dados_parametros(diretorio)
+    if dados is None:
+        return None
+
+    inicio = time.perf_counter()
+    with tabela_parametros.trava:
+        anterior = tabela_parametros.atual
+        nova = TabelaParametros(dados)
+        if nova.valores == anterior.valores:
+            return None
+        tabela_parametros.trocar(nova)
+
+    return {
+        'base': 'parametros',
+        'versao': nova.versao,
+        'alterados': sorted(chave for chave, valor in nova.valores.items() if anterior.valores.get(chave) != valor),
+        'removidos': [],
+        'tempo_ms': (time.perf_counter() - inicio) * 1000,
+    }
+
+
+def recarregar_conhecimento(diretorio=DIRETORIO_DADOS, forcar=False):
+    """Monta o novo snapshot do banco de conhecimento a partir dos arquivos e o publica.
+
+    Com forcar=True (parâmetros alterados) o snapshot é remontado mesmo sem dados/conhecimento.json.
+    """
+    from banco_conhecimento import banco_conhecimento, BancoConhecimentoAprendizagem
+    from cache_consultas import cache_respostas
+
+    dados = carregar_dados_conhecimento(diretorio)
+    if dados is None and not forcar:
+        return None
+
+    inicio = time.perf_counter()
+    with banco_conhecimento.trava:
+        anterior = banco_conhecimento.atual
+        novo = BancoConhecimentoAprendizagem(dados, anterior=anterior)
+        banco_conhecimento.trocar(novo)
+
+    # Entradas da geração anterior nunca mais seriam lidas
+    cache_respostas.limpar()
+    return {
+        'base': 'conhecimento',
+        'versao': novo.versao,
+        'alterados': sorted(novo.alterados),
+        'removidos': sorted(set(anterior.conhecimento) - set(novo.conhecimento)),
+        'tempo_ms': (time.perf_counter() - inicio) * 1000,
+    }
+
+
+def recarregar_conap(diretorio=DIRETORIO_DADOS):
+    """Monta o novo snapshot do CONAP a partir dos arquivos e o publica"""
+    from conap_database import conap_db, CONAPDatabase
+    from cache_consultas import cache_conap
+
+    dados = carregar_dados_conap(diretorio)
+    if dados is None:
+        return None
+
+    inicio = time.perf_counter()
+    with conap_db.trava:
+        anterior = conap_db.atual
+        novo = CONAPDatabase(dados, anterior=anterior)
+        conap_db.trocar(novo)
+
+    cache_conap.limpar()
+    return {
+        'base': 'conap',
+        'versao': novo.versao,
+        'alterados': sorted(novo.alterados),
+        'removidos': sorted(set(anterior.impressoes) - set(novo.impressoes)),
+        'tempo_ms': (time.perf_counter() - inicio) * 1000,
+    }
+
+
+def assinatura_arquivos(diretorio=DIRETORIO_DADOS):
+    """(arquivo, mtime, tamanho) de todos os arquivos de dados"""
+    diretorio = Path(diretorio)
+    if not diretorio.exists():
+        return ()
+    return tuple(sorted(
+        (str(caminho), caminho.stat().st_mtime_ns, caminho.stat().st_size)
+        for caminho in diretorio.rglob('*')
+        if caminho.is_file() and caminho.suffix != '.tmp'
+    ))
+
+
+_trava_verificacao = threading.Lock()
+_ultima_verificacao = time.monotonic()
+_assinatura = assinatura_arquivos()
+
+
+def recarregar_se_alterado(diretorio=DIRETORIO_DADOS):
+    """Recarrega as bases se os arquivos mudaram; chamada barata a cada requisição"""
+    global _ultima_verificacao, _assinatura
+
+    agora = time.monotonic()
+    if agora - _ultima_verificacao < INTERVALO_VERIFICACAO:
+        return []
+    if not _trava_verificacao.acquire(blocking=False):
+        return []  # outra thread já está verificando
+
+    try:
+        _ultima_verificacao = agora
+        assinatura = assinatura_arquivos(diretorio)
+        if assinatura == _assinatura:
+            return []
+        _assinatura = assinatura
+        # Parâmetros primeiro: o novo snapshot do banco já monta as respostas com eles
+        parametros = recarregar_parametros(diretorio)
+        return [
+            resultado for resultado in (
+                parametros,
+                recarregar_conhecimento(diretorio, forcar=parametros is not None),
+                recarregar_conap(diretorio),
+            )
+            if resultado is not None
+        ]
+    finally:
+        _trava_verificacao.release()
+
+
+if __name__ == "__main__":
+    print(f"Dados exportados em {exportar_dados()}")
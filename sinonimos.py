@@ -0,0 +1,74 @@
+"""
+Sinônimos Jurídicos do LexAprendiz
+Tesauro do vocabulário da aprendizagem, expandido nos índices quando são montados
+(as consultas não pagam nenhum custo extra)
+"""
+from normalizacao import normalizar_espacos, normalizar_fuzzy
+
+# Cada grupo reúne formas que os usuários escrevem para o mesmo conceito
+GRUPOS_SINONIMOS = [
+    ['menor aprendiz', 'jovem aprendiz', 'estagiário aprendiz', 'adolescente aprendiz'],
+    ['auditores fiscais', 'auditor fiscal', 'auditor-fiscal', 'aft', 'fiscal do trabalho', 'auditoria fiscal do trabalho'],
+    ['fiscalização', 'inspeção do trabalho', 'inspeção'],
+    ['rescisão', 'demissão', 'desligamento', 'dispensa'],
+    ['salário', 'remuneração'],
+    ['jornada', 'carga horária', 'expediente'],
+    ['gestante', 'grávida', 'gravidez', 'gestação'],
+    ['multa', 'penalidade', 'sanção', 'autuação', 'auto de infração'],
+    ['ead', 'ensino a distância', 'educação a distância', 'aula remota', 'aula virtual'],
+    ['cnap', 'cadastro nacional de aprendizagem'],
+    ['entidade formadora', 'instituição formadora', 'entidade qualificadora'],
+    ['pcd', 'pessoa com deficiência', 'deficiente'],
+    ['ctps', 'carteira de trabalho'],
+    ['clt', 'consolidação das leis do trabalho'],
+    ['mte', 'ministério do trabalho', 'ministério do trabalho e emprego'],
+    ['perigoso', 'periculosidade'],
+    ['insalubre', 'insalubridade'],
+    ['limite etário', 'faixa etária'],
+]
+
+
+def indexar_grupos(grupos):
+    """Termo normalizado -> demais termos do seu grupo"""
+    sinonimos = {}
+    for grupo in grupos:
+        termos = [normalizar_espacos(termo) for termo in grupo]
+        for termo in termos:
+            lista = sinonimos.setdefault(termo, [])
+            lista.extend(outro for outro in termos if outro != termo and outro not in lista)
+    return sinonimos
+
+
+SINONIMOS = indexar_grupos(GRUPOS_SINONIMOS)
+
+# Formas canônicas dos grupos, para localizar sinônimos em textos longos
+_GRUPOS_DOBRADOS = [
+    (grupo, [f' {normalizar_fuzzy(termo)} ' for termo in grupo]) for grupo in GRUPOS_SINONIMOS
+]
+
+
+def expandir_termos(termos):
+    """Lista de keywords acrescida dos sinônimos de cada uma (originais primeiro, sem repetição)"""
+    expandidos = list(termos)
+    vistos = {normalizar_espacos(termo) for termo in termos}
+    for termo in termos:
+        for sinonimo in SINONIMOS.get(normalizar_espacos(termo), ()):
+            if sinonimo not in vistos:
+                vistos.add(sinonimo)
+                expandidos.append(sinonimo)
+    return expandidos
+
+
+def expandir_tabela(tabela):
+    """Tabela {chave: [keywords]} com os sinônimos compilados em cada lista"""
+    return {chave: expandir_termos(termos) for chave, termos in tabela.items()}
+
+
+def expandir_texto(texto):
+    """Texto acrescido dos sinônimos dos conceitos que ele menciona (documentos do BM25)"""
+    forma = f' {normalizar_fuzzy(texto)} '
+    extras = [
+        ' '.join(grupo) for grupo, dobrados in _GRUPOS_DOBRADOS
+        if any(termo in forma for termo in dobrados)
+    ]
+    return '\n'.join([texto] + extras) if extras else texto
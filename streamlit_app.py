@@ -7,6 +7,9 @@ import streamlit as st
 import json
 import hashlib
 import os
+from historico_chat import mensagem_resposta, texto_mensagem
+from intencoes import analisar, registrar_intencoes
+from parametros import renderizar, tabela_parametros
 
 # Desabilita warnings e logs excessivos
 import logging
@@ -264,7 +267,7 @@ def show_chat():
     # Mostrar mensagens
     for msg in st.session_state.messages:
         with st.chat_message(msg["role"]):
-            st.write(msg["content"])
+            st.write(texto_mensagem(msg))
     
     # Input do usuário
     if prompt := st.chat_input("Digite sua pergunta sobre legislação da aprendizagem..."):
@@ -277,9 +280,11 @@ def show_chat():
         # Gerar resposta
         with st.chat_message("assistant"):
             with st.spinner("Consultando base jurídica..."):
-                resposta = get_response(prompt)
-                st.write(resposta)
-                st.session_state.messages.append({"role": "assistant", "content": resposta})
+                # A sessão guarda só a referência; o texto é compartilhado pelo processo
+                intencao = intencao_resposta(prompt)
+                mensagem = mensagem_resposta(referencia_resposta(intencao), lambda: texto_resposta(intencao))
+                st.write(texto_mensagem(mensagem))
+                st.session_state.messages.append(mensagem)
     
     # Botões de ação
     col1, col2, col3 = st.columns(3)
@@ -297,12 +302,43 @@ def show_chat():
         st.markdown("**📞 Suporte**")
         st.caption("Sistema LexAprendiz v4.0")
 
+# Tabela de keywords do roteador de respostas (compilada no casador de intenções)
+INTENCOES_RESPOSTA = {
+    'proibidos': ['proibido', 'proibidos', 'não pode', 'impossibilitado', 'vedado', 'impedido'],
+    'gestante': ['gestante', 'grávida', 'gravidez', 'maternidade'],
+    'cotas': ['cota', 'quantos', 'cálculo', 'percentual', 'proporção'],
+    'penalidades': ['multa', 'multar', 'penalidade', 'fiscalização', 'autuação', 'infração'],
+    'conap': ['conap', 'programa', 'senai', 'senac', 'senat', 'senar', 'sescoop', 'sistema s'],
+    'contratos': ['contrato', 'formalizar', 'ctps', 'registro', 'documentação'],
+    'pcd': ['deficiência', 'deficiente', 'pcd', 'inclusão', 'acessibilidade'],
+    'jornada': ['jornada', 'horário', 'horas', 'trabalho', 'período'],
+    'rescisao': ['rescisão', 'demissão', 'término', 'fim', 'acabar']
+}
+
+registrar_intencoes('resposta', INTENCOES_RESPOSTA, sinonimos=True)
+
+def intencao_resposta(pergunta):
+    """Intenção que responde a pergunta (a primeira declarada em INTENCOES_RESPOSTA), ou 'padrao'.
+    Intenções casadas só de forma aproximada ficam atrás das exatas"""
+    ocorrencias = analisar(pergunta)
+    for intencoes in (ocorrencias.intencoes_exatas('resposta'), ocorrencias.intencoes('resposta')):
+        for intencao in INTENCOES_RESPOSTA:
+            if intencao in intencoes:
+                return intencao
+    return 'padrao'
+
+def referencia_resposta(intencao):
+    """Referência da resposta da intenção: o texto só muda com os parâmetros anuais"""
+    return ('streamlit', intencao, tabela_parametros.geracao)
+
 def get_response(pergunta):
     """Base de conhecimento expandida e especializada"""
-    p = pergunta.lower()
-    
+    return texto_resposta(intencao_resposta(pergunta))
+
+def texto_resposta(intencao):
+    """Texto da resposta de uma intenção"""
     # ESTABELECIMENTOS PROIBIDOS
-    if any(word in p for word in ['proibido', 'proibidos', 'não pode', 'impossibilitado', 'vedado', 'impedido']):
+    if intencao == 'proibidos':
         return """**🚫 Estabelecimentos Proibidos de Contratar Aprendizes:**
 
 **❌ EMPRESAS DISPENSADAS DA COTA:**
@@ -324,7 +360,7 @@ def get_response(pergunta):
 **Base Legal:** Lei 10.097/2000, Art. 429; CLT Art. 403-405; Decreto 5.598/2005"""
 
     # DIREITOS DA GESTANTE
-    elif any(word in p for word in ['gestante', 'grávida', 'gravidez', 'maternidade']):
+    elif intencao == 'gestante':
         return """**🤰 Direitos da Aprendiz Gestante:**
 
 1. **Estabilidade Provisória:** Desde confirmação da gravidez até 5 meses após o parto
@@ -340,7 +376,7 @@ def get_response(pergunta):
 **Base Legal:** CLT Art. 391-A, 392, 396; Lei 11.788/2008; CF Art. 7º, XVIII"""
 
     # CÁLCULO DE COTAS
-    elif any(word in p for word in ['cota', 'quantos', 'cálculo', 'percentual', 'proporção']):
+    elif intencao == 'cotas':
         return """**📊 Cálculo de Cota de Aprendizes:**
 
 **📋 REGRA GERAL:**
@@ -365,11 +401,11 @@ def get_response(pergunta):
 **Base Legal:** Lei 10.097/2000, Art. 429; Decreto 5.598/2005, Art. 11"""
 
     # PENALIDADES E MULTAS
-    elif any(word in p for word in ['multa', 'penalidade', 'fiscalização', 'autuação', 'infração']):
-        return """**⚖️ Penalidades por Descumprimento:**
+    elif intencao == 'penalidades':
+        return renderizar("""**⚖️ Penalidades por Descumprimento:**
 
-**💰 VALORES DAS MULTAS (2024):**
-- **Por aprendiz não contratado:** R$ 402,53 a R$ 4.025,33
+**💰 VALORES DAS MULTAS ({ano_multas}):**
+- **Por aprendiz não contratado:** R$ {multa_minima} a R$ {multa_maxima}
 - **Reincidência:** Valor dobrado
 - **Má-fé ou resistência:** Agravantes adicionais
 
@@ -385,10 +421,10 @@ def get_response(pergunta):
 - **Restrições** para financiamentos públicos
 - **Execução fiscal** em caso de não pagamento
 
-**Base Legal:** CLT Art. 434; Lei 6.514/77; Portaria MTE 723/2012"""
+**Base Legal:** CLT Art. 434; Lei 6.514/77; Portaria MTE 723/2012""")
 
     # CONAP E PROGRAMAS
-    elif any(word in p for word in ['conap', 'programa', 'senai', 'senac', 'senat', 'senar', 'sescoop', 'sistema s']):
+    elif intencao == 'conap':
         return """**📋 CONAP - Catálogo Nacional de Programas:**
 
 **🏫 SISTEMA S - INSTITUIÇÕES FORMADORAS:**
@@ -417,7 +453,7 @@ def get_response(pergunta):
 **Base Legal:** Portaria MTE 723/2012; CONAP 2021"""
 
     # CONTRATOS E FORMALIZAÇÃO
-    elif any(word in p for word in ['contrato', 'formalizar', 'ctps', 'registro', 'documentação']):
+    elif intencao == 'contratos':
         return """**📝 Contrato de Aprendizagem:**
 
 **📋 DOCUMENTOS OBRIGATÓRIOS:**
@@ -444,7 +480,7 @@ def get_response(pergunta):
 **Base Legal:** CLT Art. 428-433; Lei 10.097/2000; Decreto 5.598/2005"""
 
     # PESSOAS COM DEFICIÊNCIA
-    elif any(word in p for word in ['deficiência', 'deficiente', 'pcd', 'inclusão', 'acessibilidade']):
+    elif intencao == 'pcd':
         return """**♿ Aprendizagem para Pessoas com Deficiência:**
 
 **🎯 REGRAS ESPECIAIS:**
@@ -472,7 +508,7 @@ def get_response(pergunta):
 **Base Legal:** Lei 13.146/2015 (LBI); Decreto 5.598/2005; Lei 8.213/91"""
 
     # JORNADA E HORÁRIOS  
-    elif any(word in p for word in ['jornada', 'horário', 'horas', 'trabalho', 'período']):
+    elif intencao == 'jornada':
         return """**⏰ Jornada de Trabalho do Aprendiz:**
 
 **📚 APRENDIZ ESTUDANTE:**
@@ -499,7 +535,7 @@ def get_response(pergunta):
 **Base Legal:** CLT Art. 432; CF Art. 7º, XIII; Decreto 5.598/2005"""
 
     # RESCISÃO E TÉRMINO
-    elif any(word in p for word in ['rescisão', 'demissão', 'término', 'fim', 'acabar']):
+    elif intencao == 'rescisao':
         return """**🔚 Rescisão do Contrato de Aprendizagem:**
 
 **✅ SITUAÇÕES PERMITIDAS:**
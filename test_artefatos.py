@@ -0,0 +1,86 @@
+"""
+Testes dos artefatos pré-compilados (artefatos.py)
+"""
+import os
+
+import pytest
+
+import artefatos
+from artefatos import caminho_artefato, carregar_artefato, gravar_artefato, ler_cabecalho
+
+
+@pytest.fixture
+def fontes(tmp_path, monkeypatch):
+    """Artefato 'teste' dependente de um módulo e de um arquivo de dados temporários"""
+    modulo = tmp_path / "modulo.py"
+    modulo.write_text("VALOR = 1\n", encoding='utf-8')
+    dados = tmp_path / "dados.json"
+    dados.write_text("{}", encoding='utf-8')
+    monkeypatch.setitem(artefatos.FONTES, 'teste', [modulo, dados])
+    return modulo, dados
+
+
+def test_grava_e_carrega(tmp_path, fontes):
+    objeto = {'termos': ['cota', 'aprendiz'], 'total': 2}
+    caminho = gravar_artefato('teste', objeto, versao="v1", diretorio=tmp_path)
+    assert caminho == caminho_artefato('teste', tmp_path)
+    assert ler_cabecalho(caminho)['versao_dados'] == "v1"
+    assert carregar_artefato('teste', diretorio=tmp_path) == objeto
+
+
+def test_ausente(tmp_path, fontes):
+    assert carregar_artefato('teste', diretorio=tmp_path) is None
+
+
+def test_codigo_alterado_invalida(tmp_path, fontes):
+    modulo, _ = fontes
+    gravar_artefato('teste', [1, 2, 3], diretorio=tmp_path)
+    modulo.write_text("VALOR = 2\n", encoding='utf-8')
+    assert carregar_artefato('teste', diretorio=tmp_path) is None
+
+
+def test_dados_alterados_invalidam(tmp_path, fontes):
+    _, dados = fontes
+    gravar_artefato('teste', [1, 2, 3], diretorio=tmp_path)
+    estado = dados.stat()
+    os.utime(dados, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1_000_000_000))
+    assert carregar_artefato('teste', diretorio=tmp_path) is None
+
+
+def test_formato_diferente_invalida(tmp_path, fontes, monkeypatch):
+    gravar_artefato('teste', [1, 2, 3], diretorio=tmp_path)
+    monkeypatch.setattr(artefatos, "FORMATO_ARTEFATOS", artefatos.FORMATO_ARTEFATOS + 1)
+    assert carregar_artefato('teste', diretorio=tmp_path) is None
+
+
+def test_arquivo_corrompido(tmp_path, fontes):
+    caminho = gravar_artefato('teste', list(range(100)), diretorio=tmp_path)
+    conteudo = caminho.read_bytes()
+    caminho.write_bytes(conteudo[:len(conteudo) // 2])
+    assert carregar_artefato('teste', diretorio=tmp_path) is None
+    caminho.write_bytes(b"nao e json\n")
+    assert carregar_artefato('teste', diretorio=tmp_path) is None
+
+
+def test_fontes_incluem_importacoes_transitivas():
+    fontes = artefatos.expandir_fontes(artefatos.FONTES['banco'])
+    nomes = {fonte.name for fonte in fontes}
+    # Importados direta ou indiretamente por banco_conhecimento.py
+    assert {'intencoes.py', 'cache_consultas.py', 'base_sqlite.py', 'recarga.py', 'parametros.py'} <= nomes
+    assert len(fontes) == len(set(fontes))
+
+
+def test_modulo_importado_alterado_invalida(tmp_path, monkeypatch):
+    monkeypatch.setattr(artefatos, "RAIZ", tmp_path)
+    (tmp_path / "entrada.py").write_text("import os\nfrom apoio import X\n", encoding='utf-8')
+    (tmp_path / "apoio.py").write_text("try:\n    import extra\nexcept ImportError:\n    pass\nX = 1\n", encoding='utf-8')
+    (tmp_path / "extra.py").write_text("Y = 1\n", encoding='utf-8')
+    monkeypatch.setitem(artefatos.FONTES, 'teste', [tmp_path / "entrada.py"])
+
+    assert [fonte.name for fonte in artefatos.expandir_fontes(artefatos.FONTES['teste'])] == [
+        'entrada.py', 'apoio.py', 'extra.py'
+    ]
+    gravar_artefato('teste', "objeto", diretorio=tmp_path)
+    assert carregar_artefato('teste', diretorio=tmp_path) == "objeto"
+    (tmp_path / "extra.py").write_text("Y = 2\n", encoding='utf-8')
+    assert carregar_artefato('teste', diretorio=tmp_path) is None
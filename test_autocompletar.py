@@ -0,0 +1,50 @@
+"""
+Testes do autocompletar por árvore de prefixos (autocompletar.py)
+"""
+from autocompletar import ArvorePrefixos, ServicoAutocompletar
+from banco_conhecimento import banco_conhecimento
+
+
+def sugestao(texto, *formas):
+    return {'texto': texto, 'tipo': 'topico', 'destino': texto, 'formas': [texto, *formas]}
+
+
+def test_prefixo_de_qualquer_palavra():
+    arvore = ArvorePrefixos([
+        sugestao("Cálculo da cota"), sugestao("Portaria MTE nº 3.872/2023", "portaria 3872 2023"), sugestao("Cotas e exclusões"),
+    ])
+    assert arvore.buscar("cota") == {0, 2}
+    assert arvore.buscar("calculo da") == {0}
+    assert arvore.buscar("3872") == {1}
+    # Só inícios de palavra, e stopwords não iniciam sugestões
+    assert arvore.buscar("alculo") == set()
+    assert arvore.buscar("da cota") == set()
+    assert arvore.buscar("nada") == set()
+
+
+def test_sugestoes_do_snapshot_atual():
+    servico = ServicoAutocompletar()
+    assert servico.sugerir("a") == []
+    assert [item['destino'] for item in servico.sugerir("Portaria 3.872/2023")] == ['portaria_3872_2023']
+    assert servico.sugerir("sold")[0]['tipo'] == 'conap'
+    # Uma sugestão por destino, sem as formas internas
+    sugestoes = servico.sugerir("cota")
+    assert len({item['destino'] for item in sugestoes}) == len(sugestoes)
+    assert all('formas' not in item for item in sugestoes)
+
+
+def test_escolhas_sobem_na_ordem():
+    servico = ServicoAutocompletar()
+    primeira, segunda = servico.sugerir("cota")[:2]
+    servico.registrar_escolha(segunda)
+    assert servico.sugerir("cota")[:2] == [segunda, primeira]
+
+
+def test_sugestao_ja_roteada():
+    servico = ServicoAutocompletar()
+    topico, = servico.sugerir("gest")
+    assert servico.responder(topico) == banco_conhecimento.obter_resposta('aprendiz_gestante')
+    assert servico.referencia(topico) == banco_conhecimento.referencia_topico('aprendiz_gestante')
+    programa = servico.sugerir("sold")[0]
+    assert f"**Número CONAP:** {programa['destino']}" in servico.responder(programa)
+    assert servico.popularidade[topico['texto']] == 1
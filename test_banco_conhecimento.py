@@ -0,0 +1,82 @@
+"""
+Testes do registro de respostas sob demanda (banco_conhecimento.py)
+"""
+import pytest
+
+from banco_conhecimento import TAMANHO_CACHE_RESPOSTAS, TAMANHO_MINIMO_PASSAGENS, BancoConhecimentoAprendizagem
+
+
+@pytest.fixture
+def banco(monkeypatch):
+    """Base embutida que anota cada resposta carregada"""
+    banco = BancoConhecimentoAprendizagem()
+    banco.carregados = []
+    original = BancoConhecimentoAprendizagem._carregar_modelo
+    monkeypatch.setattr(
+        BancoConhecimentoAprendizagem, "_carregar_modelo",
+        lambda self, topico: self.carregados.append(topico) or original(self, topico)
+    )
+    return banco
+
+
+def test_registro_guarda_so_metadados(banco):
+    dados = banco.conhecimento['calculo_cota']
+    assert dados['resposta'] == '_resposta_calculo_cota'
+    assert dados['pergunta_padrao'] and dados['keywords']
+    assert banco._indice_bm25 is None and banco._passagens is None
+
+
+def test_resposta_carregada_no_primeiro_acesso(banco):
+    texto = banco.obter_resposta('calculo_cota')
+    assert banco.obter_resposta('calculo_cota') is texto
+    assert banco.carregados == ['calculo_cota']
+    assert "Cálculo da Cota" in texto
+
+
+def test_cache_de_respostas_limitado(banco):
+    topicos = list(banco.conhecimento)[:TAMANHO_CACHE_RESPOSTAS + 1]
+    for topico in topicos:
+        banco.obter_resposta(topico)
+    assert banco.obter_resposta.cache_info().currsize == TAMANHO_CACHE_RESPOSTAS
+    # O mais antigo saiu do cache e é carregado de novo
+    banco.obter_resposta(topicos[0])
+    assert banco.carregados == topicos + [topicos[0]]
+
+
+def test_indice_ranqueado_montado_na_primeira_busca(banco):
+    banco.buscar_topico("cota de aprendizes")
+    assert banco._indice_bm25 is None
+    banco.buscar_ranqueado("contrato de trabalho")
+    assert banco._indice_bm25 is not None
+    assert set(banco.carregados) == set(banco.conhecimento)
+
+
+def titulos(banco, topico, numeros):
+    passagens, _ = banco.passagens
+    return [passagens[topico][numero]['titulo'] for numero in numeros]
+
+
+@pytest.mark.parametrize("topico, consulta, esperados", [
+    ('calculo_cota', "como é feito o arredondamento da cota", ['REGRA DE ARREDONDAMENTO']),
+    ('rescisao_antecipada', "recebe FGTS na rescisão antecipada", ['RESCISÕES VEDADAS', 'VERBAS RESCISÓRIAS']),
+])
+def test_selecionar_passagens_relevantes(banco, topico, consulta, esperados):
+    selecionadas = titulos(banco, topico, banco.selecionar_passagens(topico, consulta))
+    assert len(selecionadas) == len(esperados)
+    assert all(esperado in titulo for titulo, esperado in zip(selecionadas, esperados))
+
+
+def test_passagens_com_cabecalho_e_fontes(banco):
+    completa = banco.obter_resposta('calculo_cota')
+    reduzida = banco.buscar_resposta("arredondamento da cota de aprendizes", modo='passagens')
+    assert len(reduzida) < len(completa)
+    assert "REGRA DE ARREDONDAMENTO" in reduzida and "EXEMPLO PRÁTICO" not in reduzida
+    assert "**📋 CONSULTA:**" in reduzida and "**🔗 FONTES OFICIAIS CONSULTADAS:**" in reduzida
+    assert reduzida.endswith('Peça a "resposta completa" para ver todas as seções.*')
+    assert banco.buscar_referencia("arredondamento da cota de aprendizes", 'passagens')[3] is not None
+
+
+def test_resposta_curta_vai_completa(banco):
+    curta = next(topico for topico in banco.conhecimento if len(banco.obter_resposta(topico)) < TAMANHO_MINIMO_PASSAGENS)
+    assert banco.selecionar_passagens(curta, banco.conhecimento[curta]['pergunta_padrao']) is None
+    assert banco.montar_passagens(curta, "qualquer consulta") == banco.obter_resposta(curta)
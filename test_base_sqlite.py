@@ -0,0 +1,108 @@
+"""
+Testes da base SQLite compartilhada (base_sqlite.py)
+"""
+import sqlite3
+import threading
+
+import pytest
+
+import base_sqlite
+from base_sqlite import PoolLeitura, gerar_base_sqlite, montar_consulta_fts
+
+
+@pytest.fixture(scope="module")
+def base(tmp_path_factory):
+    """Arquivo gerado a partir dos dados embutidos, servido por um pool próprio"""
+    caminho = gerar_base_sqlite(tmp_path_factory.mktemp("base") / "lexaprendiz.db")
+    pool = PoolLeitura(caminho, tamanho=2)
+    yield caminho, pool
+    pool.fechar()
+
+
+def test_consulta_fts_usa_radicais_como_prefixo():
+    assert montar_consulta_fts("Férias dos aprendizes") == '"feria"* OR "aprendiz"*'
+    assert montar_consulta_fts("") == ""
+
+
+def test_base_gerada_tem_topicos_e_programas(base):
+    from banco_conhecimento import banco_conhecimento
+    from conap_database import conap_db
+
+    _, pool = base
+    topicos = {linha[0] for linha in pool.consultar("SELECT topico FROM topicos")}
+    assert topicos == set(banco_conhecimento.conhecimento)
+    (programas,), = pool.consultar("SELECT COUNT(*) FROM programas")
+    assert programas == len(conap_db.catalogo)
+    # Somente leitura
+    with pytest.raises(sqlite3.OperationalError):
+        pool.consultar("DELETE FROM topicos")
+
+
+def test_busca_fts_encontra_o_programa(base, monkeypatch):
+    _, pool = base
+    monkeypatch.setattr(base_sqlite, "pool_leitura", pool)
+    programas = base_sqlite.buscar_programas_fts("eletricista")
+    assert programas and all('numero' in programa for programa, _ in programas)
+
+
+def test_base_de_outras_fontes_e_ignorada(base, monkeypatch, tmp_path):
+    caminho, _ = base
+    assert PoolLeitura(caminho).disponivel()
+    # Resposta editada no código depois de gerar a base
+    editado = tmp_path / "banco_editado.py"
+    editado.write_text("RESPOSTA = 'nova'\n")
+    monkeypatch.setattr(base_sqlite, "FONTES_BASE", base_sqlite.FONTES_BASE + [editado])
+    pool = PoolLeitura(caminho)
+    monkeypatch.setattr(base_sqlite, "pool_leitura", pool)
+    assert not pool.disponivel()
+    assert base_sqlite.obter_resposta_armazenada('calculo_cota') is None
+    pool.fechar()
+
+
+def test_pool_nao_passa_do_tamanho(base):
+    caminho, _ = base
+    pool = PoolLeitura(caminho, tamanho=2)
+    emprestadas = []
+    liberar = threading.Event()
+
+    def usar():
+        with pool.conexao() as conn:
+            emprestadas.append(conn)
+            liberar.wait(5)
+
+    threads = [threading.Thread(target=usar) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    liberar.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert pool.criadas <= 2
+    assert len({id(conn) for conn in emprestadas}) <= 2
+    pool.fechar()
+
+
+def test_falha_ao_abrir_nao_consome_vaga(tmp_path):
+    pool = PoolLeitura(tmp_path / "ausente.db", tamanho=1)
+    for _ in range(3):
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.conexao():
+                pass
+    assert pool.criadas == 0
+
+
+def test_fechar_com_conexao_emprestada(base):
+    caminho, _ = base
+    pool = PoolLeitura(caminho, tamanho=1)
+    with pool.conexao() as antiga:
+        pool.fechar()
+        assert pool.criadas == 1
+    # Devolvida depois do fechar: é fechada, e a vaga volta ao pool
+    assert pool.criadas == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        antiga.execute("SELECT 1")
+    with pool.conexao() as nova:
+        assert nova is not antiga
+        assert nova.execute("SELECT 1").fetchone() == (1,)
+    assert pool.criadas == 1
+    pool.fechar()
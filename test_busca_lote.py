@@ -0,0 +1,50 @@
+"""
+Testes da busca em lote (busca_lote.py): mesmo resultado da busca individual
+"""
+import pytest
+
+pytest.importorskip("numpy")
+
+import busca_lote
+from banco_conhecimento import LIMIAR_CONFIANCA, banco_conhecimento
+from benchmark.executar import carregar_perguntas
+
+CONSULTAS_EXTRAS = [
+    "", "xyz abc", "cota cota multa", "quantas horas", "aprendiz contratado",
+    "salario minimo", "gestante", "estabilidade da gravidez", "fgts do aprendiz",
+]
+
+
+def test_lote_igual_a_busca_individual():
+    consultas = [item['pergunta'] for item in carregar_perguntas()['perguntas']] + CONSULTAS_EXTRAS
+    lote = banco_conhecimento.buscar_respostas(consultas)
+    assert lote == [banco_conhecimento.buscar_topico(consulta) for consulta in consultas]
+
+
+def test_lote_em_varios_blocos(monkeypatch):
+    monkeypatch.setattr(busca_lote, "TAMANHO_BLOCO", 3)
+    consultas = CONSULTAS_EXTRAS * 2
+    avaliador = busca_lote.AvaliadorLote(
+        banco_conhecimento.indice, banco_conhecimento.indice_bm25, banco_conhecimento.casador
+    )
+    resultados = avaliador.avaliar(consultas, limiar=LIMIAR_CONFIANCA)
+    assert resultados == [banco_conhecimento.buscar_topico(consulta) for consulta in consultas]
+
+
+def test_lote_vazio():
+    assert banco_conhecimento.buscar_respostas([]) == []
+
+
+def test_consultas_repetidas_avaliadas_uma_vez(monkeypatch):
+    avaliador = busca_lote.AvaliadorLote(
+        banco_conhecimento.indice, banco_conhecimento.indice_bm25, banco_conhecimento.casador
+    )
+    analisadas = []
+    original = avaliador.casador.encontrar_termos_lote
+    monkeypatch.setattr(
+        avaliador.casador, "encontrar_termos_lote", lambda textos: analisadas.extend(textos) or original(textos)
+    )
+    consultas = ["cota de aprendizes", "COTA de  aprendizes", "salario minimo", "cota de aprendizes"]
+    resultados = avaliador.avaliar(consultas, limiar=LIMIAR_CONFIANCA)
+    assert analisadas == ["cota de aprendizes", "salario minimo"]
+    assert resultados == [banco_conhecimento.buscar_topico(consulta) for consulta in consultas]
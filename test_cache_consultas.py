@@ -0,0 +1,65 @@
+"""
+Testes do cache de consultas (cache_consultas.py)
+"""
+import time
+
+from cache_consultas import CacheLRU, memorizar
+
+
+def test_lru_descarta_o_menos_usado():
+    cache = CacheLRU("teste", tamanho_maximo=2)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    assert cache.obter('a') == 1  # 'a' passa a ser o mais recente
+    cache.guardar('c', 3)
+
+    assert cache.obter('b', 'ausente') == 'ausente'
+    assert cache.obter('a') == 1
+    assert cache.obter('c') == 3
+    estatisticas = cache.estatisticas()
+    assert estatisticas['evictions'] == 1
+    assert estatisticas['tamanho'] == 2
+    assert (estatisticas['hits'], estatisticas['misses']) == (3, 1)
+
+
+def test_ttl_expira_itens(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: agora[0])
+    cache = CacheLRU("teste", ttl=10)
+    cache.guardar('a', 1)
+    agora[0] += 5
+    assert cache.obter('a') == 1
+    agora[0] += 6
+    assert cache.obter('a', None) is None
+    assert cache.estatisticas()['expirados'] == 1
+
+
+def test_memorizar_guarda_resultado_vazio():
+    chamadas = []
+
+    @memorizar(CacheLRU("teste"))
+    def buscar(consulta):
+        chamadas.append(consulta)
+        return None
+
+    assert buscar("Pergunta SEM resposta") is None
+    # Mesma chave normalizada: servida pelo cache negativo, sem refazer a busca
+    assert buscar("  pergunta sem   resposta ") is None
+    assert chamadas == ["Pergunta SEM resposta"]
+
+
+def test_memorizar_separa_geracoes_e_argumentos():
+    geracao = [1]
+    chamadas = []
+
+    @memorizar(CacheLRU("teste"), geracao=lambda: geracao[0])
+    def buscar(consulta, modo='completa'):
+        chamadas.append((consulta, modo, geracao[0]))
+        return f"{consulta}:{modo}:{geracao[0]}"
+
+    assert buscar("cota") == "cota:completa:1"
+    assert buscar("cota", modo='passagens') == "cota:passagens:1"
+    assert buscar("cota") == "cota:completa:1"
+    geracao[0] = 2
+    assert buscar("cota") == "cota:completa:2"
+    assert len(chamadas) == 3
@@ -0,0 +1,59 @@
+"""
+Testes do catálogo CONAP em colunas (catalogo_conap.py)
+"""
+import hashlib
+
+from benchmark.sintetico import gerar_conap
+from catalogo_conap import CatalogoCompacto, DescricoesComprimidas
+from conap_database import CONAPDatabase
+from recarga import impressao
+
+
+def programa(numero, **campos):
+    return dict({
+        "numero": numero, "nome": f"Programa {numero}", "cbo": ["4110-10"], "descricao": "Apoio administrativo",
+        "carga_horaria": "800 horas", "escolas_sistema_s": ["SENAC"],
+    }, **campos)
+
+
+def test_ida_e_volta_sintetico():
+    programas = gerar_conap(3000, semente=2)['programas']
+    assert CatalogoCompacto(programas).programas_por_area() == programas
+
+
+def test_ida_e_volta_catalogo_embutido():
+    # As impressões são calculadas sobre os dicionários originais do código
+    db = CONAPDatabase()
+    impressoes = {
+        programa["numero"]: hashlib.blake2b(
+            impressao([area_key, area_data["nome"], programa]).encode('utf-8'), digest_size=8
+        ).digest()
+        for area_key, area_data in db.programas.items()
+        for programa in area_data["programas"]
+    }
+    assert impressoes == db.impressoes
+
+
+def test_campos_opcionais_e_extras():
+    programas = {
+        "administracao": {"nome": "Administração e Comércio", "programas": [
+            programa("1", faixa_etaria="16 a 24 anos", duracao="até 10 meses", arco="Administração 1"),
+            programa("2", requisitos="Categoria D há 01 ano"),
+            programa("3", cbo=[], escolas_sistema_s=[], carga_horaria="a combinar"),
+        ]},
+        "vazia": {"nome": "Área sem programas", "programas": []},
+    }
+    catalogo = CatalogoCompacto(programas)
+    assert catalogo.programas_por_area() == programas
+    assert "faixa_etaria" not in catalogo.programa(1)
+    # Sem faixa, valem os limites legais; sem número, a carga fica fora dos filtros
+    assert (catalogo.idade_minima[1], catalogo.idade_maxima[1]) == (14, 24)
+    assert catalogo.horas[2] == 0
+    assert list(catalogo.meses) == [10, 0, 0]
+
+
+def test_descricoes_comprimidas():
+    descricoes = [f"Executa atividades de apoio {numero % 7} em normas de segurança" for numero in range(50)]
+    comprimidas = DescricoesComprimidas(descricoes)
+    assert [comprimidas[posicao] for posicao in range(len(descricoes))] == descricoes
+    assert len(comprimidas.inicios) == 8
@@ -0,0 +1,186 @@
+"""
+Testes da consulta facetada do CONAP (indice_conap.py e conap_database.py)
+"""
+import random
+from array import array
+
+import pytest
+
+import base_sqlite
+from benchmark.sintetico import gerar_conap
+from conap_database import CONAPDatabase, conap_db, consultar_combinado, consultar_conap, nome_cobre_termos
+from indice_conap import duracao_meses, faixa_etaria_numerica, intersecao, quantidade_horas
+from ingestao_conap import PDF_CONAP, ingerir_pdf
+
+
+def test_intersecao_igual_a_conjuntos():
+    aleatorio = random.Random(0)
+    for _ in range(200):
+        listas = [
+            array('I', sorted(aleatorio.sample(range(500), aleatorio.randint(0, 200))))
+            for _ in range(aleatorio.randint(1, 4))
+        ]
+        esperado = sorted(set.intersection(*map(set, listas)))
+        assert list(intersecao(listas)) == esperado
+
+
+@pytest.fixture(scope="module")
+def db():
+    return CONAPDatabase(gerar_conap(3000, semente=3))
+
+
+def consultar_por_varredura(db, area=None, escola=None, idade=None, horas=None, duracao=None):
+    """Filtro direto sobre os programas remontados"""
+    posicoes = []
+    for posicao in range(len(db.catalogo)):
+        programa = db.catalogo.programa(posicao)
+        if area is not None and db.catalogo.areas[db.catalogo.area[posicao]][0] != area:
+            continue
+        if escola is not None and escola.upper() not in programa["escolas_sistema_s"]:
+            continue
+        if idade is not None:
+            minimo, maximo = faixa_etaria_numerica(programa["faixa_etaria"])
+            if not minimo <= idade <= maximo:
+                continue
+        if horas is not None:
+            carga = quantidade_horas(programa["carga_horaria"])
+            if carga is None or carga < (horas[0] or 0) or (horas[1] is not None and carga > horas[1]):
+                continue
+        if duracao is not None:
+            meses = duracao_meses(programa.get("duracao", ""))
+            if meses is None or meses < (duracao[0] or 0) or (duracao[1] is not None and meses > duracao[1]):
+                continue
+        posicoes.append(posicao)
+    return posicoes
+
+
+FILTROS = [
+    {},
+    {'area': 'area_03'},
+    {'escola': 'senai'},
+    {'idade': 15},
+    {'horas': (800, 1000)},
+    {'horas': (None, 400)},
+    {'horas': (1500, None)},
+    {'area': 'area_07', 'escola': 'senac', 'idade': 17},
+    {'area': 'area_01', 'horas': (600, 600)},
+    {'escola': 'sescoop', 'idade': 16, 'horas': (None, 800)},
+    {'area': 'area_02', 'escola': 'senar', 'idade': 18, 'horas': (1200, None)},
+    {'area': 'inexistente'},
+    {'duracao': (12, 18)},
+    {'duracao': (None, 6)},
+    {'escola': 'senai', 'duracao': (15, None)},
+    {'area': 'area_04', 'horas': (800, None), 'duracao': (None, 12)},
+]
+
+
+@pytest.mark.parametrize("filtros", FILTROS)
+def test_consultar_igual_a_varredura(db, filtros):
+    assert list(db.indice.consultar(**filtros)) == consultar_por_varredura(db, **filtros)
+
+
+def test_paginacao_com_cursor(db):
+    filtros = {'escola': 'senai', 'idade': 17}
+    completo = db.consultar_programas(**filtros, limite=len(db.catalogo))
+    paginas, cursor = [], None
+    while True:
+        pagina = db.consultar_programas(**filtros, cursor=cursor, limite=7)
+        assert pagina["total"] == completo["total"]
+        paginas.extend(pagina["programas"])
+        cursor = pagina["cursor"]
+        if cursor is None:
+            break
+    assert paginas == completo["programas"]
+    assert completo["cursor"] is None
+
+
+def test_filtro_de_duracao_no_catalogo_embutido():
+    db = CONAPDatabase()
+    resultado = db.consultar_programas(duracao=(15, 24), limite=20)
+    numeros = [programa.split("**Número CONAP:** ")[1].split("\n")[0] for programa in resultado["programas"]]
+    assert numeros == ["101", "102", "202", "302", "602"]
+
+
+def test_facetas(db):
+    resultado = db.consultar_programas(escola='senat')
+    assert sum(resultado["facetas"]["area"].values()) == resultado["total"]
+    assert resultado["facetas"]["escola"]["SENAT"] == resultado["total"]
+
+
+def test_relaxamento_informa_os_filtros_retirados():
+    db = CONAPDatabase()
+    # Saúde só tem programas do SENAC, até 24 anos: sem resultado até retirar idade e escola
+    resposta = consultar_combinado(db, {'area': 'saude', 'escola': 'senai', 'idade': 30})
+    assert resposta.startswith("*Nenhum programa atende a todos os filtros; sem os filtros de idade de 30 anos e escola SENAI:*")
+    assert "**Programas de Saúde:**" in resposta
+
+
+def test_relaxamento_completa_a_resposta():
+    db = CONAPDatabase()
+    resposta = consultar_combinado(db, {'area': 'logistica', 'idade': 17})
+    assert resposta.startswith("**Programas de Logística e Transporte adequados para 17 anos:**")
+    assert "*Poucos programas atendem a todos os filtros; sem o filtro de idade de 17 anos:*" in resposta
+
+
+def test_sem_resultado_com_um_filtro():
+    db = CONAPDatabase()
+    assert consultar_combinado(db, {'idade': 40}) is None
+
+
+@pytest.fixture(scope="module")
+def catalogo_ingerido():
+    """Catálogo completo extraído do PDF no lugar do embutido durante o teste"""
+    if not PDF_CONAP.exists():
+        pytest.skip(f"{PDF_CONAP.name} ausente")
+    original = conap_db.atual
+    conap_db.trocar(CONAPDatabase(ingerir_pdf(processos=2)))
+    yield conap_db.atual
+    conap_db.trocar(original)
+
+
+@pytest.mark.parametrize("pergunta, titulo", [
+    # O catálogo completo tem programas chamados "Saúde", "Administração" e "Logística"
+    ("programas de saúde", "**Programas de Saúde:**"),
+    ("programas de administração", "**Programas de Administração e Comércio:**"),
+    ("programas de logística", "**Programas de Logística e Transporte:**"),
+    ("programas do senac de saúde para 30 anos", "*Nenhum programa atende a todos os filtros"),
+])
+def test_filtros_antes_do_nome_aproximado(catalogo_ingerido, pergunta, titulo):
+    assert consultar_conap(pergunta).startswith(titulo)
+
+
+def test_nome_aproximado_no_catalogo_ingerido(catalogo_ingerido):
+    assert "**Número CONAP:** 566" in consultar_conap("soldadr")
+
+
+def test_nome_cobre_a_maioria_dos_termos():
+    assert nome_cobre_termos("Recepcionista de Consultório Médico", ["recepcionista", "consultorio"])
+    assert nome_cobre_termos("Vendedor de comércio varejista", ["venda", "comercio", "varejista"])
+    assert not nome_cobre_termos("Auxiliar Agropecuário", ["auxiliar", "cozinha"])
+    assert not nome_cobre_termos("Cronometrista", ["previsao", "tempo"])
+
+
+@pytest.fixture
+def base_gerada(tmp_path, monkeypatch):
+    """Catálogo embutido e base SQLite gerada dele, num pool próprio"""
+    original = conap_db.atual
+    conap_db.trocar(CONAPDatabase())
+    pool = base_sqlite.PoolLeitura(base_sqlite.gerar_base_sqlite(tmp_path / "lexaprendiz.db"))
+    monkeypatch.setattr(base_sqlite, "pool_leitura", pool)
+    yield
+    pool.fechar()
+    conap_db.trocar(original)
+
+
+@pytest.mark.parametrize("pergunta, numero", [
+    ("programa de recepcionista de consultorio", "402"),
+    ("conferente de carga e descarga", "502"),
+])
+def test_busca_textual_pelo_nome(base_gerada, pergunta, numero):
+    assert f"**Número CONAP:** {numero}" in consultar_conap(pergunta)
+
+
+@pytest.mark.parametrize("pergunta", ["qual a previsão do tempo", "auxiliar de cozinha", "quanto ganha um aprendiz"])
+def test_busca_textual_sem_programa_no_nome(base_gerada, pergunta):
+    # O FTS encontra programas com uma palavra em comum na descrição
+    assert consultar_conap(pergunta) is None
@@ -0,0 +1,19 @@
+"""
+Testes das ferramentas de pesquisa jurídica (ferramentas_juridicas.py)
+"""
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("bs4")
+
+from ferramentas_juridicas import PORTARIAS_DETALHADAS, FerramentasJuridicas
+
+
+def test_portaria_detalhada_devolvida_como_copia(monkeypatch):
+    ferramentas = FerramentasJuridicas()
+    # Sem consulta ao DOU
+    monkeypatch.setattr(ferramentas, "buscar_portaria_dou", lambda numero, ano: [])
+    portaria, = ferramentas.buscar_portaria_especifica("3.872", "2023")
+    assert portaria == PORTARIAS_DETALHADAS[("3.872", "2023")]
+    portaria['titulo'] = "alterado pelo chamador"
+    assert PORTARIAS_DETALHADAS[("3.872", "2023")]['titulo'] == 'Portaria MTE nº 3.872, de 2023'
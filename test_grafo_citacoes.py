@@ -0,0 +1,78 @@
+"""
+Testes do grafo de citações (grafo_citacoes.py)
+"""
+import logging
+import sys
+
+import grafo_citacoes
+from banco_conhecimento import banco_conhecimento
+from grafo_citacoes import GrafoCitacoes, extrair_artigos, extrair_citacoes, indexar_chaves
+from main import main
+
+
+def test_extrair_artigos():
+    assert extrair_artigos("428") == ["428"]
+    assert extrair_artigos("62 e 224") == ["62", "224"]
+    assert extrair_artigos("391-a a 393") == ["391-a", "392", "393"]
+    # Faixas longas não são expandidas
+    assert extrair_artigos("1 a 400") == ["1"]
+
+
+def test_artigo_ligado_a_norma_antes_ou_depois():
+    citacoes = extrair_citacoes("Decreto 5.598/2005 - art. 10 e CLT, arts. 391-A a 393; art. 428 da CLT")
+    assert citacoes == [
+        'decreto_5598_2005', 'clt_1943', 'decreto_5598_2005:art_10',
+        'clt_1943:art_391-a', 'clt_1943:art_392', 'clt_1943:art_393', 'clt_1943:art_428',
+    ]
+    # Artigo solto, sem norma ao lado, não entra
+    assert extrair_citacoes("conforme o art. 5") == []
+
+
+def test_chave_de_legislacao_vigente():
+    conhecidas = indexar_chaves(['portaria_mtp_671_2021', 'in_sit_146_2018'])
+    assert extrair_citacoes("Portaria/MTP nº 671/2021", conhecidas) == ['portaria_mtp_671_2021']
+    # Sem ano, vale a única chave conhecida com o número
+    assert extrair_citacoes("IN 146", conhecidas) == ['in_sit_146_2018']
+    assert extrair_citacoes("IN 999") == ['in_999']
+
+
+def test_adjacencia_nos_dois_sentidos():
+    grafo = GrafoCitacoes({
+        ('banco', 'cota'): "CLT art. 429 e Decreto 5.598/2005, art. 10",
+        ('banco', 'jornada'): "CLT art. 432 e Decreto 5.598/2005",
+        ('banco', 'ferias'): "CLT art. 136",
+    }, chaves_normas=['decreto_5598_2005'])
+    assert grafo.citacoes[('banco', 'ferias')] == ('clt_1943', 'clt_1943:art_136')
+    # Sem ano, o decreto é reconhecido pela chave de legislacao_vigente
+    assert grafo.respostas_que_citam("Decreto 5.598 art. 10") == [('banco', 'cota')]
+    # Sem artigo na referência, valem todas as respostas que citam a norma
+    assert grafo.respostas_que_citam("Decreto 5.598") == [('banco', 'cota'), ('banco', 'jornada')]
+    assert grafo.respostas_que_citam("Lei 9.999/2099") == []
+    # O decreto, citado por duas respostas, pesa mais que a CLT, citada por três
+    assert grafo.respostas_relacionadas(('banco', 'cota')) == [('banco', 'jornada'), ('banco', 'ferias')]
+
+
+def test_grafo_da_base_atual():
+    citam = [resposta for resposta in grafo_citacoes.respostas_que_citam("Decreto 5.598 art. 10") if resposta[0] == 'banco']
+    assert citam == [('banco', 'calculo_cota')]
+    relacionados = grafo_citacoes.topicos_relacionados('calculo_cota')
+    assert relacionados and 'calculo_cota' not in relacionados
+    assert set(relacionados) <= set(banco_conhecimento.conhecimento)
+
+
+def test_fontes_opcionais_ausentes_no_log(monkeypatch, caplog):
+    # Módulo None em sys.modules: a importação falha com ImportError
+    monkeypatch.setitem(sys.modules, 'streamlit_app', None)
+    monkeypatch.setitem(sys.modules, 'ferramentas_juridicas', None)
+    with caplog.at_level(logging.WARNING, logger='grafo_citacoes'):
+        textos = grafo_citacoes.textos_respostas(banco_conhecimento.atual)
+    assert {fonte for fonte, _ in textos} == {'banco'}
+    assert "streamlit_app" in caplog.text
+    assert "ferramentas jurídicas" in caplog.text
+
+
+def test_comando_citacoes(capsys):
+    main(['citacoes', 'Decreto 5.598 art. 10'])
+    assert 'banco: calculo_cota' in capsys.readouterr().out.splitlines()
+    main(['citacoes', 'Lei 9.999/2099'])
+    assert capsys.readouterr().out == "Nenhuma resposta cita esta norma.\n"
@@ -0,0 +1,46 @@
+"""
+Testes do repositório de respostas compartilhado pelos históricos (historico_chat.py)
+"""
+import pytest
+
+import historico_chat
+from historico_chat import RepositorioRespostas, texto_mensagem
+
+
+@pytest.fixture
+def repositorio(monkeypatch):
+    """Repositório pequeno, fora da lista global de caches"""
+    monkeypatch.setattr(historico_chat, "CACHES", [])
+    repositorio = RepositorioRespostas(tamanho_maximo=2)
+    monkeypatch.setattr(historico_chat, "repositorio_respostas", repositorio)
+    return repositorio
+
+
+def test_mesma_referencia_compartilha_o_texto(repositorio):
+    geracoes = []
+
+    def gerar():
+        geracoes.append(1)
+        return "Resposta sobre a cota de aprendizes " * 10
+
+    primeira = historico_chat.mensagem_resposta(("calculo_cota", 1), gerar)
+    segunda = historico_chat.mensagem_resposta(("calculo_cota", 1), gerar)
+    assert len(geracoes) == 1
+    assert primeira["content"] is segunda["content"]
+    assert primeira["ref"] == ("calculo_cota", 1)
+
+
+def test_repositorio_limitado(repositorio):
+    for versao in range(5):
+        repositorio.referenciar(("topico", versao), lambda: f"texto {versao}")
+    assert len(repositorio.textos.itens) == 2
+    assert repositorio.resolver(("topico", 0)) is None
+    assert repositorio.resolver(("topico", 4)) == "texto 4"
+
+
+def test_mensagem_legivel_depois_do_descarte(repositorio):
+    mensagem = historico_chat.mensagem_resposta(("antiga", 1), lambda: "texto antigo")
+    for versao in range(3):
+        historico_chat.mensagem_resposta(("nova", versao), lambda: "texto novo")
+    assert repositorio.resolver(("antiga", 1)) is None
+    assert texto_mensagem(mensagem) == "texto antigo"
@@ -0,0 +1,104 @@
+"""
+Testes dos índices do catálogo CONAP (indice_conap.py)
+"""
+import random
+
+from benchmark.sintetico import gerar_conap
+from catalogo_conap import CatalogoCompacto
+from indice_conap import ColunaOrdenada, IndiceCatalogo, IndiceFaixas, duracao_meses, faixa_etaria_numerica
+
+
+def catalogo_sintetico(programas=2000):
+    return CatalogoCompacto(gerar_conap(programas, semente=1)['programas'])
+
+
+def test_faixa_etaria_numerica():
+    assert faixa_etaria_numerica("16 a 24 anos") == (16, 24)
+    assert faixa_etaria_numerica("a partir de 18 anos") == (18, 24)
+    assert faixa_etaria_numerica("até 21 anos") == (14, 21)
+    assert faixa_etaria_numerica("") == (14, 24)
+    # Números abaixo da idade mínima não são idades
+    assert faixa_etaria_numerica("18 anos, habilitado há 01 ano") == (18, 24)
+
+
+def test_duracao_meses():
+    assert duracao_meses("18 meses") == 18
+    assert duracao_meses("até 10 meses") == 10
+    assert duracao_meses("2 anos") == 24
+    assert duracao_meses("") is None
+
+
+def test_coluna_ordenada_igual_a_varredura():
+    aleatorio = random.Random(0)
+    valores = [aleatorio.choice([0, 6, 9, 12, 15, 18, 24]) for _ in range(300)]
+    coluna = ColunaOrdenada(valores)
+    for minimo, maximo in [(None, None), (12, 12), (None, 9), (13, None), (1, 24), (30, None), (15, 10)]:
+        esperado = [
+            posicao for posicao, valor in enumerate(valores)
+            if valor and valor >= (minimo or 0) and (maximo is None or valor <= maximo)
+        ]
+        assert list(coluna.entre(minimo, maximo)) == esperado, (minimo, maximo)
+
+
+def test_faixas_contendo_igual_a_varredura():
+    aleatorio = random.Random(0)
+    faixas = []
+    for _ in range(300):
+        minimo = aleatorio.randint(10, 30)
+        faixas.append((minimo, minimo + aleatorio.randint(0, 12)))
+    indice = IndiceFaixas(faixas)
+    for valor in range(5, 50):
+        esperado = [posicao for posicao, (minimo, maximo) in enumerate(faixas) if minimo <= valor <= maximo]
+        assert list(indice.contendo(valor)) == esperado, valor
+
+
+def test_faixas_vazias():
+    indice = IndiceFaixas([])
+    assert list(indice.contendo(18)) == []
+
+
+def test_idade_no_catalogo():
+    catalogo = catalogo_sintetico()
+    indice = IndiceCatalogo(catalogo)
+    faixas = [faixa_etaria_numerica(catalogo.programa(posicao)["faixa_etaria"]) for posicao in range(len(catalogo))]
+    for idade in (13, 14, 15, 16, 17, 18, 24, 25):
+        esperado = [posicao for posicao, (minimo, maximo) in enumerate(faixas) if minimo <= idade <= maximo]
+        assert list(indice.idade(idade)) == esperado, idade
+
+
+def test_duracao_no_catalogo():
+    catalogo = catalogo_sintetico()
+    indice = IndiceCatalogo(catalogo)
+    meses = [duracao_meses(catalogo.programa(posicao)["duracao"]) for posicao in range(len(catalogo))]
+    assert list(indice.duracao(12, 18)) == [posicao for posicao, valor in enumerate(meses) if 12 <= valor <= 18]
+    assert list(indice.duracao(maximo=6)) == [posicao for posicao, valor in enumerate(meses) if valor <= 6]
+
+
+def test_buscas_por_hash_iguais_a_varredura():
+    catalogo = catalogo_sintetico()
+    indice = IndiceCatalogo(catalogo)
+    programas = [catalogo.programa(posicao) for posicao in range(len(catalogo))]
+
+    for posicao in (0, 17, len(catalogo) - 1):
+        assert indice.numero(programas[posicao]["numero"]) == posicao
+        cbo = programas[posicao]["cbo"][0]
+        assert list(indice.cbo(cbo)) == [numero for numero, programa in enumerate(programas) if cbo in programa["cbo"]]
+    assert indice.numero("999999") is None
+    assert list(indice.escola("senar")) == [
+        posicao for posicao, programa in enumerate(programas) if "SENAR" in programa["escolas_sistema_s"]
+    ]
+    area_key, nome = catalogo.areas[5]
+    esperado = [posicao for posicao in range(len(catalogo)) if catalogo.area[posicao] == 5]
+    assert list(indice.area(area_key)) == esperado
+    assert list(indice.area(nome.upper())) == esperado
+
+
+def test_nome_em_sequencia():
+    catalogo = catalogo_sintetico()
+    indice = IndiceCatalogo(catalogo)
+    nome = catalogo.nomes[42]
+    primeiro = next(posicao for posicao, outro in enumerate(catalogo.nomes) if outro == nome)
+    assert indice.nome(nome) == primeiro
+    # Mesmas palavras fora de ordem não formam o nome
+    assert indice.nome(' '.join(reversed(nome.split()))) is None
+    assert indice.nome("palavra inexistente") is None
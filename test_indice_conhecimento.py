@@ -0,0 +1,194 @@
+"""
+Testes dos índices do banco de conhecimento (indice_conhecimento.py)
+"""
+import math
+import re
+
+import pytest
+
+from indice_conhecimento import IndiceBM25, IndiceInvertido, dividir_passagens
+
+KEYWORDS = {
+    'cota': ['cota', 'percentual de aprendizes', 'cota'],
+    'salario': ['salário', 'remuneração', 'salário mínimo'],
+    'jornada': ['jornada', 'horas por dia', 'salário'],
+}
+
+
+def varredura_linear(keywords_por_topico, consulta):
+    """Soma das keywords contidas na consulta como palavras inteiras, empate pelo primeiro tópico"""
+    texto = IndiceInvertido.normalizar(consulta)
+    melhor, maior = None, 0
+    for topico, keywords in keywords_por_topico.items():
+        score = sum(
+            1 for keyword in keywords
+            if re.search(rf'(?<!\w){re.escape(IndiceInvertido.normalizar(keyword))}(?!\w)', texto)
+        )
+        if score > maior:
+            melhor, maior = topico, score
+    return melhor, maior
+
+
+def test_termos_encontrados_sao_trechos_da_consulta():
+    indice = IndiceInvertido(KEYWORDS)
+    assert indice.termos_encontrados("Qual o SALÁRIO mínimo e a jornada?") == {'salário', 'salário mínimo', 'jornada'}
+
+
+def test_termos_so_como_palavras_inteiras():
+    indice = IndiceInvertido({'idade': ['idade'], 'cota': ['cota']})
+    assert indice.termos_encontrados("estabilidade da gestante") == set()
+    assert indice.termos_encontrados("cotação da idade?") == {'idade'}
+
+
+def test_melhor_topico_igual_a_varredura_linear():
+    indice = IndiceInvertido(KEYWORDS)
+    consultas = [
+        "qual a cota de aprendizes", "percentual de aprendizes na cota", "salário mínimo do aprendiz",
+        "quantas horas por dia", "salário e jornada", "nada a ver", "", "cotas e jornadas",
+    ]
+    for consulta in consultas:
+        assert indice.melhor_topico(consulta) == varredura_linear(KEYWORDS, consulta), consulta
+
+
+def test_empate_fica_com_o_topico_declarado_primeiro():
+    indice = IndiceInvertido(KEYWORDS)
+    # "salário" pontua 1 em salario e 1 em jornada
+    assert indice.melhor_topico("salário") == ('salario', 1)
+
+
+def test_sinonimo_perde_o_empate_para_keyword_declarada():
+    indice = IndiceInvertido({'cota': ['aft', 'fiscal do trabalho'], 'multa': ['multar']})
+    assert indice.melhor_topico("", ['aft', 'multar']) == ('cota', 1)
+    assert indice.melhor_topico("", ['aft', 'multar'], sinonimos={'aft'}) == ('multa', 1)
+    # Só desempata: o score exato continua decidindo
+    sinonimos = {'aft', 'fiscal do trabalho'}
+    assert indice.melhor_topico("", ['aft', 'fiscal do trabalho', 'multar'], sinonimos=sinonimos) == ('cota', 2)
+
+
+def test_keyword_repetida_conta_as_ocorrencias():
+    indice = IndiceInvertido(KEYWORDS)
+    assert indice.pontuar("cota") == {'cota': 2}
+
+
+def test_termos_aproximados_so_desempatam():
+    indice = IndiceInvertido(KEYWORDS)
+    # Um termo exato de jornada vence dois pontos aproximados de cota
+    assert indice.melhor_topico("", ['jornada', 'cota'], aproximados={'cota'}) == ('jornada', 1)
+    # Sem termo exato, o aproximado decide
+    assert indice.melhor_topico("", ['cota'], aproximados={'cota'}) == ('cota', 2)
+
+
+def test_atualizar_equivale_a_remontar():
+    indice = IndiceInvertido(KEYWORDS)
+    novas = dict(KEYWORDS, jornada=['jornada', 'carga horária'], ferias=['férias'])
+    del novas['cota']
+    atualizado = indice.atualizar(novas, alterados={'jornada', 'ferias'})
+    remontado = IndiceInvertido(novas)
+
+    assert atualizado.topicos == remontado.topicos
+    assert atualizado.postings == remontado.postings
+    assert atualizado.comprimentos == remontado.comprimentos
+    # O índice anterior continua intacto para quem ainda o usa
+    assert indice.melhor_topico("cota") == ('cota', 2)
+    assert atualizado.melhor_topico("cota") == (None, 0)
+
+
+DOCUMENTOS = {
+    'gestante': "Aprendiz gestante tem estabilidade provisória desde a confirmação da gravidez",
+    'ferias': "As férias do aprendiz coincidem com as férias escolares",
+    'rescisao': "Rescisão antecipada do contrato de aprendizagem por desempenho insuficiente",
+    'fgts': "O depósito do FGTS do aprendiz é de 2% da remuneração",
+}
+
+
+def bm25_direto(documentos, consulta, k1=1.5, b=0.75):
+    """Okapi BM25 calculado pela fórmula, sem índice"""
+    tokens = {topico: IndiceBM25.tokenizar(texto) for topico, texto in documentos.items()}
+    media = sum(map(len, tokens.values())) / len(tokens)
+    scores = {}
+    for termo in set(IndiceBM25.tokenizar(consulta)):
+        df = sum(termo in lista for lista in tokens.values())
+        if not df:
+            continue
+        idf = math.log((len(tokens) - df + 0.5) / (df + 0.5) + 1.0)
+        for topico, lista in tokens.items():
+            tf = lista.count(termo)
+            if tf:
+                normalizacao = k1 * (1 - b + b * len(lista) / media)
+                scores[topico] = scores.get(topico, 0.0) + idf * tf * (k1 + 1) / (tf + normalizacao)
+    return scores
+
+
+def test_bm25_igual_a_formula():
+    indice = IndiceBM25(DOCUMENTOS)
+    for consulta in ("férias escolares do aprendiz", "gravidez", "rescisão do contrato", "fgts 2%"):
+        esperado = bm25_direto(DOCUMENTOS, consulta)
+        obtido = indice.pontuar(consulta)
+        assert obtido.keys() == esperado.keys(), consulta
+        for topico, score in esperado.items():
+            assert obtido[topico] == pytest.approx(score), (consulta, topico)
+
+
+def test_bm25_busca_ordena_e_aplica_limiar():
+    indice = IndiceBM25(DOCUMENTOS)
+    ranking = indice.buscar("férias do aprendiz gestante", k=4)
+    assert [topico for topico, _ in ranking][:2] == ['ferias', 'gestante']
+    assert [score for _, score in ranking] == sorted((score for _, score in ranking), reverse=True)
+
+    assert [topico for topico, _ in indice.buscar("férias", k=1)] == ['ferias']
+    assert indice.buscar("férias", limiar=100.0) == []
+    assert indice.buscar("palavra inexistente") == []
+
+
+def test_bm25_atualizar_equivale_a_remontar():
+    indice = IndiceBM25(DOCUMENTOS)
+    novos = dict(DOCUMENTOS, ferias="Férias de trinta dias no período das férias escolares")
+    atualizado = indice.atualizar(list(novos), {'ferias': novos['ferias']})
+    remontado = IndiceBM25(novos)
+
+    assert atualizado.topicos == remontado.topicos
+    assert atualizado.postings.keys() == remontado.postings.keys()
+    for termo, postings in remontado.postings.items():
+        assert atualizado.postings[termo] == pytest.approx(postings), termo
+
+
+RESPOSTA = """⚖️ **LexAprendiz** - Cota
+
+**📋 CONSULTA:** Como calcular a cota
+
+**🔍 FUNDAMENTAÇÃO LEGAL:**
+📚 **CLT art. 429**
+
+**🎯 ETAPAS:**
+
+**🔹 1. BASE DE CÁLCULO**
+• Funções que demandam formação profissional
+
+**🔹 2. ARREDONDAMENTO**
+• Frações arredondadas para cima
+
+**🔗 FONTES OFICIAIS:**
+- CLT"""
+
+
+def test_dividir_passagens_por_titulo_de_secao():
+    passagens = dividir_passagens(RESPOSTA)
+    assert [(passagem['tipo'], passagem['titulo']) for passagem in passagens] == [
+        ('cabecalho', ''),
+        ('cabecalho', '**📋 CONSULTA:** Como calcular a cota'),
+        ('fontes', '**🔍 FUNDAMENTAÇÃO LEGAL:**'),
+        ('conteudo', '**🔹 1. BASE DE CÁLCULO**'),
+        ('conteudo', '**🔹 2. ARREDONDAMENTO**'),
+        ('fontes', '**🔗 FONTES OFICIAIS:**'),
+    ]
+    # O título sem corpo ("ETAPAS:") vai junto com a seção seguinte
+    assert passagens[3]['texto'].startswith('**🎯 ETAPAS:**\n\n**🔹 1. BASE DE CÁLCULO**')
+    # Nenhum trecho se perde
+    assert '\n\n'.join(passagem['texto'] for passagem in passagens) == RESPOSTA
+
+
+def test_dividir_passagens_sem_secoes():
+    assert dividir_passagens("Resposta curta, sem títulos") == [
+        {'titulo': '', 'texto': 'Resposta curta, sem títulos', 'tipo': 'cabecalho'}
+    ]
+    assert dividir_passagens("") == []
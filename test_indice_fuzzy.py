@@ -0,0 +1,73 @@
+"""
+Testes do índice aproximado (indice_fuzzy.py)
+"""
+from indice_fuzzy import IndiceFuzzy, distancia_limitada
+
+
+def indice(*termos):
+    return IndiceFuzzy((termo, termo) for termo in termos)
+
+
+def encontrados(resultado):
+    return {termo: distancia for termo, _, distancia in resultado}
+
+
+def test_distancia_limitada():
+    assert distancia_limitada("aprendiz", "aprendiz", 2) == 0
+    assert distancia_limitada("aprendiz", "aprendis", 2) == 1
+    assert distancia_limitada("contrato", "cnotrato", 2) == 2
+    # Acima do limite a conta é interrompida
+    assert distancia_limitada("aprendiz", "empresa", 1) == 2
+
+
+def test_sem_acento_e_plural_sao_exatos():
+    fuzzy = indice("férias", "hora extra")
+    assert encontrados(fuzzy.buscar("ferias do aprendiz")) == {"férias": 0}
+    assert encontrados(fuzzy.buscar("horas extras")) == {"hora extra": 0}
+
+
+def test_corrige_erro_de_digitacao():
+    fuzzy = indice("fiscalização", "aprendizagem")
+    assert encontrados(fuzzy.buscar("fiscalizacao da aprendizagen")) == {"fiscalização": 0, "aprendizagem": 1}
+    assert encontrados(fuzzy.buscar("fsicalização")) == {"fiscalização": 2}
+
+
+def test_termos_curtos_nao_sao_aproximados():
+    fuzzy = indice("cota")
+    assert fuzzy.buscar("conta") == []
+
+
+def test_numeros_nunca_sao_aproximados():
+    fuzzy = indice("portaria 3872")
+    assert fuzzy.buscar("portaria 3873") == []
+    assert encontrados(fuzzy.buscar("portaria 3872")) == {"portaria 3872": 0}
+
+
+def test_flexao_de_genero_casa_com_distancia_1():
+    fuzzy = indice("proibidos")
+    assert encontrados(fuzzy.buscar("atividades proibidas")) == {"proibidos": 1}
+
+
+def test_palavras_validas_nao_sao_corrigidas():
+    # Regressões: "quantas" casava como "quantos" exato e "contratado" virava "contrato"
+    fuzzy = indice("quantos", "contrato", "contratação")
+    # Flexão de gênero: só casamento fraco, que nunca passa à frente de um exato
+    assert encontrados(fuzzy.buscar("quantas horas por semana")) == {"quantos": 1}
+    assert fuzzy.buscar("aprendiz contratado com 15 anos") == []
+    assert encontrados(fuzzy.buscar("contrato de aprendizagem")) == {"contrato": 0}
+
+
+def test_mais_proximos_primeiro():
+    fuzzy = indice("aprendizagem", "aprendiz")
+    resultado = fuzzy.buscar("aprendizagen do aprendiz")
+    assert [distancia for _, _, distancia in resultado] == sorted(distancia for _, _, distancia in resultado)
+    assert resultado[0][0] == "aprendiz"
+
+
+def test_lote_igual_a_buscas_individuais():
+    fuzzy = indice("fiscalização", "aprendizagem", "hora extra", "proibidos", "aprendiz")
+    textos = [
+        "fiscalizacao da aprendizagen", "horas extras do aprendis", "atividades proibidas",
+        "fiscalizacao da aprendizagen", "", "aprendiz aprendiz",
+    ]
+    assert fuzzy.buscar_lote(textos) == [fuzzy.buscar(texto) for texto in textos]
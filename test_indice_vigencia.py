@@ -0,0 +1,55 @@
+"""
+Testes do índice de vigência das normas (indice_vigencia.py)
+"""
+import random
+from datetime import date, timedelta
+
+from indice_vigencia import IndiceVigencia, converter_data, extrair_data, registro_norma
+
+NORMAS = {
+    'decreto_5598_2005': registro_norma({
+        'rotulo': 'Decreto nº 5.598/2005', 'publicacao': '2005-12-01', 'revogacao': '2018-05-09',
+    }),
+    'decreto_9579_2018': registro_norma({
+        'rotulo': 'Decreto nº 9.579/2018', 'publicacao': '2018-11-22', 'inicio_vigencia': '2018-11-23',
+    }),
+    'portaria_723_2012': registro_norma({
+        'rotulo': 'Portaria nº 723/2012', 'publicacao': '2012-04-23', 'revogacao': '2021-11-11',
+    }),
+    'sem_data': registro_norma('Norma sem datas cadastradas'),
+}
+
+
+def vigentes_por_varredura(registros, data):
+    """Verificação direta de cada período [início, revogação)"""
+    return tuple(
+        chave for chave, registro in registros.items()
+        if registro['inicio_vigencia'] is not None
+        and converter_data(registro['inicio_vigencia']) <= data
+        and (registro['revogacao'] is None or data < converter_data(registro['revogacao']))
+    )
+
+
+def test_vigentes_igual_a_varredura():
+    indice = IndiceVigencia(NORMAS)
+    aleatorio = random.Random(0)
+    datas = [date(2000, 1, 1) + timedelta(days=aleatorio.randrange(9000)) for _ in range(500)]
+    # Fronteiras exatas: início inclusivo, revogação exclusiva
+    datas += [date(2005, 12, 1), date(2018, 5, 9), date(2018, 5, 8), date(2018, 11, 23), date(2021, 11, 11)]
+    for data in datas:
+        assert indice.vigentes(data) == vigentes_por_varredura(NORMAS, data), data
+
+
+def test_vigentes_em_lote_preserva_a_ordem():
+    indice = IndiceVigencia(NORMAS)
+    datas = ['2020-01-01', '2004-01-01', '2019-01-01']
+    assert indice.vigentes_em_lote(datas) == [indice.vigentes(data) for data in datas]
+    assert indice.vigentes('2004-01-01') == ()
+
+
+def test_extrair_data():
+    assert extrair_data("o que valia em 15/06/2010?") == date(2010, 6, 15)
+    assert extrair_data("regras de EAD em março de 2021") == date(2021, 3, 1)
+    assert extrair_data("contrato de 3 de maio de 2019") == date(2019, 5, 3)
+    assert extrair_data("31/02/2020 e depois 01/03/2020") == date(2020, 3, 1)
+    assert extrair_data("qual a cota de aprendizes") is None
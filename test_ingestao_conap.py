@@ -0,0 +1,61 @@
+"""
+Testes da ingestão do PDF do CONAP (ingestao_conap.py)
+"""
+import pytest
+
+from catalogo_conap import CatalogoCompacto
+from ingestao_conap import (
+    PDF_CONAP, carga_horaria_total, codigos_cbo, duracao_texto, faixa_etaria_celula, ingerir_pdf,
+)
+
+
+def test_codigos_cbo():
+    assert codigos_cbo("4110 -10 - Assistente Administrativo") == ["4110-10"]
+    assert codigos_cbo("7640 - família; 4110-10 e 4110 10") == ["7640", "4110-10"]
+    assert codigos_cbo("sem código") == []
+
+
+def test_carga_horaria_total():
+    assert carga_horaria_total("Mínimo 800h Máximo 1280h Teoria 400h") == "800 a 1280 horas"
+    assert carga_horaria_total("Total: 1.200 h") == "1200 horas"
+    assert carga_horaria_total("800h (Teórica: 320h)") == "800 horas"
+    assert carga_horaria_total("a  combinar") == "a combinar"
+
+
+def test_duracao_texto():
+    assert duracao_texto("Máximo de 10 meses") == "até 10 meses"
+    assert duracao_texto("800 horas") is None
+
+
+def test_faixa_etaria_celula():
+    assert faixa_etaria_celula("18 a 24anos*") == "18 a 24 anos"
+    assert faixa_etaria_celula("14 - 24 anos") == "14 a 24 anos"
+    # Exigência de habilitação na coluna da idade não é faixa etária
+    assert faixa_etaria_celula("Categoria D – habilitado há 01 ano na Categoria B") is None
+
+
+@pytest.fixture(scope="module")
+def catalogo_pdf():
+    if not PDF_CONAP.exists():
+        pytest.skip(f"{PDF_CONAP.name} ausente")
+    return ingerir_pdf(processos=2)
+
+
+def test_programas_do_pdf(catalogo_pdf):
+    programas = [programa for area in catalogo_pdf['programas'].values() for programa in area['programas']]
+    assert len(programas) == 1064
+    assert len({programa['numero'] for programa in programas}) == len(programas)
+    assert sum('faixa_etaria' in programa for programa in programas) == 1058
+    assert sum('requisitos' in programa for programa in programas) == 6
+    assert sum('duracao' in programa for programa in programas) == 6
+    # Nenhum campo com texto genérico no lugar do valor ausente
+    assert all(programa.get('faixa_etaria', 'anos').endswith('anos') for programa in programas)
+    arcos = catalogo_pdf['arcos_ocupacionais']
+    assert all(programa['arco'] in {arco['nome'] for arco in arcos.values()} for programa in programas if 'arco' in programa)
+
+
+def test_pdf_no_catalogo_compacto(catalogo_pdf):
+    catalogo = CatalogoCompacto(catalogo_pdf['programas'])
+    assert catalogo.programas_por_area() == catalogo_pdf['programas']
+    # Só os programas com duração informada entram no filtro de duração
+    assert sum(1 for meses in catalogo.meses if meses) == 6
@@ -0,0 +1,94 @@
+"""
+Testes do casador de intenções (intencoes.py)
+"""
+import random
+
+from cache_consultas import CacheLRU
+from intencoes import AutomatoAhoCorasick, CasadorIntencoes
+
+
+def test_automato_igual_a_busca_por_substring():
+    aleatorio = random.Random(0)
+    for _ in range(200):
+        padroes = {''.join(aleatorio.choices('abc', k=aleatorio.randint(1, 4))) for _ in range(8)}
+        texto = ''.join(aleatorio.choices('abc ', k=30))
+        esperado = {padrao for padrao in padroes if padrao in texto}
+        assert AutomatoAhoCorasick(padroes).encontrar(texto) == esperado, (padroes, texto)
+
+
+def test_automato_padroes_sobrepostos():
+    automato = AutomatoAhoCorasick(['he', 'she', 'his', 'hers'])
+    assert automato.encontrar('ushers') == {'she', 'he', 'hers'}
+    assert AutomatoAhoCorasick(['']).encontrar('texto') == set()
+
+
+def test_automato_so_palavras_inteiras():
+    aleatorio = random.Random(1)
+    for _ in range(200):
+        padroes = {''.join(aleatorio.choices('ab', k=aleatorio.randint(1, 3))) for _ in range(6)}
+        texto = ''.join(aleatorio.choices('ab .', k=30))
+        palavras = set(texto.replace('.', ' ').split())
+        esperado = {padrao for padrao in padroes if padrao in palavras}
+        assert AutomatoAhoCorasick(padroes, palavras_inteiras=True).encontrar(texto) == esperado, (padroes, texto)
+
+
+def test_keyword_nao_casa_dentro_de_outra_palavra():
+    intencoes = casador({'topicos': {'idade_aprendiz': ['idade'], 'gestante': ['grávida']}})
+    assert intencoes.analisar("gravida tem estabilidade").intencoes('topicos') == {'gestante'}
+    assert intencoes.analisar("idade mínima, estabilidade").termos('topicos') == ['idade']
+
+
+def casador(tabelas, sinonimos=False):
+    resultado = CasadorIntencoes(CacheLRU("teste"))
+    for grupo, tabela in tabelas.items():
+        resultado.registrar(grupo, tabela, sinonimos)
+    return resultado
+
+
+def test_analisar_agrupa_por_grupo_e_intencao():
+    intencoes = casador({
+        'conap': {'escola': ['senai', 'senac'], 'idade': ['anos', 'idade']},
+        'resposta': {'salario': ['salário', 'remuneração']},
+    })
+    ocorrencias = intencoes.analisar("Programas do SENAI para 17 anos e salário")
+
+    assert ocorrencias.intencoes('conap') == {'escola', 'idade'}
+    assert ocorrencias.termos('conap', 'escola') == ['senai']
+    assert ocorrencias.tem('resposta', 'salario')
+    assert not ocorrencias.tem('resposta', 'ferias')
+    assert ocorrencias.intencoes('inexistente') == set()
+
+
+def test_termos_na_ordem_declarada():
+    intencoes = casador({'g': {'a': ['jornada', 'cota'], 'b': ['multa']}})
+    assert intencoes.analisar("multa da cota e jornada").termos('g') == ['jornada', 'cota', 'multa']
+
+
+def test_registrar_substitui_a_tabela_do_grupo():
+    intencoes = casador({'g': {'a': ['cota']}})
+    antes = intencoes.analisar("qual a cota")
+    intencoes.registrar('g', {'b': ['multa']})
+
+    assert not intencoes.analisar("qual a cota").tem('g', 'a')
+    assert intencoes.analisar("qual a multa").tem('g', 'b')
+    # Resultados já entregues não mudam
+    assert antes.tem('g', 'a')
+
+
+
+def test_termos_aproximados_separados_dos_exatos():
+    intencoes = casador({'g': {'cota': ['quantos aprendizes'], 'jornada': ['horas por semana']}})
+    ocorrencias = intencoes.analisar("quantas aprendizes, e horas por semana?")
+
+    assert ocorrencias.intencoes('g') == {'cota', 'jornada'}
+    assert ocorrencias.intencoes_exatas('g') == {'jornada'}
+    assert ocorrencias.aproximados == {'quantos aprendizes'}
+    # Exatos primeiro, mesmo declarados depois
+    assert ocorrencias.termos('g') == ['horas por semana', 'quantos aprendizes']
+
+
+def test_termos_vindos_do_tesauro():
+    intencoes = casador({'topicos': {'calculo_cota': ['auditores fiscais'], 'penalidades': ['multar']}}, sinonimos=True)
+    ocorrencias = intencoes.analisar("o AFT pode multar?")
+    assert ocorrencias.intencoes('topicos') == {'calculo_cota', 'penalidades'}
+    assert ocorrencias.sinonimos('topicos') == {'aft'}
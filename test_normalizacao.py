@@ -0,0 +1,56 @@
+"""
+Testes da normalização compartilhada das perguntas (normalizacao.py)
+"""
+import pytest
+
+from cache_consultas import limpar_caches, normalizar_chave
+from normalizacao import (
+    ConsultaNormalizada, dobrar_acentos, extrair_termos, limpar_cache_normalizacao, normalizar, radical,
+    radical_flexao, radical_genero,
+)
+
+
+@pytest.mark.parametrize("texto", ["Portaria MTE nº 3.872/2023", "portaria mte 3872 2023", "PORTARIA MTE N 3872/2023"])
+def test_numeros_de_normas_canonicos(texto):
+    consulta = normalizar(texto)
+    assert consulta.dobrada == "portaria mte 3872 2023"
+    assert consulta.numeros == ['3872', '2023']
+
+
+def test_campos_da_consulta():
+    consulta = normalizar("Rescisões  antecipadas dos Contratos!")
+    assert consulta.original == "Rescisões  antecipadas dos Contratos!"
+    assert consulta.chave == "rescisões antecipadas dos contratos!"
+    assert consulta.dobrada == "rescisoes antecipadas dos contratos"
+    # Sem stopwords, no singular
+    assert consulta.termos == ['rescisao', 'antecipada', 'contrato']
+    assert str(consulta) == consulta.original
+
+
+def test_radicais():
+    assert dobrar_acentos("Ações Trabalhistas") == "acoes trabalhistas"
+    assert [radical(palavra) for palavra in ("contratos", "rescisoes", "funcoes", "mes", "2023")] == [
+        "contrato", "rescisao", "funcao", "mes", "2023",
+    ]
+    assert radical_genero("proibidas") == radical_genero("proibidos") == "proibid"
+    assert radical_flexao("contratado") == radical_flexao("contrato") == "contrat"
+    assert extrair_termos("Lei 10,097 dos aprendizes") == ['lei', '10097', 'aprendiz']
+
+
+def test_mesma_instancia_para_o_mesmo_texto():
+    consulta = normalizar("Qual a cota de aprendizes?")
+    assert normalizar("Qual a cota de aprendizes?") is consulta
+    # Uma consulta já normalizada passa direto
+    assert normalizar(consulta) is consulta
+    assert isinstance(consulta, ConsultaNormalizada)
+    assert normalizar_chave("Qual  a COTA de aprendizes?") == consulta.chave
+
+
+def test_limpar_cache_normalizacao():
+    consulta = normalizar("férias do aprendiz")
+    limpar_cache_normalizacao()
+    nova = normalizar("férias do aprendiz")
+    assert nova is not consulta and nova.termos == consulta.termos
+    # Também some com os demais caches do processo
+    limpar_caches()
+    assert normalizar("férias do aprendiz") is not nova
@@ -0,0 +1,64 @@
+"""
+Testes dos parâmetros anuais e dos modelos de resposta (parametros.py)
+"""
+import pytest
+
+from banco_conhecimento import BancoConhecimentoAprendizagem, banco_conhecimento
+from parametros import PARAMETROS_PADRAO, ModeloResposta, TabelaParametros, calcular_campos, tabela_parametros
+
+
+def test_horas_do_exemplo_derivadas_da_jornada():
+    campos = calcular_campos(dict(PARAMETROS_PADRAO, jornada_exemplo=4, dias_exemplo=20))
+    assert campos['horas_exemplo'] == '80'
+    # 1412 / 220 = 6,42 por hora
+    assert campos['salario_hora'] == '6,42'
+    assert campos['salario_exemplo'] == '513,60'
+    assert campos['fgts_exemplo'] == '10,27'
+
+
+def test_modelo_so_substitui_campos_conhecidos():
+    modelo = ModeloResposta("Salário {salario_minimo} em {ano_salario_minimo}; {campo_desconhecido} e {}")
+    assert modelo.campos == ('salario_minimo', 'ano_salario_minimo')
+    campos = calcular_campos(PARAMETROS_PADRAO)
+    assert modelo.renderizar(campos) == "Salário 1.412,00 em 2024; {campo_desconhecido} e {}"
+
+
+def test_modelo_remonta_so_quando_um_campo_usado_muda():
+    modelo = ModeloResposta("Multa de R$ {multa_minima}")
+    campos = calcular_campos(PARAMETROS_PADRAO)
+    primeiro = modelo.renderizar(campos)
+    # Campo que o modelo não usa: mesmo texto, sem remontar
+    assert modelo.renderizar(calcular_campos(dict(PARAMETROS_PADRAO, salario_minimo=1500.0))) is primeiro
+    assert modelo.renderizar(calcular_campos(dict(PARAMETROS_PADRAO, multa_minima=500.0))) == "Multa de R$ 500,00"
+
+
+@pytest.fixture
+def parametros_alterados():
+    """Troca a tabela de parâmetros durante o teste"""
+    original = tabela_parametros.atual
+
+    def trocar(**valores):
+        tabela_parametros.trocar(TabelaParametros({'parametros': valores}))
+    yield trocar
+    tabela_parametros.trocar(original)
+
+
+def test_montagem_nao_carrega_respostas(monkeypatch):
+    carregados = []
+    original = BancoConhecimentoAprendizagem._carregar_modelo
+    monkeypatch.setattr(
+        BancoConhecimentoAprendizagem, "_carregar_modelo",
+        lambda self, topico: carregados.append(topico) or original(self, topico)
+    )
+    BancoConhecimentoAprendizagem()
+    assert carregados == []
+
+
+def test_parametro_alterado_so_muda_os_topicos_que_o_usam(parametros_alterados):
+    anterior = banco_conhecimento.atual
+    parametros_alterados(jornada_exemplo=4)
+    novo = BancoConhecimentoAprendizagem(anterior=anterior)
+
+    assert 'salario_aprendiz' in novo.alterados
+    assert 'calculo_cota' not in novo.alterados
+    assert "4h/dia × 22 dias = 88h/mês" in novo.obter_resposta('salario_aprendiz')
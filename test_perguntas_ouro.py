@@ -0,0 +1,52 @@
+"""
+Conjunto de perguntas de referência (benchmark/perguntas_ouro.json) como teste:
+perguntas marcadas como regressão precisam acertar e a acurácia de cada alvo não pode cair
+"""
+import pytest
+
+import base_sqlite
+from benchmark.executar import ALVOS, carregar_perguntas
+
+# Acurácia medida de cada alvo (python -m benchmark); só pode subir.
+# O filtro de relevância ainda não foi medido (depende de requests e streamlit)
+ACURACIA_MINIMA = {
+    'banco': 0.78,
+    'streamlit': 0.89,
+    'conap': 0.98,
+    'autocompletar': 1.0,
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def base_compartilhada(tmp_path_factory):
+    """Sem `python base_sqlite.py`, gera a base num diretório temporário (a busca textual depende dela)"""
+    pool = base_sqlite.pool_leitura
+    caminho_original = pool.caminho
+    if not pool.disponivel():
+        pool.fechar()
+        pool.caminho = base_sqlite.gerar_base_sqlite(tmp_path_factory.mktemp("base") / "lexaprendiz.db")
+    yield
+    pool.fechar()
+    pool.caminho = caminho_original
+
+
+def preparar(nome):
+    try:
+        return ALVOS[nome]()
+    except ImportError as e:
+        pytest.skip(f"{nome} indisponível: {e}")
+
+
+@pytest.mark.parametrize("nome", list(ALVOS))
+def test_perguntas_de_referencia(nome):
+    funcao, rotular = preparar(nome)
+    perguntas = [item for item in carregar_perguntas()['perguntas'] if item['alvo'] == nome]
+    erros = [
+        (item, obtido) for item in perguntas
+        if (obtido := rotular(funcao(item['pergunta']))) != item['esperado']
+    ]
+
+    regressoes = [(item['pergunta'], item['esperado'], obtido) for item, obtido in erros if item.get('regressao')]
+    assert regressoes == []
+    if nome in ACURACIA_MINIMA:
+        assert 1 - len(erros) / len(perguntas) >= ACURACIA_MINIMA[nome]
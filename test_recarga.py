@@ -0,0 +1,80 @@
+"""
+Testes da recarga a quente (recarga.py) e do isolamento entre snapshots
+"""
+import json
+
+import pytest
+
+from banco_conhecimento import BancoConhecimentoAprendizagem, banco_conhecimento
+from cache_consultas import CacheLRU
+from intencoes import CasadorIntencoes
+from recarga import carregar_dados_conhecimento, exportar_dados, recarregar_conhecimento
+
+
+@pytest.fixture
+def dados(tmp_path):
+    """dados/ exportado a partir da base em uso; o snapshot original volta ao final"""
+    original = banco_conhecimento.atual
+    exportar_dados(tmp_path, versao="teste")
+    yield tmp_path
+    banco_conhecimento.trocar(original)
+
+
+def editar_conhecimento(diretorio, editar):
+    caminho = diretorio / "conhecimento.json"
+    conteudo = json.loads(caminho.read_text(encoding='utf-8'))
+    editar(conteudo)
+    caminho.write_text(json.dumps(conteudo, ensure_ascii=False), encoding='utf-8')
+
+
+def test_recarga_reindexa_so_o_topico_alterado(dados):
+    # Primeira recarga: respostas passam a vir dos arquivos .md, todos os tópicos mudam
+    recarregar_conhecimento(dados)
+    anterior = banco_conhecimento.atual
+    assert banco_conhecimento.buscar_topico("apoio ao menor trabalhador")[0] != 'calculo_cota'
+
+    def editar(conteudo):
+        conteudo['versao'] = "teste-2"
+        conteudo['conhecimento']['calculo_cota']['keywords'].append('apoio ao menor trabalhador')
+    editar_conhecimento(dados, editar)
+    resultado = recarregar_conhecimento(dados)
+
+    assert resultado['alterados'] == ['calculo_cota']
+    assert resultado['removidos'] == []
+    assert banco_conhecimento.atual is not anterior
+    assert banco_conhecimento.buscar_topico("apoio ao menor trabalhador")[0] == 'calculo_cota'
+    # Quem ainda segura o snapshot anterior continua com o roteamento dele
+    assert anterior.buscar_topico("apoio ao menor trabalhador")[0] != 'calculo_cota'
+    # Índice atualizado igual ao remontado do zero
+    remontado = BancoConhecimentoAprendizagem(carregar_dados_conhecimento(dados))
+    assert banco_conhecimento.indice.postings == remontado.indice.postings
+
+
+def test_montar_snapshot_nao_muda_o_roteamento_em_uso(dados):
+    consulta = "qual a cota de aprendizes"
+    esperado = banco_conhecimento.buscar_topico(consulta)
+
+    def editar(conteudo):
+        for topico, dados_topico in conteudo['conhecimento'].items():
+            dados_topico['keywords'] = ['cota'] if topico == 'penalidades' else []
+    editar_conhecimento(dados, editar)
+    sintetico = BancoConhecimentoAprendizagem(carregar_dados_conhecimento(dados))
+
+    # Só a troca do snapshot muda o roteamento
+    assert esperado[0] != 'penalidades'
+    assert sintetico.buscar_topico(consulta)[0] == 'penalidades'
+    assert banco_conhecimento.buscar_topico(consulta) == esperado
+    anterior = banco_conhecimento.trocar(sintetico)
+    assert banco_conhecimento.buscar_topico(consulta) == sintetico.buscar_topico(consulta)
+    banco_conhecimento.trocar(anterior)
+
+
+def test_casadores_independentes_com_cache_compartilhado():
+    cache = CacheLRU("teste")
+    primeiro = CasadorIntencoes(cache)
+    primeiro.registrar('topicos', {'cota': ['cota']})
+    segundo = CasadorIntencoes(cache)
+    segundo.registrar('topicos', {'multa': ['cota']})
+
+    assert primeiro.analisar("cota").intencoes('topicos') == {'cota'}
+    assert segundo.analisar("cota").intencoes('topicos') == {'multa'}
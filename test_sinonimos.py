@@ -0,0 +1,52 @@
+"""
+Testes do tesauro jurídico (sinonimos.py) e da sua expansão nos índices
+"""
+import pytest
+
+from banco_conhecimento import BancoConhecimentoAprendizagem
+from sinonimos import expandir_tabela, expandir_termos, expandir_texto, indexar_grupos
+
+
+def test_grupos_indexados_nos_dois_sentidos():
+    sinonimos = indexar_grupos([['AFT', 'auditor fiscal'], ['multa', 'sanção', 'multa']])
+    assert sinonimos == {
+        'aft': ['auditor fiscal'], 'auditor fiscal': ['aft'],
+        'multa': ['sanção'], 'sanção': ['multa'],
+    }
+
+
+def test_expandir_termos_mantem_os_originais_primeiro():
+    assert expandir_termos(['Salário', 'cota']) == ['Salário', 'cota', 'remuneração']
+    # Sinônimo já declarado não se repete
+    assert expandir_termos(['salário', 'remuneração']) == ['salário', 'remuneração']
+    assert expandir_tabela({'rescisao': ['dispensa']}) == {
+        'rescisao': ['dispensa', 'rescisão', 'demissão', 'desligamento'],
+    }
+
+
+def test_expandir_texto_so_com_palavras_inteiras():
+    assert expandir_texto("O AFT lavrou o auto").split('\n')[1].startswith('auditores fiscais auditor fiscal')
+    # "aft" dentro de "aftosa" não é o auditor
+    assert expandir_texto("Aftosa em bovinos") == "Aftosa em bovinos"
+
+
+@pytest.fixture(scope="module")
+def banco():
+    return BancoConhecimentoAprendizagem()
+
+
+@pytest.mark.parametrize("consulta, sinonimo, topico", [
+    ("qual o expediente do aprendiz", 'expediente', 'jornada_aprendiz'),
+    ("demissão do aprendiz", 'demissão', 'rescisao_antecipada'),
+    ("aula remota para aprendiz", 'aula remota', 'ead_aprendizagem'),
+])
+def test_sinonimo_roteia_para_o_topico(banco, consulta, sinonimo, topico):
+    # Só o tesauro liga o termo ao tópico
+    assert sinonimo not in banco.conhecimento[topico]['keywords']
+    assert banco.buscar_topico(consulta)[0] == topico
+
+
+def test_sinonimos_compilados_no_indice(banco):
+    # A expansão acontece na montagem: o termo já está nas postings do tópico
+    assert ('jornada_aprendiz', 1) in banco.indice.postings['expediente']
+    assert 'expediente' in banco.casador.analisar("qual o expediente do aprendiz").sinonimos('topicos')
@@ -55,6 +55,37 @@ import json
 from logo_base64 import get_uploaded_logo, LEXAPRENDIZ_LOGO_PLACEHOLDER
 from auth_system import require_authentication, show_user_info, show_admin_dashboard, is_admin
 from content_manager import get_content, init_content_settings, apply_theme_styles
+from intencoes import analisar, registrar_intencoes
+from recarga import recarregar_se_alterado
+from normalizacao import normalizar
+from autocompletar import sugerir, responder_sugestao, referencia_sugestao
+from historico_chat import mensagem_resposta, texto_mensagem
+
+# Filtro de relevância: keywords e números de normas sobre aprendizagem
+KEYWORDS_APRENDIZAGEM = [
+    'aprendiz', 'aprendizagem', 'lei 10.097', 'decreto 5.598', 'clt', 
+    'menor aprendiz', 'contrato', 'jovem aprendiz', 'cota', 'senai', 'senac',
+    'portaria', 'mte', 'ministério do trabalho', 'fiscalização', 'auditores fiscais',
+    'aft', 'fiscal do trabalho', 'inspeção', 'multa', 'penalidade',
+    'jurisprudência', 'súmula', 'orientação jurisprudencial', 'tst',
+    'programa de aprendizagem', 'entidade formadora', 'sistema s',
+    'registro', 'ctps', 'salário', 'jornada', 'férias', 'rescisão',
+    'deficiente', 'pessoa com deficiência', 'inclusão', 'acessibilidade'
+]
+
+NORMAS_APRENDIZAGEM = [
+    '10.097', '5.598', '3.872', '1199', '615', '723', '74', '422'
+]
+
+registrar_intencoes('relevancia', {
+    'keywords': KEYWORDS_APRENDIZAGEM,
+    'normas': NORMAS_APRENDIZAGEM,
+    'trabalho': ['mte', 'trabalho'],
+}, sinonimos=True)
+
+def e_sobre_aprendizagem(prompt):
+    """Filtro de relevância: a pergunta trata de aprendizagem ou legislação trabalhista?"""
+    return bool(analisar(prompt).intencoes('relevancia'))
 
 def load_agent_from_file(agent_path):
     """Carrega um agente de um arquivo"""
@@ -201,10 +232,26 @@ def main():
             # Exibe mensagens anteriores
             for message in st.session_state.messages:
                 with st.chat_message(message["role"]):
-                    st.markdown(message["content"])
+                    st.markdown(texto_mensagem(message))
+            
+            # Perguntas frequentes sugeridas enquanto o usuário digita
+            sugestao_escolhida = None
+            if selected_agent_name == "lexaprendiz":
+                trecho = st.text_input(
+                    "🔎 Perguntas frequentes",
+                    key="autocompletar",
+                    placeholder="Ex.: cota, 3.872, soldador"
+                )
+                for indice, sugestao in enumerate(sugerir(trecho)):
+                    if st.button(sugestao['texto'], key=f"sugestao_{indice}"):
+                        sugestao_escolhida = sugestao
+            
+            # Input do usuário (ou a sugestão escolhida)
+            prompt = st.chat_input("Digite sua mensagem...")
+            if sugestao_escolhida is not None:
+                prompt = sugestao_escolhida['texto']
             
-            # Input do usuário
-            if prompt := st.chat_input("Digite sua mensagem..."):
+            if prompt:
                 # Adiciona mensagem do usuário
                 st.session_state.messages.append({"role": "user", "content": prompt})
                 with st.chat_message("user"):
@@ -212,6 +259,8 @@ def main():
                 
                 # Gera resposta baseada no agente selecionado
                 with st.chat_message("assistant"):
+                    # Respostas da base entram no histórico só como referência ao texto compartilhado
+                    mensagem = None
                     if selected_agent_name == "search":
                         response = f"""🔍 **Agente de Busca** respondendo sobre: "{prompt}"
                         
@@ -227,37 +276,33 @@ Para informações mais específicas, eu utilizaria a ferramenta de busca do Goo
 
 *💡 Esta é uma demonstração. Para funcionalidade completa, a integração com Google ADK seria necessária.*"""
                     
+                    elif sugestao_escolhida is not None:
+                        # Sugestão já traz o destino: dispensa o filtro de relevância e a classificação
+                        recarregar_se_alterado()
+                        response = responder_sugestao(sugestao_escolhida)
+                        mensagem = mensagem_resposta(referencia_sugestao(sugestao_escolhida), lambda: response)
+                    
                     else:  # LexAprendiz
                         # Verifica se a pergunta é sobre aprendizagem (ampliada)
-                        keywords_aprendizagem = [
-                            'aprendiz', 'aprendizagem', 'lei 10.097', 'decreto 5.598', 'clt', 
-                            'menor aprendiz', 'contrato', 'jovem aprendiz', 'cota', 'senai', 'senac',
-                            'portaria', 'mte', 'ministério do trabalho', 'fiscalização', 'auditores fiscais',
-                            'aft', 'fiscal do trabalho', 'inspeção', 'multa', 'penalidade',
-                            'jurisprudência', 'súmula', 'orientação jurisprudencial', 'tst',
-                            'programa de aprendizagem', 'entidade formadora', 'sistema s',
-                            'registro', 'ctps', 'salário', 'jornada', 'férias', 'rescisão',
-                            'deficiente', 'pessoa com deficiência', 'inclusão', 'acessibilidade'
-                        ]
-                        
-                        # Detecta também números de normas específicas sobre aprendizagem
-                        normas_aprendizagem = [
-                            '10.097', '5.598', '3.872', '1199', '615', '723', '74', '422'
-                        ]
-                        
-                        is_about_aprendizagem = (
-                            any(keyword in prompt.lower() for keyword in keywords_aprendizagem) or
-                            any(norma in prompt for norma in normas_aprendizagem) or
-                            'mte' in prompt.lower() or
-                            'trabalho' in prompt.lower()
-                        )
+                        # Normalizada uma única vez e reaproveitada por todos os roteadores
+                        consulta = normalizar(prompt)
+                        is_about_aprendizagem = e_sobre_aprendizagem(consulta)
                         
                         if is_about_aprendizagem:
                             # Primeiro, busca no banco de conhecimento especializado
                             with st.spinner('🧠 Consultando base de conhecimento jurídico...'):
-                                resposta_especializada = banco_conhecimento.buscar_resposta(prompt)
+                                recarregar_se_alterado()
+                                # Só as seções relevantes, salvo pedido explícito da resposta completa
+                                modo = 'completa' if 'resposta completa' in consulta.chave else 'passagens'
+                                # Perguntas com data ("em março de 2021") consultam a vigência das normas
+                                banco = banco_conhecimento.atual
+                                resposta_especializada = banco.buscar_vigencia(consulta)
+                                referencia = None if resposta_especializada else banco.buscar_referencia(consulta, modo=modo)
                             
-                            if resposta_especializada:
+                            if referencia:
+                                mensagem = mensagem_resposta(referencia, lambda: banco.texto_referencia(referencia))
+                                response = texto_mensagem(mensagem)
+                            elif resposta_especializada:
                                 # Usa resposta especializada do banco de conhecimento
                                 response = resposta_especializada
                             else:
@@ -312,7 +357,7 @@ Analisei cuidadosamente sua consulta e não identifiquei relação direta com a
                     
                     st.markdown(response)
                 
-                st.session_state.messages.append({"role": "assistant", "content": response})
+                st.session_state.messages.append(mensagem or {"role": "assistant", "content": response})
             
             # Informações do agente
             with st.sidebar: